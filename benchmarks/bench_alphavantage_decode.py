@@ -0,0 +1,86 @@
+"""
+Benchmark: Alpha Vantage payload decoding
+Compares decode_alphavantage_series with the previous DataFrame.from_dict path
+on a synthetic ~25-year TIME_SERIES_DAILY outputsize=full payload
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import numpy as np
+import pandas as pd
+
+from utils.unified_data_fetcher import decode_alphavantage_series
+
+
+def make_payload(start: str = "2000-01-03", end: str = "2025-10-01") -> dict:
+    """Build a newest-first daily payload shaped like the Alpha Vantage response"""
+    rng = np.random.default_rng(42)
+    days = pd.bdate_range(start, end)[::-1]
+    prices = rng.uniform(10, 500, len(days))
+
+    return {
+        day.strftime("%Y-%m-%d"): {
+            "1. open": f"{price:.4f}",
+            "2. high": f"{price * 1.01:.4f}",
+            "3. low": f"{price * 0.99:.4f}",
+            "4. close": f"{price * 1.002:.4f}",
+            "5. volume": str(int(price * 10000))
+        }
+        for (day, price) in zip(days, prices)
+    }
+
+
+def decode_from_dict(series: dict, start_date, end_date) -> pd.DataFrame:
+    """Previous decoding path of _fetch_alphavantage"""
+    df = pd.DataFrame.from_dict(series, orient='index')
+    df.index = pd.to_datetime(df.index)
+    df = df.sort_index()
+    df = df.rename(columns={
+        '1. open': 'Open',
+        '2. high': 'High',
+        '3. low': 'Low',
+        '4. close': 'Close',
+        '5. volume': 'Volume'
+    })
+    df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+    df = df.astype(float)
+    return df[(df.index >= pd.Timestamp(start_date)) & (df.index <= pd.Timestamp(end_date))]
+
+
+def time_call(fn, *args, repeats: int = 20) -> float:
+    """Return the best wall time of several calls in milliseconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    """Run the benchmark"""
+    series = make_payload()
+    print(f"Payload: {len(series)} daily bars")
+
+    windows = [
+        ("full history", "1990-01-01", "2030-01-01"),
+        ("last 1 year", "2024-10-01", "2030-01-01"),
+    ]
+
+    print(f"\n{'Window':<15}{'from_dict (ms)':>16}{'decoder (ms)':>14}{'speedup':>10}")
+    for (label, start_date, end_date) in windows:
+        expected = decode_from_dict(series, start_date, end_date)
+        decoded = decode_alphavantage_series(series, start_date, end_date)
+        assert np.array_equal(expected.to_numpy(), decoded.to_numpy())
+        assert (expected.index == decoded.index).all()
+
+        old_ms = time_call(decode_from_dict, series, start_date, end_date)
+        new_ms = time_call(decode_alphavantage_series, series, start_date, end_date)
+        print(f"{label:<15}{old_ms:>16.2f}{new_ms:>14.2f}{old_ms / new_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
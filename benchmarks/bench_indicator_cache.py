@@ -0,0 +1,84 @@
+"""
+Benchmark: indicator cache hit cost
+Compares a cache hit (hashing the arguments and copying the result) and a
+miss (computing, hashing, and storing) with recomputing the indicator, for
+the cheap vectorized kernels (left uncached, so they are wrapped here) and
+for the cached per-series indicators and QuantumTrend signal pass on daily
+bars
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import numpy as np
+import pandas as pd
+
+from strategy.quantumtrend_swiftedge import QuantumTrendSwiftEdge
+from utils.indicator_cache import indicator_cache, cached_indicator, DEFAULT_CACHE_MB
+from utils.indicators import rolling_slope, stochastic_rsi, stochastic_rsi_batch
+
+
+def make_bars(n: int) -> pd.DataFrame:
+    """Build OHLC bars around a random walk"""
+    rng = np.random.default_rng(42)
+    close = pd.Series(
+        100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n))),
+        index=pd.bdate_range("2000-01-03", periods=n)
+    )
+    return pd.DataFrame({
+        'Open': close.shift(1).fillna(close.iloc[0]),
+        'High': close * (1 + np.abs(rng.normal(0, 0.008, n))),
+        'Low': close * (1 - np.abs(rng.normal(0, 0.008, n))),
+        'Close': close,
+        'Volume': 1_000_000
+    })
+
+
+def time_call(fn, *args, repeats: int = 3) -> float:
+    """Return the best wall time of several calls in milliseconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def miss_call(fn, *args) -> None:
+    """Call through an empty cache, paying the hash and store of a miss"""
+    indicator_cache.clear()
+    fn(*args)
+
+
+def compare(label: str, fn, *args) -> None:
+    """Print the uncached, cache-miss, and cache-hit wall times of a call"""
+    indicator_cache.max_bytes = 0
+    compute_ms = time_call(fn, *args)
+
+    indicator_cache.max_bytes = int(max(DEFAULT_CACHE_MB, 1024) * 1024 * 1024)
+    miss_ms = time_call(miss_call, fn, *args)
+    fn(*args)
+    hit_ms = time_call(fn, *args)
+
+    print(f"{label:<40}{compute_ms:>14.2f}{miss_ms:>12.2f}{hit_ms:>12.2f}")
+
+
+def main():
+    """Run the benchmark"""
+    rng = np.random.default_rng(42)
+    universe = np.cumsum(rng.normal(0, 1, (10_000, 500)), axis=0)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (2_520, 500)), axis=0))
+    df = make_bars(6_000)
+    strategy = QuantumTrendSwiftEdge()
+
+    print(f"{'Call':<40}{'compute (ms)':>14}{'miss (ms)':>12}{'hit (ms)':>12}")
+    compare("rolling_slope, 10,000 x 500", cached_indicator(rolling_slope), universe, 4)
+    compare("stochastic_rsi_batch, 2,520 x 500", cached_indicator(stochastic_rsi_batch), closes)
+    compare("stochastic_rsi, 6,000 bars", stochastic_rsi, df['Close'])
+    compare("QuantumTrend generate_signals, 6,000 bars", strategy.generate_signals, df)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: Supertrend recursion
+Compares supertrend_kernel (Numba and list fallback) with the previous
+pandas .iloc loop of QuantumTrendSwiftEdge.calculate_supertrend on
+synthetic bars from 1e3 to 1e7
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import numpy as np
+import pandas as pd
+
+from utils.indicators import supertrend_kernel, NUMBA_AVAILABLE
+
+
+def make_bands(n: int, multiplier: float = 3.0, period: int = 10):
+    """Build closes and basic Supertrend bands for a random walk"""
+    rng = np.random.default_rng(42)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))))
+    high = close * (1 + np.abs(rng.normal(0, 0.005, n)))
+    low = close * (1 - np.abs(rng.normal(0, 0.005, n)))
+
+    tr = pd.concat([high - low, (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
+    atr = tr.ewm(span=period, adjust=False).mean()
+    hl_avg = (high + low) / 2
+    return (close, hl_avg + multiplier * atr, hl_avg - multiplier * atr)
+
+
+def supertrend_iloc(close: pd.Series, upper_band: pd.Series, lower_band: pd.Series):
+    """Previous Series-based loop of calculate_supertrend"""
+    upper_band = upper_band.copy()
+    lower_band = lower_band.copy()
+    supertrend = pd.Series(index=close.index, dtype=float)
+    direction = pd.Series(index=close.index, dtype=float)
+
+    supertrend.iloc[0] = lower_band.iloc[0]
+    direction.iloc[0] = 1
+
+    for i in range(1, len(close)):
+        if close.iloc[i] > upper_band.iloc[i-1]:
+            direction.iloc[i] = 1
+        elif close.iloc[i] < lower_band.iloc[i-1]:
+            direction.iloc[i] = -1
+        else:
+            direction.iloc[i] = direction.iloc[i-1]
+            if direction.iloc[i] == 1 and lower_band.iloc[i] < lower_band.iloc[i-1]:
+                lower_band.iloc[i] = lower_band.iloc[i-1]
+            if direction.iloc[i] == -1 and upper_band.iloc[i] > upper_band.iloc[i-1]:
+                upper_band.iloc[i] = upper_band.iloc[i-1]
+
+        if direction.iloc[i] == 1:
+            supertrend.iloc[i] = lower_band.iloc[i]
+        else:
+            supertrend.iloc[i] = upper_band.iloc[i]
+
+    return supertrend, direction
+
+
+def time_call(fn, *args, repeats: int = 3) -> float:
+    """Return the best wall time of several calls in milliseconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    """Run the benchmark"""
+    if NUMBA_AVAILABLE:
+        # Compile outside of the timings
+        supertrend_kernel(np.ones(2), np.ones(2), np.ones(2), use_numba=True)
+    else:
+        print("numba is not installed; only the list fallback is timed")
+
+    print(f"{'Bars':>10}{'iloc (ms)':>12}{'fallback (ms)':>15}{'numba (ms)':>12}")
+    for exponent in range(3, 8):
+        n = 10 ** exponent
+        (close, upper, lower) = make_bands(n)
+        arrays = (close.to_numpy(), upper.to_numpy(), lower.to_numpy())
+
+        fallback = supertrend_kernel(*arrays, use_numba=False)
+        fallback_ms = time_call(supertrend_kernel, *arrays, False, repeats=1 if n >= 10 ** 6 else 3)
+
+        # The iloc loop takes minutes past 1e4 bars
+        iloc_ms = np.nan
+        if n <= 10 ** 4:
+            start = time.perf_counter()
+            (supertrend, direction) = supertrend_iloc(close, upper, lower)
+            iloc_ms = (time.perf_counter() - start) * 1000
+            assert np.array_equal(supertrend.to_numpy(), fallback[0])
+            assert np.array_equal(direction.to_numpy(), fallback[1])
+
+        numba_ms = np.nan
+        if NUMBA_AVAILABLE:
+            compiled = supertrend_kernel(*arrays, use_numba=True)
+            assert all(np.array_equal(a, b) for (a, b) in zip(compiled, fallback))
+            numba_ms = time_call(supertrend_kernel, *arrays, True)
+
+        print(f"{n:>10}{iloc_ms:>12.1f}{fallback_ms:>15.1f}{numba_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
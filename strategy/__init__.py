@@ -4,7 +4,17 @@ Adaptive trend-following strategy combining Supertrend, Keltner Channels, and EM
 """
 
 from .quantumtrend_swiftedge import QuantumTrendSwiftEdge
+from .quantumtrend_live import QuantumTrendLive, SignalEvent
+from .universe_runner import TickerBacktest, UniverseBacktestResult, iter_universe_backtest, run_universe_backtest
 
 __version__ = "1.0.0"
 __author__ = "FinTech Toolkit"
-__all__ = ["QuantumTrendSwiftEdge"]
+__all__ = [
+    "QuantumTrendSwiftEdge",
+    "QuantumTrendLive",
+    "SignalEvent",
+    "TickerBacktest",
+    "UniverseBacktestResult",
+    "iter_universe_backtest",
+    "run_universe_backtest",
+]
@@ -0,0 +1,206 @@
+"""
+QuantumTrend SwiftEdge live signal engine
+Carries the indicator, Supertrend band and position state of the strategy so
+each new bar is processed in O(1) instead of recomputing the full history
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from utils.streaming_indicators import StreamingATR, StreamingEMA
+from .quantumtrend_swiftedge import QuantumTrendSwiftEdge
+
+
+@dataclass(frozen=True)
+class SignalEvent:
+    """Data schema for a live buy/sell signal"""
+    timestamp: Any
+    signal: str
+    price: float
+    supertrend: float
+    kelt_upper: float
+    kelt_lower: float
+    ema_100: float
+
+
+class QuantumTrendLive:
+    """
+    Incremental QuantumTrend SwiftEdge signal engine
+
+    Produces the same indicator values and signals as
+    QuantumTrendSwiftEdge.generate_signals, one bar at a time.
+    """
+
+    def __init__(self, strategy: QuantumTrendSwiftEdge, history: Optional[pd.DataFrame] = None) -> None:
+        """
+        Initialize the engine
+
+        Args:
+            strategy: Configured QuantumTrendSwiftEdge instance
+            history: Optional DataFrame with OHLC data to seed the state from
+        """
+        self.strategy = strategy
+
+        # Indicator state
+        self._st_atr = StreamingATR(strategy.atr_period, strategy.use_simple_atr)
+        self._kelt_atr = StreamingATR(strategy.keltner_atr_length, strategy.use_simple_atr)
+        self._kelt_basis = StreamingEMA(span=strategy.keltner_length)
+        self._ema = StreamingEMA(span=strategy.ema_length)
+        self._gradient = StreamingEMA(span=5)
+        self._visibility = 0.5 + (strategy.sensitivity - 1) * 0.375
+
+        # Supertrend band state (bands as ratcheted on the last bar)
+        self._upper_band = math.nan
+        self._lower_band = math.nan
+
+        # Latest bar values
+        self.bars = 0
+        self.timestamp = None
+        self.close = math.nan
+        self.supertrend = math.nan
+        self.st_direction = math.nan
+        self.st_visible = False
+        self.kelt_basis = math.nan
+        self.kelt_upper = math.nan
+        self.kelt_lower = math.nan
+        self.ema_100 = math.nan
+        self.gradient = math.nan
+        self.signal = 0
+        self.position = 0
+
+        if history is not None:
+            self.seed(history)
+
+    def seed(self, df: pd.DataFrame) -> None:
+        """
+        Feed historical bars through the engine without reporting their signals
+
+        Args:
+            df: DataFrame with OHLC data (High, Low, Close), oldest bar first
+        """
+        self.update_many(df)
+
+    def update(self, high: float, low: float, close: float, timestamp: Any = None) -> Optional[SignalEvent]:
+        """
+        Add a completed bar
+
+        Args:
+            high: Bar high
+            low: Bar low
+            close: Bar close
+            timestamp: Optional bar timestamp, reported with its signal
+
+        Returns:
+            SignalEvent when the bar triggers a buy or sell signal, else None
+        """
+        previous_close = self.close
+        previous_kelt_upper = self.kelt_upper
+        previous_kelt_lower = self.kelt_lower
+        previous_direction = self.st_direction
+
+        # Supertrend basic bands, ratcheted against the previous bar's bands
+        atr = self._st_atr.update(high, low, close)
+        hl_avg = (high + low) / 2
+        upper_band = hl_avg + self.strategy.atr_multiplier * atr
+        lower_band = hl_avg - self.strategy.atr_multiplier * atr
+
+        if self.bars == 0:
+            direction = 1.0
+        elif close > self._upper_band:
+            direction = 1.0
+        elif close < self._lower_band:
+            direction = -1.0
+        else:
+            direction = previous_direction
+            if direction == 1.0 and lower_band < self._lower_band:
+                lower_band = self._lower_band
+            if direction == -1.0 and upper_band > self._upper_band:
+                upper_band = self._upper_band
+
+        self._upper_band = upper_band
+        self._lower_band = lower_band
+        self.supertrend = lower_band if direction == 1.0 else upper_band
+        self.st_direction = direction
+        self.st_visible = abs(close - self.supertrend) <= atr * self._visibility
+
+        # Keltner Channels, trend filter and gradient
+        kelt_atr = self._kelt_atr.update(high, low, close)
+        self.kelt_basis = self._kelt_basis.update(close)
+        self.kelt_upper = self.kelt_basis + self.strategy.keltner_multiplier * kelt_atr
+        self.kelt_lower = self.kelt_basis - self.strategy.keltner_multiplier * kelt_atr
+        self.ema_100 = self._ema.update(close)
+        self.gradient = (self._gradient.update(direction) + 1) / 2
+
+        self.bars += 1
+        self.timestamp = timestamp
+        self.close = close
+
+        # Same conditions as generate_signals (comparisons with the missing
+        # values of the first bar are False)
+        st_change = direction - previous_direction
+        if (close > self.ema_100 and close > self.kelt_upper and
+                previous_close <= previous_kelt_upper and st_change > 0):
+            self.signal = 1
+        elif (close < self.ema_100 and close < self.kelt_lower and
+                previous_close >= previous_kelt_lower and st_change < 0):
+            self.signal = -1
+        else:
+            self.signal = 0
+            return None
+
+        self.position = self.signal
+        return SignalEvent(
+            timestamp=timestamp,
+            signal='BUY' if self.signal == 1 else 'SELL',
+            price=close,
+            supertrend=self.supertrend,
+            kelt_upper=self.kelt_upper,
+            kelt_lower=self.kelt_lower,
+            ema_100=self.ema_100
+        )
+
+    def update_many(self, df: pd.DataFrame) -> List[SignalEvent]:
+        """
+        Add several completed bars
+
+        Args:
+            df: DataFrame with OHLC data (High, Low, Close), oldest bar first
+
+        Returns:
+            SignalEvent per triggered signal, in bar order
+        """
+        events = []
+        for (timestamp, high, low, close) in zip(
+                df.index,
+                df['High'].to_numpy(dtype=float).tolist(),
+                df['Low'].to_numpy(dtype=float).tolist(),
+                df['Close'].to_numpy(dtype=float).tolist()
+        ):
+            event = self.update(high, low, close, timestamp)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def current_signal(self) -> Dict:
+        """
+        Get the current signal and indicator values
+
+        Returns:
+            Dictionary in the format of QuantumTrendSwiftEdge.get_current_signal
+        """
+        return {
+            'price': self.close,
+            'supertrend': self.supertrend,
+            'st_direction': 'Uptrend' if self.st_direction == 1 else 'Downtrend',
+            'st_visible': self.st_visible,
+            'kelt_upper': self.kelt_upper,
+            'kelt_lower': self.kelt_lower,
+            'kelt_basis': self.kelt_basis,
+            'ema_100': self.ema_100,
+            'gradient': self.gradient,
+            'signal': 'BUY' if self.signal == 1 else ('SELL' if self.signal == -1 else 'HOLD'),
+            'position': 'Long' if self.position == 1 else ('Short' if self.position == -1 else 'Flat')
+        }
@@ -3,9 +3,197 @@ QuantumTrend SwiftEdge - Adaptive Trend-Following Strategy
 Combines Supertrend, Keltner Channels, and 100-period EMA for precise signals
 """
 
+import os
+import itertools
 import pandas as pd
 import numpy as np
-from typing import Tuple, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, Dict, List, Optional, Sequence
+
+from utils.indicator_cache import cached_indicator
+from utils.indicators import supertrend_kernel
+
+
+# Trade ledger record: bar positions and prices of the entry and exit, the
+# side (1=Long, -1=Short), and the trade return
+TRADE_DTYPE = np.dtype([
+    ('entry_index', '<i8'),
+    ('entry_price', '<f8'),
+    ('exit_index', '<i8'),
+    ('exit_price', '<f8'),
+    ('side', '<i1'),
+    ('return', '<f8'),
+])
+
+
+def forward_fill_signals(signal: np.ndarray) -> np.ndarray:
+    """
+    Hold the side of the latest non-zero signal until the next one
+    
+    Args:
+        signal: Array of signals (1=Buy, -1=Sell, 0=No signal)
+    
+    Returns:
+        int64 array of positions (1=Long, -1=Short, 0=Flat before the first signal)
+    """
+    signal = np.asarray(signal, dtype=np.int64)
+    if len(signal) == 0:
+        return signal
+    
+    # Position of the latest signal at or before each bar (bar 0 when there
+    # is none, where the signal is 0 unless it is the first signal itself)
+    latest = np.maximum.accumulate(np.where(signal != 0, np.arange(len(signal)), 0))
+    return signal[latest]
+
+
+def build_trade_ledger(signal: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    Extract the trades of a signal series
+    
+    Every signal closes the open trade at that bar's close and opens a new
+    one on its side; the last trade is closed at the final close.
+    
+    Args:
+        signal: Array of signals (1=Buy, -1=Sell, 0=No signal)
+        close: Array of closing prices
+    
+    Returns:
+        Structured array with TRADE_DTYPE, one record per trade
+    """
+    entries = np.flatnonzero(np.asarray(signal) != 0)
+    trades = np.empty(len(entries), dtype=TRADE_DTYPE)
+    if len(entries) == 0:
+        return trades
+    
+    exits = np.append(entries[1:], len(close) - 1)
+    side = np.asarray(signal)[entries]
+    entry_price = close[entries]
+    exit_price = close[exits]
+    
+    trades['entry_index'] = entries
+    trades['entry_price'] = entry_price
+    trades['exit_index'] = exits
+    trades['exit_price'] = exit_price
+    trades['side'] = side
+    trades['return'] = np.where(
+        side == 1,
+        (exit_price - entry_price) / entry_price,
+        (entry_price - exit_price) / entry_price
+    )
+    return trades
+
+
+# Strategy parameters a sweep grid may vary (the others keep the strategy's values)
+SWEEP_PARAMETERS = (
+    'atr_period',
+    'atr_multiplier',
+    'keltner_length',
+    'keltner_multiplier',
+    'keltner_atr_length',
+    'ema_length',
+)
+
+
+def _evaluate_combination(
+        close: np.ndarray,
+        direction: np.ndarray,
+        ema: np.ndarray,
+        kelt_upper: np.ndarray,
+        kelt_lower: np.ndarray
+) -> Dict:
+    """
+    Apply the signal rules and backtest metrics of QuantumTrendSwiftEdge to
+    precomputed indicator arrays
+    
+    Args:
+        close: Closing prices
+        direction: Supertrend direction (1=up, -1=down)
+        ema: Trend filter EMA
+        kelt_upper: Keltner Channel upper band
+        kelt_lower: Keltner Channel lower band
+    
+    Returns:
+        Dictionary with total_return, sharpe_ratio, max_drawdown, win_rate and num_trades
+    """
+    # Comparisons against the missing first bar of the shifted series are False
+    st_change = np.diff(direction)
+    buy = np.zeros(len(close), dtype=bool)
+    sell = np.zeros(len(close), dtype=bool)
+    buy[1:] = (
+        (close[1:] > ema[1:]) &
+        (close[1:] > kelt_upper[1:]) &
+        (close[:-1] <= kelt_upper[:-1]) &
+        (st_change > 0)
+    )
+    sell[1:] = (
+        (close[1:] < ema[1:]) &
+        (close[1:] < kelt_lower[1:]) &
+        (close[:-1] >= kelt_lower[:-1]) &
+        (st_change < 0)
+    )
+    signal = np.where(sell, -1, np.where(buy, 1, 0))
+    position = forward_fill_signals(signal)
+    
+    # Strategy returns from the second bar on (the first is undefined)
+    strategy_returns = position[:-1] * (close[1:] / close[:-1] - 1)
+    if len(strategy_returns) == 0:
+        return {
+            'total_return': np.nan,
+            'sharpe_ratio': np.nan,
+            'max_drawdown': np.nan,
+            'win_rate': 0,
+            'num_trades': 0
+        }
+    
+    cumulative = np.cumprod(1 + strategy_returns)
+    std = np.std(strategy_returns, ddof=1) if len(strategy_returns) > 1 else np.nan
+    sharpe_ratio = (np.mean(strategy_returns) / std) * np.sqrt(252) if std != 0 else 0
+    running_max = np.maximum.accumulate(cumulative)
+    
+    trade_returns = build_trade_ledger(signal, close)['return']
+    win_rate = np.count_nonzero(trade_returns > 0) / len(trade_returns) * 100 if len(trade_returns) else 0
+    
+    return {
+        'total_return': (cumulative[-1] - 1) * 100,
+        'sharpe_ratio': sharpe_ratio,
+        'max_drawdown': np.min((cumulative - running_max) / running_max) * 100,
+        'win_rate': win_rate,
+        'num_trades': len(trade_returns)
+    }
+
+
+def _sweep_chunk(
+        close: np.ndarray,
+        directions: Dict[Tuple[int, float], np.ndarray],
+        emas: Dict[int, np.ndarray],
+        atrs: Dict[int, np.ndarray],
+        combinations: List[Dict]
+) -> List[Dict]:
+    """
+    Evaluate a batch of sweep combinations (run in a worker process)
+    
+    Args:
+        close: Closing prices
+        directions: Supertrend direction per (atr_period, atr_multiplier)
+        emas: Close EMA per span (trend filters and Keltner bases)
+        atrs: ATR per period
+        combinations: Parameter dictionaries to evaluate
+    
+    Returns:
+        Metrics dictionary per combination, in order
+    """
+    results = []
+    for params in combinations:
+        basis = emas[params['keltner_length']]
+        band = params['keltner_multiplier'] * atrs[params['keltner_atr_length']]
+        results.append(_evaluate_combination(
+            close,
+            directions[(params['atr_period'], params['atr_multiplier'])],
+            emas[params['ema_length']],
+            basis + band,
+            basis - band
+        ))
+    return results
 
 
 class QuantumTrendSwiftEdge:
@@ -78,6 +266,7 @@ class QuantumTrendSwiftEdge:
         self.keltner_atr_length = params['kelt_atr']
         self.ema_length = params['ema']
     
+    @cached_indicator
     def calculate_atr(self, df: pd.DataFrame, period: int) -> pd.Series:
         """Calculate Average True Range"""
         high = df['High']
@@ -97,6 +286,7 @@ class QuantumTrendSwiftEdge:
         
         return atr
     
+    @cached_indicator
     def calculate_supertrend(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """
         Calculate Supertrend indicator
@@ -113,34 +303,14 @@ class QuantumTrendSwiftEdge:
         upper_band = hl_avg + (self.atr_multiplier * atr)
         lower_band = hl_avg - (self.atr_multiplier * atr)
         
-        # Initialize
-        supertrend = pd.Series(index=df.index, dtype=float)
-        direction = pd.Series(index=df.index, dtype=int)
-        
-        supertrend.iloc[0] = lower_band.iloc[0]
-        direction.iloc[0] = 1
-        
-        # Calculate Supertrend
-        for i in range(1, len(df)):
-            # Update bands
-            if df['Close'].iloc[i] > upper_band.iloc[i-1]:
-                direction.iloc[i] = 1
-            elif df['Close'].iloc[i] < lower_band.iloc[i-1]:
-                direction.iloc[i] = -1
-            else:
-                direction.iloc[i] = direction.iloc[i-1]
-                
-                # Adjust bands
-                if direction.iloc[i] == 1 and lower_band.iloc[i] < lower_band.iloc[i-1]:
-                    lower_band.iloc[i] = lower_band.iloc[i-1]
-                if direction.iloc[i] == -1 and upper_band.iloc[i] > upper_band.iloc[i-1]:
-                    upper_band.iloc[i] = upper_band.iloc[i-1]
-            
-            # Set Supertrend value
-            if direction.iloc[i] == 1:
-                supertrend.iloc[i] = lower_band.iloc[i]
-            else:
-                supertrend.iloc[i] = upper_band.iloc[i]
+        # Run the band ratcheting recursion in the compiled (or list-based) kernel
+        (supertrend, direction, _, _) = supertrend_kernel(
+            df['Close'].to_numpy(dtype=float),
+            upper_band.to_numpy(dtype=float),
+            lower_band.to_numpy(dtype=float)
+        )
+        supertrend = pd.Series(supertrend, index=df.index)
+        direction = pd.Series(direction, index=df.index)
         
         # Calculate visibility (price within ATR threshold)
         threshold_multiplier = 0.5 + (self.sensitivity - 1) * 0.375  # 0.5 to 2.0
@@ -150,6 +320,7 @@ class QuantumTrendSwiftEdge:
         
         return supertrend, direction, visible
     
+    @cached_indicator
     def calculate_keltner_channels(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """
         Calculate Keltner Channels
@@ -171,6 +342,7 @@ class QuantumTrendSwiftEdge:
         
         return basis, upper, lower
     
+    @cached_indicator
     def calculate_ema(self, df: pd.DataFrame) -> pd.Series:
         """Calculate long-term EMA for trend filter"""
         return df['Close'].ewm(span=self.ema_length, adjust=False).mean()
@@ -254,17 +426,9 @@ class QuantumTrendSwiftEdge:
         df.loc[buy_condition, 'signal'] = 1
         df.loc[sell_condition, 'signal'] = -1
         
-        # Calculate position (for backtesting)
-        df['position'] = 0
-        position = 0
-        
-        for i in range(len(df)):
-            if df['signal'].iloc[i] == 1:
-                position = 1  # Enter long
-            elif df['signal'].iloc[i] == -1:
-                position = -1  # Enter short
-            # Hold position until opposite signal
-            df.loc[df.index[i], 'position'] = position
+        # Calculate position (for backtesting): each signal enters its side
+        # and the position is held until the next signal
+        df['position'] = forward_fill_signals(df['signal'].to_numpy())
         
         return df
     
@@ -297,44 +461,22 @@ class QuantumTrendSwiftEdge:
         buy_hold_return = (df['cumulative_returns'].iloc[-1] - 1) * 100
         
         # Calculate number of trades
-        trades = df[df['signal'] != 0]
-        num_trades = len(trades)
-        num_buys = len(trades[trades['signal'] == 1])
-        num_sells = len(trades[trades['signal'] == -1])
+        signal = df['signal'].to_numpy()
+        num_trades = int(np.count_nonzero(signal))
+        num_buys = int(np.count_nonzero(signal == 1))
+        num_sells = int(np.count_nonzero(signal == -1))
+        
+        # Pair every entry with the next signal (or the last bar) as its exit
+        trades = build_trade_ledger(signal, df['Close'].to_numpy(dtype=float))
+        trade_returns = trades['return']
         
         # Calculate win rate
-        trade_returns = []
-        entry_price = None
-        entry_type = None
-        
-        for i in range(len(df)):
-            if df['signal'].iloc[i] != 0:
-                if entry_price is not None:
-                    # Close previous trade
-                    if entry_type == 1:  # Long
-                        ret = (df['Close'].iloc[i] - entry_price) / entry_price
-                    else:  # Short
-                        ret = (entry_price - df['Close'].iloc[i]) / entry_price
-                    trade_returns.append(ret)
-                
-                # Open new trade
-                entry_price = df['Close'].iloc[i]
-                entry_type = df['signal'].iloc[i]
-        
-        # Close final trade if open
-        if entry_price is not None:
-            if entry_type == 1:
-                ret = (df['Close'].iloc[-1] - entry_price) / entry_price
-            else:
-                ret = (entry_price - df['Close'].iloc[-1]) / entry_price
-            trade_returns.append(ret)
-        
-        winning_trades = [r for r in trade_returns if r > 0]
-        losing_trades = [r for r in trade_returns if r <= 0]
-        
-        win_rate = len(winning_trades) / len(trade_returns) * 100 if trade_returns else 0
-        avg_win = np.mean(winning_trades) * 100 if winning_trades else 0
-        avg_loss = np.mean(losing_trades) * 100 if losing_trades else 0
+        winning_trades = trade_returns[trade_returns > 0]
+        losing_trades = trade_returns[trade_returns <= 0]
+        
+        win_rate = len(winning_trades) / len(trade_returns) * 100 if len(trade_returns) else 0
+        avg_win = np.mean(winning_trades) * 100 if len(winning_trades) else 0
+        avg_loss = np.mean(losing_trades) * 100 if len(losing_trades) else 0
         
         # Calculate Sharpe ratio (annualized, assuming daily data)
         if df['strategy_returns'].std() != 0:
@@ -360,11 +502,99 @@ class QuantumTrendSwiftEdge:
             'sharpe_ratio': sharpe_ratio,
             'max_drawdown': max_drawdown,
             'final_equity': df['equity'].iloc[-1],
+            'trades': trades,
             'data': df
         }
         
         return results
     
+    def sweep(
+        self,
+        df: pd.DataFrame,
+        grid: Dict[str, Sequence],
+        max_workers: Optional[int] = 1
+    ) -> pd.DataFrame:
+        """
+        Backtest every combination of a parameter grid on one price series
+        
+        Every unique ATR, EMA, Keltner basis and Supertrend direction is
+        computed once and shared across the combinations, which are then
+        evaluated in batches. Metrics match backtest() for the same
+        parameters. Evaluating a combination takes well under a millisecond
+        on daily bars, so the batches run in-process by default: a process
+        pool only pays for its start-up and the pickled indicator arrays on
+        very large grids or long intraday series. When using one on a
+        platform that spawns worker processes, call this from under an
+        `if __name__ == "__main__":` guard.
+        
+        Args:
+            df: DataFrame with OHLC data
+            grid: Values to try per parameter (keys from SWEEP_PARAMETERS);
+                parameters left out keep this strategy's values
+            max_workers: Worker processes (default 1 runs in-process, None
+                uses one per CPU)
+        
+        Returns:
+            DataFrame with one row per combination: the parameters, total_return,
+            sharpe_ratio, max_drawdown, win_rate and num_trades
+        
+        Raises:
+            ValueError: If the grid has unknown parameters or no values
+        """
+        unknown = set(grid) - set(SWEEP_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+        
+        values = [list(grid.get(name, [getattr(self, name)])) for name in SWEEP_PARAMETERS]
+        if not all(values):
+            raise ValueError("Every sweep parameter needs at least one value")
+        combinations = [dict(zip(SWEEP_PARAMETERS, combo)) for combo in itertools.product(*values)]
+        
+        # Shared indicators: ATR per period, EMA per span, direction per Supertrend setting
+        close = df['Close'].to_numpy(dtype=float)
+        hl_avg = ((df['High'] + df['Low']) / 2).to_numpy(dtype=float)
+        atr_periods = {c['atr_period'] for c in combinations} | {c['keltner_atr_length'] for c in combinations}
+        atrs = {period: self.calculate_atr(df, period).to_numpy(dtype=float) for period in atr_periods}
+        spans = {c['ema_length'] for c in combinations} | {c['keltner_length'] for c in combinations}
+        emas = {span: df['Close'].ewm(span=span, adjust=False).mean().to_numpy(dtype=float) for span in spans}
+        
+        directions = {}
+        for key in dict.fromkeys((c['atr_period'], c['atr_multiplier']) for c in combinations):
+            (period, multiplier) = key
+            (_, direction, _, _) = supertrend_kernel(
+                close,
+                hl_avg + multiplier * atrs[period],
+                hl_avg - multiplier * atrs[period]
+            )
+            directions[key] = direction
+        
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers, len(combinations)))
+        
+        if max_workers == 1:
+            metrics = _sweep_chunk(close, directions, emas, atrs, combinations)
+        else:
+            # A few batches per worker balances the load without pickling
+            # the shared arrays once per combination
+            size = -(-len(combinations) // (max_workers * 4))
+            chunks = [combinations[i:i + size] for i in range(0, len(combinations), size)]
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        _sweep_chunk,
+                        close,
+                        {k: directions[k] for k in {(c['atr_period'], c['atr_multiplier']) for c in chunk}},
+                        {k: emas[k] for k in {c['ema_length'] for c in chunk} | {c['keltner_length'] for c in chunk}},
+                        {k: atrs[k] for k in {c['keltner_atr_length'] for c in chunk}},
+                        chunk
+                    )
+                    for chunk in chunks
+                ]
+                metrics = [row for future in futures for row in future.result()]
+        
+        return pd.concat([pd.DataFrame(combinations), pd.DataFrame(metrics)], axis=1)
+    
     def get_current_signal(self, df: pd.DataFrame) -> Dict:
         """
         Get current signal and indicator values
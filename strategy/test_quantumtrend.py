@@ -154,7 +154,7 @@ def test_sensitivity_levels(ticker: str, days: int = 365, data_source: str = "yf
         print("\n❌ No data available. Cannot run tests.")
         print("💡 Try:")
         print("   - Different ticker symbol")
-        print("   - Different data source (yfinance, alphavantage, polygon)")
+        print("   - Different data source (yfinance, alphavantage, polygon, local)")
         print("   - Provide API key if using alphavantage or polygon")
         return 3  # Return default sensitivity
     
@@ -213,9 +213,10 @@ def main():
     print("   1. yfinance (default, free, no API key)")
     print("   2. alphavantage (requires API key)")
     print("   3. polygon (requires API key)")
+    print("   4. local (offline replay, no network)")
     
-    # Use yfinance by default (can be changed)
-    data_source = "yfinance"
+    # Use yfinance by default (set QUANTUMTRADE_DATA_SOURCE=local for offline runs)
+    data_source = os.environ.get("QUANTUMTRADE_DATA_SOURCE", "yfinance")
     api_key = None
     
     print(f"\n✅ Using: {data_source}")
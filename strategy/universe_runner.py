@@ -0,0 +1,218 @@
+"""
+Universe-wide QuantumTrend SwiftEdge backtests
+Fetches every ticker through the unified data fetcher and backtests the
+symbols in parallel across worker processes, streaming results as they finish
+"""
+
+import os
+from datetime import datetime
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from utils.rate_limiter import RequestPriority
+from utils.unified_data_fetcher import SOURCE_CONCURRENCY, fetch_market_data
+from .quantumtrend_swiftedge import QuantumTrendSwiftEdge
+
+
+# Backtest metrics reported per ticker, in summary column order
+SUMMARY_COLUMNS = [
+    'total_return',
+    'buy_hold_return',
+    'sharpe_ratio',
+    'max_drawdown',
+    'win_rate',
+    'num_trades',
+    'final_equity',
+    'bars',
+]
+
+
+@dataclass(frozen=True)
+class TickerBacktest:
+    """Data schema for the backtest outcome of one ticker"""
+    ticker: str
+    metrics: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class UniverseBacktestResult:
+    """Data schema for universe backtest results"""
+    summary: pd.DataFrame
+    errors: Dict[str, str]
+
+
+def _backtest_ticker(
+        strategy: QuantumTrendSwiftEdge,
+        ticker: str,
+        df: pd.DataFrame,
+        initial_capital: float
+) -> TickerBacktest:
+    """
+    Backtest one ticker (run in a worker process)
+
+    Only the summary metrics are sent back, not the signal DataFrame or the
+    trade ledger.
+    """
+    try:
+        results = strategy.backtest(df, initial_capital)
+    except Exception as e:
+        return TickerBacktest(ticker=ticker, error=str(e))
+
+    metrics = {name: results[name] for name in SUMMARY_COLUMNS if name in results}
+    metrics['bars'] = len(df)
+    return TickerBacktest(ticker=ticker, metrics=metrics)
+
+
+def iter_universe_backtest(
+        tickers: List[str],
+        strategy: QuantumTrendSwiftEdge,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = "1d",
+        data_source: str = "yfinance",
+        api_key: Optional[str] = None,
+        initial_capital: float = 10000,
+        max_workers: Optional[int] = None,
+        max_fetchers: Optional[int] = None,
+        use_cache: bool = True,
+        priority: RequestPriority = RequestPriority.BACKFILL
+) -> Iterator[TickerBacktest]:
+    """
+    Backtest a strategy on every ticker, yielding each result as it finishes
+
+    Fetches run on threads in this process (so they share its rate limiter
+    and local store) and each ticker is handed to the process pool as soon
+    as its data arrives. On platforms that spawn worker processes, call this
+    from under an `if __name__ == "__main__":` guard.
+
+    Args:
+        tickers: List of stock ticker symbols
+        strategy: Configured QuantumTrendSwiftEdge instance
+        start_date: Start date for historical data
+        end_date: End date for historical data
+        interval: Data interval (1m, 5m, 15m, 1d, 1wk, 1mo)
+        data_source: Any fetch_market_data source ("local" replays bars
+            offline, and use_cache serves windows from the local store)
+        api_key: API key for Alpha Vantage or Polygon (optional for yfinance)
+        initial_capital: Starting capital of every backtest
+        max_workers: Backtest worker processes (default: CPU count)
+        max_fetchers: Concurrent fetches (default is the SOURCE_CONCURRENCY
+            limit of the data source)
+        use_cache: If True, read through the local OHLCV store
+        priority: Queue priority of the requests on rate-limited sources
+
+    Yields:
+        TickerBacktest per ticker, in completion order
+    """
+    if data_source not in SOURCE_CONCURRENCY:
+        raise ValueError(f"Unknown data source: {data_source}")
+
+    # Drop duplicate tickers while keeping the requested order
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_fetchers is None:
+        max_fetchers = SOURCE_CONCURRENCY[data_source]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_fetchers, len(tickers)))) as fetcher, \
+            ProcessPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+        fetches = {
+            fetcher.submit(
+                fetch_market_data,
+                ticker,
+                start_date,
+                end_date,
+                interval,
+                data_source,
+                api_key,
+                use_cache=use_cache,
+                priority=priority
+            ): ticker
+            for ticker in tickers
+        }
+        backtests = {}
+
+        # Wait on fetches and backtests together so finished backtests are
+        # reported while other tickers are still downloading
+        pending = set(fetches)
+        while pending:
+            (done, pending) = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in backtests:
+                    ticker = backtests.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        yield TickerBacktest(ticker=ticker, error=str(e))
+                    continue
+
+                ticker = fetches.pop(future)
+                try:
+                    df = future.result()
+                except Exception as e:
+                    yield TickerBacktest(ticker=ticker, error=str(e))
+                    continue
+
+                if df.empty:
+                    yield TickerBacktest(ticker=ticker, error=f"No data available for {ticker}")
+                    continue
+
+                backtest = pool.submit(_backtest_ticker, strategy, ticker, df, initial_capital)
+                backtests[backtest] = ticker
+                pending.add(backtest)
+
+
+def run_universe_backtest(
+        tickers: List[str],
+        strategy: QuantumTrendSwiftEdge,
+        start_date: datetime,
+        end_date: datetime,
+        rank_by: str = 'sharpe_ratio',
+        on_result: Optional[Callable[[TickerBacktest], None]] = None,
+        **kwargs
+) -> UniverseBacktestResult:
+    """
+    Backtest a strategy on every ticker and rank the results
+
+    Args:
+        tickers: List of stock ticker symbols
+        strategy: Configured QuantumTrendSwiftEdge instance
+        start_date: Start date for historical data
+        end_date: End date for historical data
+        rank_by: Summary column to rank by (highest first)
+        on_result: Optional callback receiving each TickerBacktest as soon as
+            it finishes (e.g. to update a progress display)
+        **kwargs: Further arguments for iter_universe_backtest
+
+    Returns:
+        UniverseBacktestResult with a summary DataFrame indexed by ticker
+        (ranked, with a 1-based rank column) and an error message per
+        failed ticker
+    """
+    if rank_by not in SUMMARY_COLUMNS:
+        raise ValueError(f"Unknown rank column: {rank_by}")
+
+    rows: Dict[str, Dict[str, float]] = {}
+    errors: Dict[str, str] = {}
+
+    for result in iter_universe_backtest(tickers, strategy, start_date, end_date, **kwargs):
+        if result.error is None:
+            rows[result.ticker] = result.metrics
+        else:
+            errors[result.ticker] = result.error
+        if on_result is not None:
+            on_result(result)
+
+    summary = pd.DataFrame.from_dict(rows, orient='index', columns=SUMMARY_COLUMNS)
+    summary.index.name = 'ticker'
+    summary = summary.sort_values(rank_by, ascending=False, kind='stable')
+    summary.insert(0, 'rank', range(1, len(summary) + 1))
+
+    return UniverseBacktestResult(summary=summary, errors=errors)
@@ -24,7 +24,8 @@ st.set_page_config(
 
 # Import utility functions
 from utils.data_fetcher import fetch_ohlcv_history
-from utils.unified_data_fetcher import fetch_market_data
+from utils.unified_data_fetcher import fetch_market_data, decode_alphavantage_series
+from utils.http_session import get_session
 from utils.indicators import calculate_slope, stochastic_rsi
 from utils.risk_calculator import RiskRewardCalculator
 from utils.stage_detector import StageDetector, plot_stage_detections
@@ -48,7 +49,7 @@ st.sidebar.markdown("---")
 st.sidebar.subheader("🌐 Data Source")
 global_data_source = st.sidebar.selectbox(
     "Select Data Provider",
-    ["Yahoo Finance (Free)", "Alpha Vantage API", "Polygon.io API"],
+    ["Yahoo Finance (Free)", "Alpha Vantage API", "Polygon.io API", "Auto (Fastest Healthy Source)", "Local Replay (Offline)"],
     help="This will be used for all tools"
 )
 
@@ -71,6 +72,10 @@ def get_data_source_params():
         return "yfinance", global_api_key
     elif "Alpha Vantage" in global_data_source:
         return "alphavantage", global_api_key
+    elif "Local Replay" in global_data_source:
+        return "local", global_api_key
+    elif "Auto" in global_data_source:
+        return "auto", global_api_key
     else:
         return "polygon", global_api_key
 
@@ -372,7 +377,6 @@ elif page == "📊 Market Data Explorer":
                 
                 # Alpha Vantage API
                 elif "Alpha Vantage" in data_source:
-                    import requests
                     ticker = tickers[0]
                     
                     # Map interval to Alpha Vantage function
@@ -384,28 +388,17 @@ elif page == "📊 Market Data Explorer":
                         time_key = f"Weekly Time Series" if interval == "1wk" else "Monthly Time Series"
                     
                     url = f"https://www.alphavantage.co/query?function={function}&symbol={ticker}&apikey={api_key}&outputsize=full"
-                    response = requests.get(url)
+                    response = get_session("alphavantage").get(url, timeout=10)
                     data = response.json()
                     
                     if time_key in data:
-                        # Convert to DataFrame
-                        df = pd.DataFrame.from_dict(data[time_key], orient='index')
-                        df.index = pd.to_datetime(df.index)
-                        df = df.sort_index()
-                        
-                        # Rename columns to match yfinance format
-                        df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-                        df = df.astype(float)
-                        
-                        # Filter by date range
-                        df = df[(df.index >= pd.Timestamp(start_date)) & (df.index <= pd.Timestamp(end_date))]
+                        df = decode_alphavantage_series(data[time_key], start_date, end_date)
                     else:
                         st.error(f"API Error: {data.get('Note', data.get('Error Message', 'Unknown error'))}")
                         df = pd.DataFrame()
                 
                 # Polygon.io API
                 elif "Polygon" in data_source:
-                    import requests
                     ticker = tickers[0]
                     
                     if not api_key:
@@ -420,7 +413,7 @@ elif page == "📊 Market Data Explorer":
                         to_date = end_date.strftime("%Y-%m-%d")
                         
                         url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{from_date}/{to_date}?apiKey={api_key}"
-                        response = requests.get(url)
+                        response = get_session("polygon").get(url, timeout=10)
                         data = response.json()
                         
                         if data.get("status") == "OK" and "results" in data:
@@ -2,9 +2,13 @@
 Integration test to verify all modules work together
 """
 
+import os
 import sys
 from datetime import datetime, timedelta
 
+# Set QUANTUMTRADE_DATA_SOURCE=local to run without network access
+DATA_SOURCE = os.environ.get("QUANTUMTRADE_DATA_SOURCE", "yfinance")
+
 print("=" * 60)
 print("INTEGRATION TEST - Python FinTech Toolkit")
 print("=" * 60)
@@ -23,8 +27,8 @@ except Exception as e:
     print(f"   ❌ Import error: {e}")
     sys.exit(1)
 
-# Test 2: Test unified data fetcher with yfinance
-print("\n2. Testing unified data fetcher (yfinance)...")
+# Test 2: Test unified data fetcher
+print(f"\n2. Testing unified data fetcher ({DATA_SOURCE})...")
 try:
     end_date = datetime.now()
     start_date = end_date - timedelta(days=30)
@@ -34,7 +38,7 @@ try:
         start_date=start_date,
         end_date=end_date,
         interval="1d",
-        data_source="yfinance",
+        data_source=DATA_SOURCE,
         api_key=None
     )
     
@@ -85,22 +89,25 @@ except Exception as e:
 
 # Test 6: Test Alpha Vantage (with demo key)
 print("\n6. Testing Alpha Vantage API (demo key)...")
-try:
-    df_av = fetch_market_data(
-        ticker="IBM",  # Demo key works with IBM
-        start_date=start_date,
-        end_date=end_date,
-        interval="1d",
-        data_source="alphavantage",
-        api_key="demo"
-    )
+if DATA_SOURCE == "local":
+    print("   ⏭️  Skipped (offline run)")
+else:
+    try:
+        df_av = fetch_market_data(
+            ticker="IBM",  # Demo key works with IBM
+            start_date=start_date,
+            end_date=end_date,
+            interval="1d",
+            data_source="alphavantage",
+            api_key="demo"
+        )
     
-    if not df_av.empty:
-        print(f"   ✅ Alpha Vantage fetched {len(df_av)} rows")
-    else:
-        print("   ⚠️  No data (demo key has limits)")
-except Exception as e:
-    print(f"   ⚠️  Alpha Vantage error (expected with demo key): {str(e)[:50]}")
+        if not df_av.empty:
+            print(f"   ✅ Alpha Vantage fetched {len(df_av)} rows")
+        else:
+            print("   ⚠️  No data (demo key has limits)")
+    except Exception as e:
+        print(f"   ⚠️  Alpha Vantage error (expected with demo key): {str(e)[:50]}")
 
 print("\n" + "=" * 60)
 print("INTEGRATION TEST COMPLETE")
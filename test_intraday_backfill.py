@@ -0,0 +1,156 @@
+"""
+Offline test of the intraday backfill in the unified data fetcher
+
+Runs fetch_market_data on an intraday interval against a temporary intraday
+store with the network backend replaced by the deterministic synthetic
+replay source, and checks that:
+- a backfill fetches the window in chunks and returns the replayed bars
+- a repeated window is served from the store without a fetch
+- an interrupted backfill resumes with the missing days only
+- a failing yfinance download writes no partitions
+- an empty answer only stores the weekends and exchange holidays
+"""
+
+import os
+import sys
+import glob
+import tempfile
+from datetime import datetime
+
+# Point the stores at a scratch directory before the fetcher creates them
+os.environ["QUANTUMTRADE_STORE_DIR"] = tempfile.mkdtemp(prefix="quantumtrade-store-")
+os.environ["QUANTUMTRADE_INTRADAY_DIR"] = tempfile.mkdtemp(prefix="quantumtrade-intraday-")
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from utils import unified_data_fetcher
+from utils.unified_data_fetcher import fetch_market_data, normalize_ohlcv, PRICE_COLUMNS
+from utils.intraday_store import EXCHANGE_TZ, exchange_closed_days
+from utils.replay_source import generate_synthetic_ohlcv
+
+print("=" * 60)
+print("INTRADAY BACKFILL TEST - offline")
+print("=" * 60)
+
+INTRADAY_DIR = os.environ["QUANTUMTRADE_INTRADAY_DIR"]
+WINDOW_START = datetime(2024, 6, 24)
+WINDOW_END = datetime(2024, 7, 13)
+LAST_DAY = datetime(2024, 7, 12)
+
+# Fetches that reached the (replaced) network backend, as (ticker, start, end)
+calls = []
+
+
+def replayed_bars(ticker: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+    """Synthetic intraday bars without the exchange holidays"""
+    df = generate_synthetic_ohlcv(ticker, start_date, end_date, interval)
+    days = df.index.tz_convert(EXCHANGE_TZ).normalize().tz_localize(None).date
+    closed = set(exchange_closed_days(start_date.date(), end_date.date()))
+    return df[[day not in closed for day in days]]
+
+
+def replay_backend(ticker: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+    """Serve synthetic bars in place of Yahoo Finance, recording each call"""
+    calls.append((ticker, pd.Timestamp(start_date), pd.Timestamp(end_date)))
+    return replayed_bars(ticker, start_date, end_date, interval)
+
+
+def empty_backend(ticker: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+    """Answer every request with an empty frame, as an outage may look"""
+    calls.append((ticker, pd.Timestamp(start_date), pd.Timestamp(end_date)))
+    return pd.DataFrame()
+
+
+def failing_history(self, *args, **kwargs):
+    """Stand-in for Ticker.history while the network is down"""
+    raise ConnectionError("Could not resolve host: query2.finance.yahoo.com")
+
+
+def stored_days(ticker: str, interval: str = "5m") -> list:
+    """Days with a partition in the intraday store"""
+    paths = glob.glob(os.path.join(INTRADAY_DIR, "yfinance", ticker, interval, "*.npy"))
+    return sorted(os.path.basename(path)[:-len(".npy")] for path in paths)
+
+
+failures = 0
+
+
+def check(condition: bool, message: str) -> None:
+    """Print the outcome of a check and count failures"""
+    global failures
+    if condition:
+        print(f"   ✅ {message}")
+    else:
+        failures += 1
+        print(f"   ❌ {message}")
+
+
+original_backend = unified_data_fetcher._fetch_yfinance
+unified_data_fetcher._fetch_yfinance = replay_backend
+
+# Test 1: a backfill fetches the window in chunks
+print("\n1. Testing backfill...")
+bars = fetch_market_data("AAPL", WINDOW_START, WINDOW_END, "5m")
+check(len(calls) == 3, f"19 days fetched in 7-day chunks ({len(calls)} calls)")
+expected = normalize_ohlcv(replayed_bars("AAPL", WINDOW_START, WINDOW_END, "5m"), "5m")
+check(bars.index.equals(expected.index), f"Stored bars cover the replayed bars ({len(bars)} bars)")
+check(
+    np.allclose(bars[PRICE_COLUMNS].to_numpy(), expected[PRICE_COLUMNS].to_numpy(), rtol=1e-6),
+    "Stored prices match the replayed prices"
+)
+check(len(stored_days("AAPL")) == 19, f"Every day has a partition ({len(stored_days('AAPL'))} days)")
+
+# Test 2: a repeated window is answered by the store
+print("\n2. Testing repeated window...")
+calls.clear()
+again = fetch_market_data("AAPL", WINDOW_START, WINDOW_END, "5m")
+check(not calls, f"Repeated request made no fetch ({len(calls)} calls)")
+check(again.equals(bars), "Stored window equals the fetched one")
+
+# Test 3: an interrupted backfill resumes with the missing days
+print("\n3. Testing resumed backfill...")
+calls.clear()
+for day in ("2024-07-08", "2024-07-09"):
+    os.remove(os.path.join(INTRADAY_DIR, "yfinance", "AAPL", "5m", f"{day}.npy"))
+resumed = fetch_market_data("AAPL", WINDOW_START, WINDOW_END, "5m")
+check(len(calls) == 1, f"Only the missing days were fetched ({len(calls)} calls)")
+if calls:
+    check(
+        calls[0][1] == pd.Timestamp("2024-07-08") and calls[0][2] == pd.Timestamp("2024-07-10"),
+        f"Fetched {calls[0][1].date()} up to {calls[0][2].date()}"
+    )
+check(resumed.equals(bars), "Resumed window equals the first backfill")
+
+# Test 4: a failing yfinance download writes nothing
+print("\n4. Testing failing yfinance...")
+unified_data_fetcher._fetch_yfinance = original_backend
+original_history = yf.Ticker.history
+yf.Ticker.history = failing_history
+try:
+    failed = fetch_market_data("MSFT", WINDOW_START, WINDOW_END, "5m")
+finally:
+    yf.Ticker.history = original_history
+check(failed.empty, "Failed backfill returned no bars")
+check(not stored_days("MSFT"), f"No partitions were written ({len(stored_days('MSFT'))} days)")
+
+# Test 5: an empty answer only stores the days the exchange was closed
+print("\n5. Testing empty answer...")
+calls.clear()
+unified_data_fetcher._fetch_yfinance = empty_backend
+fetch_market_data("NVDA", WINDOW_START, WINDOW_END, "5m")
+closed = [day.isoformat() for day in exchange_closed_days(WINDOW_START.date(), LAST_DAY.date())]
+check(stored_days("NVDA") == closed, f"Only weekends and holidays were stored ({', '.join(stored_days('NVDA'))})")
+calls.clear()
+fetch_market_data("NVDA", WINDOW_START, WINDOW_END, "5m")
+check(len(calls) == 4, f"Each run of trading days is fetched again ({len(calls)} calls)")
+
+print("\n" + "=" * 60)
+print("INTRADAY BACKFILL TEST COMPLETE")
+print("=" * 60)
+
+if failures:
+    print(f"\n❌ {failures} check(s) failed")
+    sys.exit(1)
+print("\n✅ Intraday backfill works offline")
@@ -0,0 +1,113 @@
+"""
+Offline test of the QuantumTrend live signal engine
+
+Feeds synthetic daily bars one at a time through QuantumTrendLive and checks
+that:
+- the indicator values of every bar equal generate_signals on the history
+- the reported signal events are exactly the signals of generate_signals
+- an engine seeded with history continues like one fed every bar
+- current_signal reports what get_current_signal reports on the history
+"""
+
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from strategy import QuantumTrendSwiftEdge, QuantumTrendLive
+from utils.replay_source import generate_synthetic_ohlcv
+
+print("=" * 60)
+print("QUANTUMTREND LIVE TEST - offline")
+print("=" * 60)
+
+INDICATORS = ('supertrend', 'st_direction', 'kelt_basis', 'kelt_upper', 'kelt_lower', 'ema_100', 'gradient')
+
+failures = 0
+
+
+def check(condition: bool, message: str) -> None:
+    """Print the outcome of a check and count failures"""
+    global failures
+    if condition:
+        print(f"   ✅ {message}")
+    else:
+        failures += 1
+        print(f"   ❌ {message}")
+
+
+def run_live(engine: QuantumTrendLive, df: pd.DataFrame):
+    """Feed bars one at a time, collecting the indicator values and events"""
+    rows = []
+    events = []
+    for (timestamp, bar) in zip(df.index, df[['High', 'Low', 'Close']].itertuples(index=False)):
+        event = engine.update(bar.High, bar.Low, bar.Close, timestamp)
+        if event is not None:
+            events.append(event)
+        rows.append([getattr(engine, name) for name in INDICATORS] + [engine.signal, engine.position])
+    return (pd.DataFrame(rows, index=df.index, columns=list(INDICATORS) + ['signal', 'position']), events)
+
+
+strategies = {
+    "sensitivity 3": QuantumTrendSwiftEdge(),
+    "sensitivity 5": QuantumTrendSwiftEdge(sensitivity=5),
+    "simple ATR": QuantumTrendSwiftEdge(use_simple_atr=True),
+}
+
+# Test 1: every bar equals generate_signals on the full history
+print("\n1. Testing bar-by-bar updates...")
+for ticker in ("AAPL", "MSFT"):
+    df = generate_synthetic_ohlcv(ticker, datetime(2014, 1, 1), datetime(2024, 1, 1))
+    for (label, strategy) in strategies.items():
+        expected = strategy.generate_signals(df)
+        (live, events) = run_live(QuantumTrendLive(strategy), df)
+
+        check(
+            all(np.allclose(live[name], expected[name], rtol=1e-9, equal_nan=True) for name in INDICATORS),
+            f"{ticker} ({label}) indicators equal generate_signals"
+        )
+        check(
+            (live['signal'] == expected['signal']).all() and (live['position'] == expected['position']).all(),
+            f"{ticker} ({label}) signals and positions equal generate_signals"
+        )
+        signalled = expected[expected['signal'] != 0]
+        check(
+            [event.timestamp for event in events] == list(signalled.index) and
+            [event.signal for event in events] == ['BUY' if s == 1 else 'SELL' for s in signalled['signal']],
+            f"{ticker} ({label}) reported {len(events)} signal events"
+        )
+
+# Test 2: seeding with history continues like feeding every bar
+print("\n2. Testing seeded engine...")
+df = generate_synthetic_ohlcv("NVDA", datetime(2014, 1, 1), datetime(2024, 1, 1))
+strategy = QuantumTrendSwiftEdge()
+split = len(df) - 250
+seeded = QuantumTrendLive(strategy, history=df.iloc[:split])
+(live, events) = run_live(seeded, df.iloc[split:])
+expected = strategy.generate_signals(df).iloc[split:]
+check(
+    all(np.allclose(live[name], expected[name], rtol=1e-9, equal_nan=True) for name in INDICATORS),
+    "Seeded engine indicators equal generate_signals"
+)
+check((live['signal'] == expected['signal']).all(), f"Seeded engine signals equal generate_signals ({len(events)} events)")
+check(seeded.bars == len(df), f"Seeded engine counted every bar ({seeded.bars} bars)")
+
+# Test 3: current_signal matches get_current_signal
+print("\n3. Testing current signal...")
+current = seeded.current_signal()
+reference = strategy.get_current_signal(df)
+same = [
+    np.isclose(current[name], value) if isinstance(value, float) else current[name] == value
+    for (name, value) in reference.items()
+]
+check(all(same), f"current_signal equals get_current_signal ({current['signal']}, {current['position']})")
+
+print("\n" + "=" * 60)
+print("QUANTUMTREND LIVE TEST COMPLETE")
+print("=" * 60)
+
+if failures:
+    print(f"\n❌ {failures} check(s) failed")
+    sys.exit(1)
+print("\n✅ Live engine matches generate_signals offline")
@@ -0,0 +1,127 @@
+"""
+Offline test of the QuantumTrend parameter sweep
+
+Runs QuantumTrendSwiftEdge.sweep on synthetic daily bars and checks that:
+- every combination's metrics equal a backtest() with the same parameters
+- the process pool returns the same table as the in-process sweep
+- parameters left out of the grid keep the strategy's values
+- unknown parameters and empty value lists are rejected
+"""
+
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from strategy.quantumtrend_swiftedge import QuantumTrendSwiftEdge, SWEEP_PARAMETERS
+from utils.replay_source import generate_synthetic_ohlcv
+
+METRICS = ('total_return', 'sharpe_ratio', 'max_drawdown', 'win_rate', 'num_trades')
+
+failures = 0
+
+
+def check(condition: bool, message: str) -> None:
+    """Print the outcome of a check and count failures"""
+    global failures
+    if condition:
+        print(f"   ✅ {message}")
+    else:
+        failures += 1
+        print(f"   ❌ {message}")
+
+
+def backtest_row(df: pd.DataFrame, row, use_simple_atr: bool) -> dict:
+    """Backtest one sweep row's parameters"""
+    strategy = QuantumTrendSwiftEdge(
+        use_manual_settings=True,
+        use_simple_atr=use_simple_atr,
+        **{name: getattr(row, name) for name in SWEEP_PARAMETERS}
+    )
+    return strategy.backtest(df)
+
+
+def mismatches(df: pd.DataFrame, table: pd.DataFrame, use_simple_atr: bool) -> int:
+    """Count the sweep rows whose metrics differ from backtest()"""
+    count = 0
+    for row in table.itertuples():
+        results = backtest_row(df, row, use_simple_atr)
+        if not all(np.isclose(results[metric], getattr(row, metric), equal_nan=True) for metric in METRICS):
+            count += 1
+    return count
+
+
+def main():
+    """Run the test"""
+    print("=" * 60)
+    print("QUANTUMTREND SWEEP TEST - offline")
+    print("=" * 60)
+
+    grid = {
+        'atr_period': [7, 10],
+        'atr_multiplier': [2.0, 3.0],
+        'keltner_length': [10, 20],
+        'keltner_multiplier': [1.0, 1.5],
+        'keltner_atr_length': [10, 14],
+        'ema_length': [50, 100],
+    }
+
+    # Test 1: the sweep agrees with backtest() on every combination
+    print("\n1. Testing sweep against backtest()...")
+    for ticker in ("AAPL", "MSFT"):
+        df = generate_synthetic_ohlcv(ticker, datetime(2016, 1, 1), datetime(2024, 1, 1))
+        for use_simple_atr in (False, True):
+            strategy = QuantumTrendSwiftEdge(use_simple_atr=use_simple_atr)
+            table = strategy.sweep(df, grid)
+            check(len(table) == 64, f"{ticker} sweep has one row per combination ({len(table)} rows)")
+            check(
+                mismatches(df, table, use_simple_atr) == 0,
+                f"{ticker} metrics equal backtest() (use_simple_atr={use_simple_atr})"
+            )
+
+    # Test 2: the process pool returns the same table
+    print("\n2. Testing process pool...")
+    df = generate_synthetic_ohlcv("AAPL", datetime(2016, 1, 1), datetime(2024, 1, 1))
+    strategy = QuantumTrendSwiftEdge()
+    inline = strategy.sweep(df, grid)
+    pooled = strategy.sweep(df, grid, max_workers=2)
+    check(inline.equals(pooled), "Pooled sweep equals the in-process sweep")
+
+    # Test 3: parameters left out keep the strategy's values
+    print("\n3. Testing partial grid...")
+    table = strategy.sweep(df, {'atr_multiplier': [2.0, 3.0]})
+    check(len(table) == 2, f"Partial grid has one row per value ({len(table)} rows)")
+    check(
+        (table['ema_length'] == strategy.ema_length).all() and (table['atr_period'] == strategy.atr_period).all(),
+        "Other parameters keep the strategy's values"
+    )
+    default = table[table['atr_multiplier'] == strategy.atr_multiplier].iloc[0]
+    results = strategy.backtest(df)
+    check(
+        all(np.isclose(results[metric], default[metric], equal_nan=True) for metric in METRICS),
+        "The strategy's own combination equals its backtest()"
+    )
+
+    # Test 4: invalid grids are rejected
+    print("\n4. Testing invalid grids...")
+    for (label, bad_grid) in (("unknown parameter", {'sensitivity': [1, 2]}), ("empty values", {'atr_period': []})):
+        try:
+            strategy.sweep(df, bad_grid)
+            check(False, f"Grid with {label} was rejected")
+        except ValueError:
+            check(True, f"Grid with {label} was rejected")
+
+    print("\n" + "=" * 60)
+    print("QUANTUMTREND SWEEP TEST COMPLETE")
+    print("=" * 60)
+
+    if failures:
+        print(f"\n❌ {failures} check(s) failed")
+        sys.exit(1)
+    print("\n✅ Sweep matches backtest() offline")
+
+
+# The pooled sweep spawns worker processes, which re-import this module
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Offline test of the streaming indicators against their batch versions
+
+Feeds synthetic series one value at a time through each streaming indicator
+and checks every output against the batch computation on the full series,
+including flat stretches, missing values, and a large price level
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from strategy.quantumtrend_swiftedge import QuantumTrendSwiftEdge
+from utils.indicators import rolling_slope, stochastic_rsi
+from utils.replay_source import generate_synthetic_ohlcv
+from utils.streaming_indicators import (
+    StreamingEMA, StreamingSMA, StreamingZScore, StreamingSlope, StreamingStochasticRSI, StreamingATR
+)
+
+print("=" * 60)
+print("STREAMING INDICATOR TEST - offline")
+print("=" * 60)
+
+failures = 0
+
+
+def check(condition: bool, message: str) -> None:
+    """Print the outcome of a check and count failures"""
+    global failures
+    if condition:
+        print(f"   ✅ {message}")
+    else:
+        failures += 1
+        print(f"   ❌ {message}")
+
+
+def matches(streamed: np.ndarray, expected: np.ndarray, rtol: float = 1e-9, atol: float = 1e-9) -> bool:
+    """Check that two outputs agree value by value, with NaN in the same places"""
+    return bool(np.allclose(streamed, expected, rtol=rtol, atol=atol, equal_nan=True))
+
+
+def stream(indicator, values: np.ndarray) -> np.ndarray:
+    """Feed values one at a time, collecting each output"""
+    return np.array([indicator.update(value) for value in values.tolist()])
+
+
+def make_series(level: float, step: float, n: int = 3000) -> np.ndarray:
+    """Random walk on a price grid, with flat stretches and a missing value"""
+    rng = np.random.default_rng(7)
+    values = level + np.cumsum(rng.choice([-step, 0.0, step], n))
+    values[500:560] = values[500]
+    values[1200] = np.nan
+    return values
+
+
+def exact_zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """Z-score of each value against its window, computed on the window less its first value"""
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    centered = windows - windows[:, :1]
+    mean = centered.mean(axis=1)
+    std = centered.std(axis=1, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscore = np.where(std > 0, (centered[:, -1] - mean) / std, np.nan)
+    return np.concatenate([np.full(window - 1, np.nan), zscore])
+
+
+values = make_series(100.0, 0.5)
+series = pd.Series(values)
+
+# Test 1: moving averages
+print("\n1. Testing moving averages...")
+check(
+    matches(stream(StreamingEMA(span=20), values), series.ewm(span=20, adjust=False, ignore_na=True).mean().to_numpy()),
+    "StreamingEMA equals ewm(span=20, adjust=False)"
+)
+check(
+    matches(stream(StreamingSMA(20), values), series.rolling(20).mean().to_numpy()),
+    "StreamingSMA equals rolling(20).mean()"
+)
+
+# Test 2: z-scores, including a large price level with small moves
+print("\n2. Testing z-scores...")
+# pandas rounds the deviation of a window of equal values to a tiny number
+# rather than zero, where the streaming z-score reports NaN
+expected = (series - series.rolling(20).mean()) / series.rolling(20).std()
+expected[series.rolling(20).max() == series.rolling(20).min()] = np.nan
+check(
+    matches(stream(StreamingZScore(20), values), expected.to_numpy(), rtol=1e-6, atol=1e-6),
+    "StreamingZScore equals the pandas z-score"
+)
+for level in (1e6, 1e9):
+    large = make_series(level, 0.01)
+    streamed = stream(StreamingZScore(20), large)
+    check(
+        matches(streamed, exact_zscore(large, 20), rtol=1e-6, atol=1e-6),
+        f"StreamingZScore is exact at a level of {level:.0e} ({np.isnan(streamed).sum()} NaN outputs)"
+    )
+
+# Test 3: rolling slopes
+print("\n3. Testing slopes...")
+check(matches(stream(StreamingSlope(4), values), rolling_slope(values, 4)), "StreamingSlope equals rolling_slope")
+
+# Test 4: stochastic RSI, including flat stretches
+print("\n4. Testing stochastic RSI...")
+closes = pd.Series(values, index=pd.bdate_range("2010-01-01", periods=len(values)))
+engine = StreamingStochasticRSI(14, 3, 3)
+updates = [engine.update(value) for value in values.tolist()]
+batch = stochastic_rsi(closes, 14, 3, 3)
+
+# The batch result skips the bars around a missing price, where the
+# streaming values carry over unchanged
+rows = closes.index.get_indexer(batch.k_line.index)
+for field in ("stoch_rsi", "k_line", "d_line"):
+    streamed = np.array([getattr(update, field) for update in updates])
+    check(
+        matches(streamed[rows], getattr(batch, field).to_numpy()),
+        f"StreamingStochasticRSI {field} equals stochastic_rsi"
+    )
+
+flat = np.concatenate([np.linspace(100.0, 110.0, 40), np.full(80, 110.0), np.linspace(110.0, 105.0, 40)])
+flat_closes = pd.Series(flat, index=pd.bdate_range("2010-01-01", periods=len(flat)))
+engine = StreamingStochasticRSI(14, 3, 3)
+streamed = np.array([engine.update(value).k_line for value in flat.tolist()])
+expected = stochastic_rsi(flat_closes, 14, 3, 3).k_line.reindex(flat_closes.index).to_numpy()
+check(matches(streamed, expected), "Flat prices give the same K line as stochastic_rsi")
+check(bool(np.isnan(streamed[60:120]).all()), "Flat prices give no K line values")
+
+# Test 5: ATR on OHLC bars
+print("\n5. Testing ATR...")
+bars = generate_synthetic_ohlcv("AAPL", "2015-01-01", "2024-01-01")
+for use_simple_atr in (False, True):
+    strategy = QuantumTrendSwiftEdge(use_simple_atr=use_simple_atr)
+    engine = StreamingATR(14, use_simple_atr)
+    streamed = np.array([
+        engine.update(high, low, close)
+        for (high, low, close) in zip(bars['High'].tolist(), bars['Low'].tolist(), bars['Close'].tolist())
+    ])
+    check(
+        matches(streamed, strategy.calculate_atr(bars, 14).to_numpy()),
+        f"StreamingATR equals calculate_atr (use_simple_atr={use_simple_atr})"
+    )
+
+print("\n" + "=" * 60)
+print("STREAMING INDICATOR TEST COMPLETE")
+print("=" * 60)
+
+if failures:
+    print(f"\n❌ {failures} check(s) failed")
+    sys.exit(1)
+print("\n✅ Streaming indicators match their batch versions")
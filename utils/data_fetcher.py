@@ -2,9 +2,61 @@
 Data fetching utilities for market data
 """
 
+import time
 import pandas as pd
 import yfinance as yf
 from datetime import datetime
+from yfinance.exceptions import YFPricesMissingError
+
+from .fetch_metrics import fetch_metrics
+
+
+def download_yfinance(ticker: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+    """
+    Download OHLCV bars for one ticker from Yahoo Finance, raising on failure
+
+    yf.download logs request errors and returns an empty frame, which cannot
+    be told apart from a window without bars. This fetches through
+    Ticker.history with errors raised instead, and only returns an empty
+    frame when Yahoo answered that the window holds no prices.
+
+    Args:
+        ticker: Stock ticker symbol
+        start_date: Start date for historical data
+        end_date: End date for historical data (exclusive)
+        interval: Data interval (1m, 5m, 15m, 1d, 1wk, 1mo)
+
+    Returns:
+        DataFrame with OHLCV columns and Date index (empty if Yahoo has no
+        bars in the window)
+
+    Raises:
+        Exception: The request failed (network error, HTTP error status,
+            unknown timezone)
+    """
+    try:
+        df = yf.Ticker(ticker).history(
+            start=start_date,
+            end=end_date,
+            interval=interval,
+            auto_adjust=True,
+            raise_errors=True
+        )
+    except YFPricesMissingError as e:
+        # An error status from Yahoo is a failed request, not an empty window
+        if "status_code" in str(e):
+            raise
+        return pd.DataFrame()
+
+    # Match yf.download, which drops the exchange timezone from daily and
+    # longer bars
+    if not interval.endswith(("m", "h")) and isinstance(df.index, pd.DatetimeIndex):
+        df.index = df.index.tz_localize(None)
+
+    expected_cols = ["Open", "High", "Low", "Close", "Volume"]
+    if all(col in df.columns for col in expected_cols):
+        df = df[expected_cols]
+    return df
 
 
 def fetch_ohlcv_history(
@@ -27,36 +79,24 @@ def fetch_ohlcv_history(
     Returns:
         DataFrame with OHLCV columns and Date index
     """
+    started = time.perf_counter()
     try:
-        # Download the OHLCV market data for the ticker
-        df = yf.download(
-            tickers=ticker,
-            start=start_date,
-            end=end_date,
-            interval=interval,
-            auto_adjust=True,
-            progress=False
-        )
+        # Download the OHLCV market data for the ticker (raises when the
+        # request fails, so an empty frame is a window without bars)
+        df = download_yfinance(ticker, start_date, end_date, interval)
         
         if debug:
             print(f"fetch_ohlcv_history: Downloaded {len(df)} rows for {ticker}")
             print(f"Columns: {df.columns.tolist()}")
+            if not df.empty and "Close" not in df.columns:
+                print(f"Warning: Missing columns. Available: {df.columns.tolist()}")
         
-        # For single ticker, yfinance returns a simple DataFrame
-        # Just ensure we have the right columns
-        if not df.empty:
-            # Make sure we have standard column names
-            expected_cols = ["Open", "High", "Low", "Close", "Volume"]
-            # Check if all expected columns exist
-            available_cols = [col for col in expected_cols if col in df.columns]
-            if len(available_cols) == len(expected_cols):
-                df = df[expected_cols]
-            else:
-                if debug:
-                    print(f"Warning: Missing columns. Available: {df.columns.tolist()}")
-        
+        # Same success rule as the unified fetcher: only a failed request
+        # counts against the source, not an empty window
+        fetch_metrics.record_request("yfinance", interval, time.perf_counter() - started, len(df), True)
         return df
     except Exception as e:
         if debug:
             print(f"Error in fetch_ohlcv_history: {str(e)}")
+        fetch_metrics.record_request("yfinance", interval, time.perf_counter() - started, 0, False)
         return pd.DataFrame()
@@ -0,0 +1,280 @@
+"""
+Fetch-layer metrics per data source and interval, with Prometheus text export
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Default path of the Prometheus text file, overridable through the environment
+DEFAULT_METRICS_FILE = os.environ.get(
+    "QUANTUMTRADE_METRICS_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "metrics", "fetch.prom")
+)
+
+
+@dataclass
+class _SeriesCounters:
+    """Mutable counters of one (source, interval) pair"""
+    requests: int = 0
+    errors: int = 0
+    latency_counts: np.ndarray = field(default_factory=lambda: np.zeros(len(LATENCY_BUCKETS) + 1, dtype=np.int64))
+    latency_sum: float = 0.0
+    payload_bytes: int = 0
+    rows: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+
+
+@dataclass(frozen=True)
+class FetchStats:
+    """Data schema for the fetch metrics of one source and interval"""
+    source: str
+    interval: str
+    requests: int
+    errors: int
+    latency_buckets: Tuple[int, ...]
+    latency_sum: float
+    payload_bytes: int
+    rows: int
+    cache_hits: int
+    cache_misses: int
+    retries: int
+    rate_limited: int
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of fetches answered from a local store (NaN before any)"""
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else np.nan
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean request latency in seconds (NaN before any request)"""
+        return self.latency_sum / self.requests if self.requests else np.nan
+
+    def latency_percentile(self, q: float) -> float:
+        """
+        Estimate a latency percentile from the histogram buckets
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Upper bound (seconds) of the bucket holding the percentile (inf
+            when it falls past the last bucket, NaN before any request)
+        """
+        if not self.requests:
+            return np.nan
+
+        cumulative = np.cumsum(self.latency_buckets)
+        position = int(np.searchsorted(cumulative, q / 100.0 * self.requests))
+        return LATENCY_BUCKETS[position] if position < len(LATENCY_BUCKETS) else np.inf
+
+
+class FetchMetrics:
+    """
+    Thread-safe collector of request, payload, and cache metrics
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty collector"""
+        self._series: Dict[Tuple[str, str], _SeriesCounters] = {}
+        self._lock = threading.Lock()
+
+    def _counters(self, source: str, interval: str) -> _SeriesCounters:
+        """Return the counters of a series (the lock must be held)"""
+        key = (source, interval)
+        if key not in self._series:
+            self._series[key] = _SeriesCounters()
+        return self._series[key]
+
+    def record_request(self, source: str, interval: str, latency: float, rows: int, ok: bool) -> None:
+        """
+        Record a completed request to a data source
+
+        Args:
+            source: Data source name
+            interval: Data interval
+            latency: Wall time of the request in seconds
+            rows: Number of bars returned
+            ok: True if the request returned data
+        """
+        bucket = int(np.searchsorted(LATENCY_BUCKETS, latency))
+        with self._lock:
+            counters = self._counters(source, interval)
+            counters.requests += 1
+            counters.errors += 0 if ok else 1
+            counters.latency_counts[bucket] += 1
+            counters.latency_sum += latency
+            counters.rows += rows
+
+    def record_payload(self, source: str, interval: str, nbytes: int, retries: int = 0) -> None:
+        """
+        Record the body size of an HTTP response and the retries it took
+
+        Args:
+            source: Data source name
+            interval: Data interval
+            nbytes: Size of the response body in bytes
+            retries: Number of times the request was retried
+        """
+        with self._lock:
+            counters = self._counters(source, interval)
+            counters.payload_bytes += nbytes
+            counters.retries += retries
+
+    def record_cache(self, source: str, interval: str, hit: bool) -> None:
+        """
+        Record whether a fetch was answered from a local store
+
+        Args:
+            source: Data source name
+            interval: Data interval
+            hit: True if no network request was needed
+        """
+        with self._lock:
+            counters = self._counters(source, interval)
+            if hit:
+                counters.cache_hits += 1
+            else:
+                counters.cache_misses += 1
+
+    def record_rate_limited(self, source: str, interval: str) -> None:
+        """Record a request the provider rejected for quota"""
+        with self._lock:
+            self._counters(source, interval).rate_limited += 1
+
+    def stats(self) -> Dict[Tuple[str, str], FetchStats]:
+        """
+        Get a snapshot of the metrics
+
+        Returns:
+            FetchStats keyed by (source, interval)
+        """
+        with self._lock:
+            return {
+                (source, interval): FetchStats(
+                    source=source,
+                    interval=interval,
+                    requests=counters.requests,
+                    errors=counters.errors,
+                    latency_buckets=tuple(int(count) for count in counters.latency_counts),
+                    latency_sum=counters.latency_sum,
+                    payload_bytes=counters.payload_bytes,
+                    rows=counters.rows,
+                    cache_hits=counters.cache_hits,
+                    cache_misses=counters.cache_misses,
+                    retries=counters.retries,
+                    rate_limited=counters.rate_limited
+                )
+                for ((source, interval), counters) in sorted(self._series.items())
+            }
+
+    def reset(self) -> None:
+        """Forget every recorded metric"""
+        with self._lock:
+            self._series.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format
+
+        Returns:
+            Metrics text, one sample per line
+        """
+        stats = self.stats().values()
+        lines = []
+
+        def counter(name: str, help_text: str, value_of) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for s in stats:
+                for (extra_labels, value) in value_of(s):
+                    lines.append(f"{name}{{{_labels(s, extra_labels)}}} {value}")
+
+        counter(
+            "quantumtrade_fetch_requests_total",
+            "Requests sent to a data source.",
+            lambda s: [('outcome="ok"', s.requests - s.errors), ('outcome="error"', s.errors)]
+        )
+
+        name = "quantumtrade_fetch_latency_seconds"
+        lines.append(f"# HELP {name} Latency of requests to a data source.")
+        lines.append(f"# TYPE {name} histogram")
+        for s in stats:
+            cumulative = np.cumsum(s.latency_buckets)
+            for (bound, count) in zip(LATENCY_BUCKETS, cumulative):
+                le = f'le="{bound}"'
+                lines.append(f"{name}_bucket{{{_labels(s, le)}}} {count}")
+            le = 'le="+Inf"'
+            lines.append(f"{name}_bucket{{{_labels(s, le)}}} {s.requests}")
+            lines.append(f"{name}_sum{{{_labels(s)}}} {s.latency_sum}")
+            lines.append(f"{name}_count{{{_labels(s)}}} {s.requests}")
+
+        counter(
+            "quantumtrade_fetch_payload_bytes_total",
+            "Bytes of HTTP response bodies received from a data source.",
+            lambda s: [("", s.payload_bytes)]
+        )
+        counter(
+            "quantumtrade_fetch_rows_total",
+            "Bars returned by a data source.",
+            lambda s: [("", s.rows)]
+        )
+        counter(
+            "quantumtrade_fetch_cache_total",
+            "Fetches answered from a local store (hit) or the network (miss).",
+            lambda s: [('result="hit"', s.cache_hits), ('result="miss"', s.cache_misses)]
+        )
+        counter(
+            "quantumtrade_fetch_retries_total",
+            "Requests retried after a connection error or retryable status.",
+            lambda s: [("", s.retries)]
+        )
+        counter(
+            "quantumtrade_fetch_rate_limited_total",
+            "Requests rejected by a data source for quota.",
+            lambda s: [("", s.rate_limited)]
+        )
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[str] = None) -> str:
+        """
+        Write the metrics to a Prometheus text file (e.g. for the node
+        exporter textfile collector), replacing it atomically
+
+        Args:
+            path: Output path (default DEFAULT_METRICS_FILE)
+
+        Returns:
+            Path of the written file
+        """
+        path = path or DEFAULT_METRICS_FILE
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+
+def _labels(stats: FetchStats, extra: str = "") -> str:
+    """Format the label set of a sample"""
+    labels = f'source="{stats.source}",interval="{stats.interval}"'
+    return f"{labels},{extra}" if extra else labels
+
+
+# Process-wide collector fed by every fetch
+fetch_metrics = FetchMetrics()
@@ -0,0 +1,99 @@
+"""
+Pooled HTTP sessions with retry and backoff for the REST data sources
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Data schema for the connection pool and retry settings of a source"""
+    total: int = 3
+    backoff_factor: float = 0.5
+    backoff_jitter: float = 0.25
+    backoff_max: float = 30.0
+    status_forcelist: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    pool_maxsize: int = 10
+
+
+# Default policy per data source, keyed by the fetch_market_data source name
+DEFAULT_RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    "alphavantage": RetryPolicy(),
+    "polygon": RetryPolicy(),
+}
+
+_sessions: Dict[str, requests.Session] = {}
+_policies: Dict[str, RetryPolicy] = dict(DEFAULT_RETRY_POLICIES)
+_sessions_lock = threading.Lock()
+
+
+def _build_retry(policy: RetryPolicy) -> Retry:
+    """Build the urllib3 retry strategy for a policy"""
+    kwargs = dict(
+        total=policy.total,
+        connect=policy.total,
+        read=policy.total,
+        status=policy.total,
+        backoff_factor=policy.backoff_factor,
+        status_forcelist=policy.status_forcelist,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+    # Jitter and a backoff cap are only supported from urllib3 2.0 onward
+    try:
+        return Retry(backoff_jitter=policy.backoff_jitter, backoff_max=policy.backoff_max, **kwargs)
+    except TypeError:
+        return Retry(**kwargs)
+
+
+def _build_session(policy: RetryPolicy) -> requests.Session:
+    """Build a keep-alive session whose adapters retry with backoff"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=policy.pool_maxsize,
+        max_retries=_build_retry(policy)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(source: str) -> requests.Session:
+    """
+    Get the shared keep-alive session for a data source
+
+    Args:
+        source: Data source name (e.g. "alphavantage" or "polygon")
+
+    Returns:
+        requests.Session reused by every request to that source
+    """
+    with _sessions_lock:
+        if source not in _sessions:
+            _sessions[source] = _build_session(_policies.get(source, RetryPolicy()))
+        return _sessions[source]
+
+
+def configure_session(source: str, policy: Optional[RetryPolicy] = None) -> None:
+    """
+    Set the retry policy for a data source, replacing its current session
+
+    Args:
+        source: Data source name
+        policy: New RetryPolicy (default RetryPolicy())
+    """
+    with _sessions_lock:
+        _policies[source] = policy or RetryPolicy()
+        old_session = _sessions.pop(source, None)
+
+    if old_session is not None:
+        old_session.close()
@@ -0,0 +1,251 @@
+"""
+Content-addressed memoization of indicator results with byte-bounded LRU eviction
+
+A hit is not free: the arguments are hashed and the cached result copied on
+every call, which costs about as much as a pass over the input and output.
+Caching pays off for indicators that do more work than that (Python-level
+recursions, windowed regressions, repeated strategy reruns), and can be a
+net loss for cheap vectorized ones on large arrays; see
+benchmarks/bench_indicator_cache.py.
+"""
+
+import os
+import sys
+import hashlib
+import functools
+import threading
+import dataclasses
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+
+# Default cache capacity in megabytes, overridable through the environment
+# (0 disables caching)
+DEFAULT_CACHE_MB = float(os.environ.get("QUANTUMTRADE_INDICATOR_CACHE_MB", "256"))
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Data schema for indicator cache statistics"""
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the cache (NaN before any)"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else np.nan
+
+
+def _update_fingerprint(digest, obj: Any) -> None:
+    """Feed the content of an argument into a hash"""
+    if isinstance(obj, np.ndarray):
+        digest.update(f"ndarray:{obj.dtype.str}:{obj.shape}".encode())
+        if obj.dtype.hasobject:
+            digest.update(pd.util.hash_array(obj.ravel()).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(obj).view(np.uint8).data)
+    elif isinstance(obj, pd.Series):
+        digest.update(f"Series:{obj.name!r}".encode())
+        _update_fingerprint(digest, obj.index)
+        _update_fingerprint(digest, obj.to_numpy())
+    elif isinstance(obj, pd.DataFrame):
+        digest.update(f"DataFrame:{list(obj.columns)!r}".encode())
+        _update_fingerprint(digest, obj.index)
+        for i in range(obj.shape[1]):
+            _update_fingerprint(digest, obj.iloc[:, i].to_numpy())
+    elif isinstance(obj, pd.DatetimeIndex):
+        digest.update(f"DatetimeIndex:{obj.tz}".encode())
+        _update_fingerprint(digest, obj.asi8)
+    elif isinstance(obj, pd.RangeIndex):
+        digest.update(f"RangeIndex:{obj.start}:{obj.stop}:{obj.step}".encode())
+    elif isinstance(obj, pd.Index):
+        digest.update(b"Index:")
+        _update_fingerprint(digest, obj.to_numpy())
+    elif isinstance(obj, (list, tuple)):
+        digest.update(f"{type(obj).__name__}:{len(obj)}".encode())
+        for item in obj:
+            _update_fingerprint(digest, item)
+    elif isinstance(obj, dict):
+        digest.update(f"dict:{len(obj)}".encode())
+        for key in sorted(obj, key=repr):
+            _update_fingerprint(digest, key)
+            _update_fingerprint(digest, obj[key])
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        # Objects (e.g. a strategy whose methods are cached) are identified
+        # by their class and settings
+        digest.update(f"object:{type(obj).__module__}.{type(obj).__qualname__}".encode())
+        _update_fingerprint(digest, vars(obj))
+    else:
+        digest.update(f"{type(obj).__name__}:{obj!r}".encode())
+
+
+def fingerprint(*args, **kwargs) -> str:
+    """
+    Compute a content hash of call arguments
+
+    Args:
+        *args: Positional arguments (arrays, Series, DataFrames, scalars)
+        **kwargs: Keyword arguments
+
+    Returns:
+        Hex digest identifying the argument contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _update_fingerprint(digest, args)
+    _update_fingerprint(digest, kwargs)
+    return digest.hexdigest()
+
+
+def _result_nbytes(result: Any) -> int:
+    """Estimate the memory held by a result"""
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return int(np.sum(result.memory_usage(index=True)))
+    if isinstance(result, (list, tuple)):
+        return sum(_result_nbytes(item) for item in result)
+    if dataclasses.is_dataclass(result):
+        return sum(_result_nbytes(getattr(result, f.name)) for f in dataclasses.fields(result))
+    return sys.getsizeof(result)
+
+
+def _copy_result(result: Any) -> Any:
+    """Copy a result so callers cannot modify the cached one"""
+    if isinstance(result, (np.ndarray, pd.Series, pd.DataFrame)):
+        return result.copy()
+    if isinstance(result, tuple):
+        return tuple(_copy_result(item) for item in result)
+    if isinstance(result, list):
+        return [_copy_result(item) for item in result]
+    if dataclasses.is_dataclass(result) and not isinstance(result, type):
+        return dataclasses.replace(
+            result,
+            **{f.name: _copy_result(getattr(result, f.name)) for f in dataclasses.fields(result) if f.init}
+        )
+    return result
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator results keyed by the function and a content hash
+    of its arguments, bounded by the bytes of the cached results
+    """
+
+    def __init__(self, max_bytes: int = int(DEFAULT_CACHE_MB * 1024 * 1024)) -> None:
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Capacity in bytes (0 disables caching)
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Return the cached result of fn(*args, **kwargs), computing it on a miss
+
+        Args:
+            name: Qualified name of the function
+            fn: Function to call
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Copy of the (possibly cached) result
+        """
+        if self.max_bytes <= 0:
+            return fn(*args, **kwargs)
+
+        key = f"{name}:{fingerprint(*args, **kwargs)}"
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return _copy_result(self._entries[key])
+            self._misses += 1
+
+        result = fn(*args, **kwargs)
+        self._put(key, result)
+        return _copy_result(result)
+
+    def _put(self, key: str, result: Any) -> None:
+        """Store a result, evicting the least recently used ones to fit it"""
+        nbytes = _result_nbytes(result)
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+
+            self._entries[key] = result
+            self._sizes[key] = nbytes
+            self._bytes += nbytes
+
+            while self._bytes > self.max_bytes:
+                (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+                self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Get the hit, miss, eviction, and size counters"""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes
+            )
+
+    def clear(self) -> None:
+        """Drop every cached result and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+
+# Process-wide cache shared by every cached indicator (it survives Streamlit
+# reruns, which re-execute the script but keep imported modules)
+indicator_cache = IndicatorCache()
+
+
+def cached_indicator(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorate an indicator function or method so its results are memoized in
+    indicator_cache (a method's key includes its object's settings)
+
+    Args:
+        fn: Indicator function
+
+    Returns:
+        Wrapped function returning copies of cached results
+    """
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return indicator_cache.get_or_compute(name, fn, *args, **kwargs)
+
+    return wrapper
@@ -4,8 +4,18 @@ Technical indicators and calculations
 
 import pandas as pd
 import numpy as np
-from scipy import stats
+from scipy import stats, signal
 from dataclasses import dataclass
+from typing import Sequence, Optional, Tuple
+
+from .indicator_cache import cached_indicator
+
+# Check to see if Numba is available to compile the sequential kernels
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 
 def calculate_slope(series: pd.Series) -> float:
@@ -32,6 +42,46 @@ def calculate_slope(series: pd.Series) -> float:
     return stats.linregress(np.arange(0, len(series)), series).slope
 
 
+def rolling_slope(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Calculate the least-squares slope over a rolling window in one pass
+
+    Equivalent to ``rolling(window).apply(calculate_slope)`` applied to each
+    column: windows holding a NaN or only equal values give NaN, as do the
+    first window - 1 rows.
+
+    Args:
+        values: 1-D array of values, or 2-D (time x series) array
+        window: Number of points in each regression
+
+    Returns:
+        Array of slopes with the same shape as values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    slopes = np.full(values.shape, np.nan)
+
+    # Check to see if the window cannot hold two points or the series is
+    # shorter than a single window
+    if window < 2 or len(values) < window:
+        return slopes
+
+    # The slope is the correlation of each window with the centered x values
+    # scaled by their sum of squares, computed as a dot product over
+    # zero-copy window views (windows run along the last axis)
+    x = np.arange(window, dtype=np.float64)
+    weights = (x - x.mean()) / np.sum((x - x.mean()) ** 2)
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+    window_slopes = windows @ weights
+
+    # Windows whose values are all equal have no slope (NaN windows already
+    # propagate NaN through the dot product)
+    flat = np.all(windows == windows[..., :1], axis=-1)
+    window_slopes[flat] = np.nan
+
+    slopes[window - 1:] = window_slopes
+    return slopes
+
+
 @dataclass(frozen=True)
 class StochasticRSIComputation:
     """Data schema for stochastic RSI computation results"""
@@ -40,6 +90,7 @@ class StochasticRSIComputation:
     d_line: pd.Series
 
 
+@cached_indicator
 def stochastic_rsi(
         series: pd.Series,
         period: int = 14,
@@ -68,63 +119,358 @@ def stochastic_rsi(
     # Calculate the price changes between consecutive periods, dropping any NA rows
     delta = series.diff().dropna()
 
-    # Initialize two series, one for price increases (ups) and another for
-    # decreases (downs)
-    ups = pd.Series(np.zeros(len(delta)), index=delta.index)
-    downs = ups.copy()
-
-    # Fill the ups with positive price changes and the downs with absolute
-    # value of negative price changes
-    ups[delta > 0] = delta[delta > 0]
-    downs[delta < 0] = np.absolute(delta[delta < 0])
-
-    # Set the first usable value as the average of the gains, removing the
-    # first period minus one values that aren't used
-    ups[ups.index[period - 1]] = np.mean(ups[:period])
-    ups = ups.drop(ups.index[:period - 1])
-
-    # Do the same for the downs, setting the first usable value as the average
-    # of initial losses, removing any values that were not computed for a full
-    # period worth of data
-    downs[downs.index[period - 1]] = np.mean(downs[:period])
-    downs = downs.drop(downs.index[:period - 1])
-
-    # Compute the exponential moving average of the ups
-    ups_ewm = ups.ewm(
-        com=period - 1,
-        min_periods=0,
-        adjust=False,
-        ignore_na=False
-    ).mean()
-
-    # Do the same for the downs
-    downs_ewm = downs.ewm(
-        com=period - 1,
-        min_periods=0,
-        adjust=False,
-        ignore_na=False
-    ).mean()
+    (stoch_rsi, k_line, d_line) = _stochastic_rsi_kernel(
+        delta.to_numpy(dtype=np.float64)[:, np.newaxis],
+        period,
+        k_smooth,
+        d_smooth
+    )
+
+    # Construct and return the stochastic RSI values, indexed from the first
+    # bar with a full period of price changes
+    index = delta.index[period - 1:]
+    return StochasticRSIComputation(
+        stoch_rsi=pd.Series(stoch_rsi[:, 0], index=index),
+        k_line=pd.Series(k_line[:, 0], index=index),
+        d_line=pd.Series(d_line[:, 0], index=index)
+    )
+
+
+@dataclass(frozen=True)
+class StochasticRSIBatch:
+    """Data schema for batched stochastic RSI computation results"""
+    stoch_rsi: np.ndarray
+    k_line: np.ndarray
+    d_line: np.ndarray
+
+
+def stochastic_rsi_batch(
+        prices: np.ndarray,
+        period: int = 14,
+        k_smooth: int = 3,
+        d_smooth: int = 3
+) -> StochasticRSIBatch:
+    """
+    Calculate TradingView-compatible Stochastic RSI for many series at once
+
+    Each column gets the same values as stochastic_rsi on that column alone:
+    NaN prices (e.g. the leading rows of a ticker listed after the start of
+    a universe matrix) are skipped, and each column is seeded from its own
+    first period of valid price changes.
+
+    Args:
+        prices: (time x tickers) array of prices (a 1-D array is one ticker)
+        period: RSI period (default 14)
+        k_smooth: K-line smoothing period (default 3)
+        d_smooth: D-line smoothing period (default 3)
+
+    Returns:
+        StochasticRSIBatch with stoch_rsi, k_line, and d_line arrays shaped
+        like prices, NaN where a column has no value yet (the first period
+        rows of a column without NaN prices)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    columns = prices.reshape(len(prices), -1)
+
+    # Check to see if an invalid period value was supplied
+    if period <= 0 or period >= len(prices):
+        raise ValueError(
+            f"Period must be greater than 0 and less than the length of the "
+            f"series (got period={period}, data length={len(prices)})"
+        )
+
+    # Price change of each row against the previous one (NaN for the first
+    # row and next to missing prices)
+    delta = np.full(columns.shape, np.nan)
+    delta[1:] = np.diff(columns, axis=0)
+    valid = ~np.isnan(delta)
+
+    (stoch_rsi, k_line, d_line) = [np.full(columns.shape, np.nan) for _ in range(3)]
+
+    # Columns with the same rows of valid changes are computed together on
+    # those rows (usually a single group, or one per listing date)
+    groups = {}
+    for (j, pattern) in enumerate(np.packbits(valid, axis=0).T):
+        groups.setdefault(pattern.tobytes(), []).append(j)
+
+    for group in groups.values():
+        rows = np.flatnonzero(valid[:, group[0]])
+        if len(rows) < period:
+            continue
+
+        # Use plain slices for the common case of a shared block of valid
+        # rows, and fancy indexing for columns with gaps
+        if len(rows) == rows[-1] - rows[0] + 1:
+            index = (slice(rows[0], rows[-1] + 1), group if len(group) < columns.shape[1] else slice(None))
+            output = (slice(rows[0] + period - 1, rows[-1] + 1), index[1])
+        else:
+            index = np.ix_(rows, group)
+            output = np.ix_(rows[period - 1:], group)
+
+        computed = _stochastic_rsi_kernel(delta[index], period, k_smooth, d_smooth)
+        for (result, values) in zip((stoch_rsi, k_line, d_line), computed):
+            result[output] = values
+
+    (stoch_rsi, k_line, d_line) = [values.reshape(prices.shape) for values in (stoch_rsi, k_line, d_line)]
+
+    return StochasticRSIBatch(stoch_rsi=stoch_rsi, k_line=k_line, d_line=d_line)
+
+
+# Relative RSI range below which a stochastic RSI window counts as flat, so
+# the rounding noise of the RSI over flat prices is not scaled up to [0, 1]
+FLAT_RSI_RTOL = 1e-10
+
+
+def _rolling_window(values: np.ndarray, window: int, reduce) -> np.ndarray:
+    """Apply a reduction over a trailing window, NaN for the first window - 1 rows"""
+    result = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+        result[window - 1:] = reduce(windows, axis=-1)
+    return result
+
+
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponential moving average along the time axis, seeded with the first
+    row (pandas ewm with adjust=False)
+    """
+    # Start the recursive filter as if the row before the first one equalled
+    # the first row, so the first output is the seed itself
+    initial = (1.0 - alpha) * values[:1]
+    (smoothed, _) = signal.lfilter([alpha], [1.0, alpha - 1.0], values, axis=0, zi=initial)
+    return smoothed
+
+
+def _split_changes(delta: np.ndarray):
+    """Split price changes into increases (ups) and the absolute value of decreases (downs)"""
+    return (np.where(delta > 0, delta, 0.0), np.where(delta < 0, -delta, 0.0))
+
+
+def _stochastic_rsi_raw(ups: np.ndarray, downs: np.ndarray, period: int) -> np.ndarray:
+    """
+    Compute the unsmoothed stochastic RSI from (time x series) ups and downs,
+    starting at the price change index period - 1
+    """
+    # Set the first usable value as the average of the first period of gains
+    # and losses, removing the first period minus one values that aren't used
+    (ups_seed, downs_seed) = (ups[:period].mean(axis=0), downs[:period].mean(axis=0))
+    ups = ups[period - 1:].copy()
+    downs = downs[period - 1:].copy()
+    ups[0] = ups_seed
+    downs[0] = downs_seed
+
+    # Compute the exponential moving averages of the ups and downs, equal to
+    # ewm(com=period - 1, adjust=False) seeded with the first value
+    alpha = 1.0 / period
+    ups_ewm = _ewm(ups, alpha)
+    downs_ewm = _ewm(downs, alpha)
 
     # Compute the relative strength (RS) as the average gains divided by the
     # average losses, then construct the relative strength index (RSI) by
     # scaling RS to the range [0, 100]
-    rs = ups_ewm / downs_ewm
-    rsi = 100 - (100 / (1.0 + rs))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = ups_ewm / downs_ewm
+        rsi = 100 - (100 / (1.0 + rs))
 
-    # Compute the stochastic RSI values using min-max scaling across the period
-    rsi_min = rsi.rolling(period).min()
-    rsi_max = rsi.rolling(period).max()
-    stoch_rsi = (rsi - rsi_min) / (rsi_max - rsi_min)
+        # Compute the stochastic RSI values using min-max scaling across the period
+        rsi_min = _rolling_window(rsi, period, np.min)
+        rsi_max = _rolling_window(rsi, period, np.max)
+        rsi_range = rsi_max - rsi_min
+        flat = rsi_range <= FLAT_RSI_RTOL * np.maximum(np.abs(rsi_max), np.abs(rsi_min))
+        return np.where(flat, np.nan, (rsi - rsi_min) / rsi_range)
 
-    # Construct two smoothed values, including (1) the K-line, which is a
-    # smoothing of the raw stochastic RSI values, and (2) the D-line which
-    # is a smoothing of the K-line
-    k_line = stoch_rsi.rolling(k_smooth).mean()
-    d_line = k_line.rolling(d_smooth).mean()
 
-    # Construct and return the stochastic RSI values
-    return StochasticRSIComputation(
-        stoch_rsi=stoch_rsi,
-        k_line=k_line,
-        d_line=d_line
+def _stochastic_rsi_kernel(delta: np.ndarray, period: int, k_smooth: int, d_smooth: int):
+    """
+    Compute the stochastic RSI, K-line, and D-line from (time x series)
+    price changes, starting at the price change index period - 1
+    """
+    (ups, downs) = _split_changes(delta)
+    stoch_rsi = _stochastic_rsi_raw(ups, downs, period)
+
+    # Construct the K-line as a smoothing of the raw stochastic RSI values,
+    # and the D-line as a smoothing of the K-line
+    k_line = _rolling_window(stoch_rsi, k_smooth, np.mean)
+    d_line = _rolling_window(k_line, d_smooth, np.mean)
+
+    return (stoch_rsi, k_line, d_line)
+
+
+# Parameter fields of a stochastic RSI sweep
+SWEEP_PARAMS_DTYPE = np.dtype([("period", "<i8"), ("k_smooth", "<i8"), ("d_smooth", "<i8")])
+
+
+@dataclass(frozen=True)
+class StochasticRSISweep:
+    """Data schema for stochastic RSI parameter sweep results"""
+    index: pd.Index
+    params: np.ndarray
+    k_lines: np.ndarray
+    d_lines: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Get the sweep as a tidy long table
+
+        Returns:
+            DataFrame with one row per (combination, bar) and columns Date,
+            period, k_smooth, d_smooth, k_line, and d_line
+        """
+        n_bars = len(self.index)
+        return pd.DataFrame({
+            "Date": np.tile(self.index.to_numpy(), len(self.params)),
+            "period": np.repeat(self.params["period"], n_bars),
+            "k_smooth": np.repeat(self.params["k_smooth"], n_bars),
+            "d_smooth": np.repeat(self.params["d_smooth"], n_bars),
+            "k_line": self.k_lines.ravel(),
+            "d_line": self.d_lines.ravel(),
+        })
+
+
+@cached_indicator
+def stochastic_rsi_sweep(
+        series: pd.Series,
+        periods: Sequence[int] = (14,),
+        k_smooths: Sequence[int] = (3,),
+        d_smooths: Sequence[int] = (3,)
+) -> StochasticRSISweep:
+    """
+    Calculate the Stochastic RSI for every combination of parameters
+
+    The price changes are split once, the RSI and its min-max scaling are
+    computed once per period, and each K-line once per (period, k_smooth),
+    so only the smoothing is repeated across the grid. Every combination
+    gives the same values as stochastic_rsi with those parameters.
+
+    Args:
+        series: Price series (typically closing prices)
+        periods: RSI periods to evaluate
+        k_smooths: K-line smoothing periods to evaluate
+        d_smooths: D-line smoothing periods to evaluate
+
+    Returns:
+        StochasticRSISweep with the combinations in params (ordered by
+        period, then k_smooth, then d_smooth) and (combination x bar) K and
+        D lines aligned on the series index (NaN before each combination's
+        first value)
+    """
+    # Check to see if an invalid period value was supplied
+    for period in periods:
+        if period <= 0 or period >= len(series):
+            raise ValueError(
+                f"Period must be greater than 0 and less than the length of the "
+                f"series (got period={period}, data length={len(series)})"
+            )
+
+    # Calculate the price changes once, keeping the bar position of each
+    delta = series.diff().to_numpy(dtype=np.float64)
+    positions = np.flatnonzero(~np.isnan(delta))
+    (ups, downs) = _split_changes(delta[positions][:, np.newaxis])
+
+    params = np.array(
+        [(p, k, d) for p in periods for k in k_smooths for d in d_smooths],
+        dtype=SWEEP_PARAMS_DTYPE
     )
+    k_lines = np.full((len(params), len(series)), np.nan)
+    d_lines = np.full((len(params), len(series)), np.nan)
+
+    row = 0
+    for period in periods:
+        stoch_rsi = _stochastic_rsi_raw(ups, downs, period)
+        columns = positions[period - 1:]
+
+        for k_smooth in k_smooths:
+            k_line = _rolling_window(stoch_rsi, k_smooth, np.mean)
+            for d_smooth in d_smooths:
+                k_lines[row, columns] = k_line[:, 0]
+                d_lines[row, columns] = _rolling_window(k_line, d_smooth, np.mean)[:, 0]
+                row += 1
+
+    return StochasticRSISweep(index=series.index, params=params, k_lines=k_lines, d_lines=d_lines)
+
+
+def _supertrend_loop(close, upper_band, lower_band, supertrend, direction) -> None:
+    """
+    Run the Supertrend recursion over indexable sequences, ratcheting the
+    bands in place and filling supertrend and direction
+    """
+    supertrend[0] = lower_band[0]
+    direction[0] = 1.0
+
+    for i in range(1, len(close)):
+        # Flip the direction when the close crosses the previous band
+        if close[i] > upper_band[i - 1]:
+            trend = 1.0
+        elif close[i] < lower_band[i - 1]:
+            trend = -1.0
+        else:
+            trend = direction[i - 1]
+
+            # Keep the band of the current trend from moving against it
+            if trend == 1.0 and lower_band[i] < lower_band[i - 1]:
+                lower_band[i] = lower_band[i - 1]
+            if trend == -1.0 and upper_band[i] > upper_band[i - 1]:
+                upper_band[i] = upper_band[i - 1]
+
+        direction[i] = trend
+        supertrend[i] = lower_band[i] if trend == 1.0 else upper_band[i]
+
+
+# Compiled version of the loop, built when Numba is installed
+_supertrend_loop_jit = njit(cache=True)(_supertrend_loop) if NUMBA_AVAILABLE else None
+
+
+def supertrend_kernel(
+        close: np.ndarray,
+        upper_band: np.ndarray,
+        lower_band: np.ndarray,
+        use_numba: Optional[bool] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate the Supertrend line and direction from the basic ATR bands
+
+    Args:
+        close: Closing prices
+        upper_band: Basic upper band (hl_avg + multiplier * ATR)
+        lower_band: Basic lower band (hl_avg - multiplier * ATR)
+        use_numba: Run the compiled loop (default when Numba is installed);
+            otherwise the loop runs over Python floats
+
+    Returns:
+        Tuple of (supertrend, direction, upper_band, lower_band) float64
+        arrays, with direction 1.0 for uptrend and -1.0 for downtrend and
+        the bands after ratcheting
+    """
+    close = np.asarray(close, dtype=np.float64)
+    upper = np.array(upper_band, dtype=np.float64)
+    lower = np.array(lower_band, dtype=np.float64)
+    n = len(close)
+
+    if n == 0:
+        return (np.empty(0), np.empty(0), upper, lower)
+
+    if use_numba is None:
+        use_numba = NUMBA_AVAILABLE
+    if use_numba and not NUMBA_AVAILABLE:
+        raise ImportError("numba is not installed")
+
+    if use_numba:
+        supertrend = np.empty(n)
+        direction = np.empty(n)
+        _supertrend_loop_jit(close, upper, lower, supertrend, direction)
+        return (supertrend, direction, upper, lower)
+
+    # Indexing Python lists is several times faster than indexing arrays
+    # element by element
+    (upper_list, lower_list) = (upper.tolist(), lower.tolist())
+    (supertrend_list, direction_list) = ([0.0] * n, [0.0] * n)
+    _supertrend_loop(close.tolist(), upper_list, lower_list, supertrend_list, direction_list)
+
+    return (
+        np.array(supertrend_list),
+        np.array(direction_list),
+        np.array(upper_list),
+        np.array(lower_list)
+    )
+
@@ -0,0 +1,374 @@
+"""
+Day-partitioned store of compact intraday bars with resumable backfill
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta, date
+from typing import Optional, List, Callable
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, GoodFriday, USMartinLutherKingJr, USPresidentsDay,
+    USMemorialDay, USLaborDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+)
+
+
+# Default location of the store, overridable through the environment
+DEFAULT_INTRADAY_DIR = os.environ.get(
+    "QUANTUMTRADE_INTRADAY_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "intraday")
+)
+
+# Intraday intervals the store and the fetchers support
+INTRADAY_INTERVALS = ("1m", "5m", "15m")
+
+# Partitions are cut on exchange calendar days
+EXCHANGE_TZ = "America/New_York"
+
+# Compact on-disk record of one bar: UTC epoch nanoseconds, float32 prices,
+# and an unsigned integer volume
+BAR_DTYPE = np.dtype([
+    ("t", "<i8"),
+    ("open", "<f4"),
+    ("high", "<f4"),
+    ("low", "<f4"),
+    ("close", "<f4"),
+    ("volume", "<u8"),
+])
+
+
+class ExchangeHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day closures of the US equity exchanges"""
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date=datetime(2022, 1, 1), observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+def exchange_closed_days(first: date, last: date) -> List[date]:
+    """
+    List the weekends and exchange holidays in a range of days
+
+    Args:
+        first: First day of the range
+        last: Last day of the range (inclusive)
+
+    Returns:
+        Days without a trading session, in order
+    """
+    holidays = ExchangeHolidayCalendar().holidays(first, last)
+    return [
+        day.date()
+        for day in pd.date_range(first, last)
+        if day.dayofweek >= 5 or day in holidays
+    ]
+
+
+def bars_to_records(df: pd.DataFrame) -> np.ndarray:
+    """
+    Convert an OHLCV frame to compact bar records
+
+    Args:
+        df: DataFrame with OHLCV columns and a DatetimeIndex (naive indexes
+            are taken as UTC)
+
+    Returns:
+        Structured array with BAR_DTYPE
+    """
+    index = df.index if df.index.tz is not None else df.index.tz_localize("UTC")
+
+    records = np.empty(len(df), dtype=BAR_DTYPE)
+    records["t"] = index.tz_convert("UTC").tz_localize(None).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    records["open"] = df["Open"].to_numpy(dtype=np.float32)
+    records["high"] = df["High"].to_numpy(dtype=np.float32)
+    records["low"] = df["Low"].to_numpy(dtype=np.float32)
+    records["close"] = df["Close"].to_numpy(dtype=np.float32)
+    records["volume"] = np.nan_to_num(df["Volume"].to_numpy(dtype=np.float64)).astype(np.uint64)
+    return records
+
+
+def records_to_bars(records: np.ndarray) -> pd.DataFrame:
+    """
+    Convert compact bar records to an OHLCV frame
+
+    Args:
+        records: Structured array with BAR_DTYPE
+
+    Returns:
+        DataFrame with float32 price columns, uint64 Volume, and a UTC
+        DatetimeIndex
+    """
+    index = pd.DatetimeIndex(records["t"].astype("datetime64[ns]"), name="Date").tz_localize("UTC")
+    return pd.DataFrame(
+        {
+            "Open": records["open"],
+            "High": records["high"],
+            "Low": records["low"],
+            "Close": records["close"],
+            "Volume": records["volume"],
+        },
+        index=index
+    )
+
+
+class IntradayStore:
+    """
+    Intraday bars stored as one memory-mappable .npy file per exchange day
+
+    Each day lives in ``<root>/<source>/<TICKER>/<interval>/<YYYY-MM-DD>.npy``.
+    A day without bars (weekend or holiday) is stored as an empty file, so a
+    backfill that is interrupted resumes with the first missing day.
+    """
+
+    def __init__(self, root: Optional[str] = None) -> None:
+        """
+        Initialize the store
+
+        Args:
+            root: Root directory of the store (default DEFAULT_INTRADAY_DIR)
+        """
+        self.root = root or DEFAULT_INTRADAY_DIR
+        self._lock = threading.Lock()
+
+    def _series_dir(self, source: str, ticker: str, interval: str) -> str:
+        """Return the partition directory of a series"""
+        safe_ticker = ticker.upper().replace(os.sep, "_").replace("/", "_")
+        return os.path.join(self.root, source, safe_ticker, interval)
+
+    def _day_path(self, source: str, ticker: str, interval: str, day: date) -> str:
+        """Return the partition file of a day"""
+        return os.path.join(self._series_dir(source, ticker, interval), f"{day.isoformat()}.npy")
+
+    def has_day(self, source: str, ticker: str, interval: str, day: date) -> bool:
+        """
+        Check whether a completed exchange day is stored
+
+        The current exchange day is never complete, so it is always refetched.
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+            day: Exchange calendar day
+
+        Returns:
+            True if the day's partition exists and the day is over
+        """
+        today = pd.Timestamp.now(tz=EXCHANGE_TZ).date()
+        return day < today and os.path.exists(self._day_path(source, ticker, interval, day))
+
+    def write_bars(
+            self,
+            source: str,
+            ticker: str,
+            interval: str,
+            df: pd.DataFrame,
+            days: List[date]
+    ) -> int:
+        """
+        Split bars into exchange-day partitions and write them
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+            df: DataFrame with OHLCV columns and DatetimeIndex
+            days: Exchange days the bars were fetched for (days without bars
+                are written as empty partitions)
+
+        Returns:
+            Number of bars written
+        """
+        records = bars_to_records(df) if not df.empty else np.empty(0, dtype=BAR_DTYPE)
+        records = records[np.argsort(records["t"], kind="stable")]
+
+        # Assign every bar to its exchange calendar day
+        stamps = pd.DatetimeIndex(records["t"].astype("datetime64[ns]")).tz_localize("UTC")
+        bar_days = stamps.tz_convert(EXCHANGE_TZ).normalize().tz_localize(None).to_numpy()
+
+        written = 0
+        with self._lock:
+            os.makedirs(self._series_dir(source, ticker, interval), exist_ok=True)
+            for day in days:
+                day_records = records[bar_days == np.datetime64(day, "ns")]
+                _, unique = np.unique(day_records["t"], return_index=True)
+                day_records = day_records[unique]
+
+                path = self._day_path(source, ticker, interval, day)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+                np.save(tmp_path, day_records)
+                os.replace(tmp_path, path)
+                written += len(day_records)
+
+        return written
+
+    def read_partitions(
+            self,
+            source: str,
+            ticker: str,
+            interval: str,
+            start_date: datetime,
+            end_date: datetime
+    ) -> List[np.ndarray]:
+        """
+        Memory-map the stored partitions of the days in a range
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+            start_date: First day of the range
+            end_date: Last day of the range
+
+        Returns:
+            Read-only memory maps (BAR_DTYPE) of the stored days, in order
+        """
+        partitions = []
+        for day in pd.date_range(pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()):
+            path = self._day_path(source, ticker, interval, day.date())
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                records = np.load(path, mmap_mode="r")
+                if len(records) > 0:
+                    partitions.append(records)
+        return partitions
+
+    def read(
+            self,
+            source: str,
+            ticker: str,
+            interval: str,
+            start_date: datetime,
+            end_date: datetime
+    ) -> pd.DataFrame:
+        """
+        Read the bars of a range from the partitions that hold it
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+            start_date: Start of the range (naive values are exchange time)
+            end_date: End of the range (naive values are exchange time)
+
+        Returns:
+            DataFrame with float32 price columns, uint64 Volume, and a UTC
+            DatetimeIndex
+        """
+        start = _exchange_timestamp(start_date)
+        end = _exchange_timestamp(end_date)
+
+        partitions = self.read_partitions(source, ticker, interval, start.tz_localize(None), end.tz_localize(None))
+        if not partitions:
+            return pd.DataFrame()
+
+        records = np.concatenate(partitions)
+        t_start = start.tz_convert("UTC").tz_localize(None).value
+        t_end = end.tz_convert("UTC").tz_localize(None).value
+        records = records[(records["t"] >= t_start) & (records["t"] <= t_end)]
+
+        return records_to_bars(records)
+
+
+def _exchange_timestamp(value) -> pd.Timestamp:
+    """Convert a bound to an exchange-time aware Timestamp"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        return ts.tz_localize(EXCHANGE_TZ)
+    return ts.tz_convert(EXCHANGE_TZ)
+
+
+def backfill_intraday(
+        fetch_chunk: Callable[[datetime, datetime], pd.DataFrame],
+        store: IntradayStore,
+        source: str,
+        ticker: str,
+        interval: str,
+        start_date: datetime,
+        end_date: datetime,
+        chunk_days: int = 5
+) -> int:
+    """
+    Backfill a range into the store chunk by chunk, skipping stored days
+
+    Each chunk is written as soon as it is fetched, so an interrupted
+    backfill resumes where it stopped when called again.
+
+    Args:
+        fetch_chunk: Function fetching the bars from one day up to (but not
+            including) another, returning None if the fetch failed
+        store: Intraday store to write to
+        source: Data source name
+        ticker: Stock ticker symbol
+        interval: Data interval
+        start_date: First day of the range
+        end_date: Last day of the range
+        chunk_days: Number of calendar days fetched per request
+
+    Returns:
+        Number of bars written
+    """
+    days = [
+        day.date()
+        for day in pd.date_range(pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize())
+    ]
+    missing = [day for day in days if not store.has_day(source, ticker, interval, day)]
+
+    # Group the missing days into runs of consecutive days, each fetched in
+    # chunks of at most chunk_days
+    chunks: List[List[date]] = []
+    for day in missing:
+        if chunks and (day - chunks[-1][-1]).days == 1 and len(chunks[-1]) < chunk_days:
+            chunks[-1].append(day)
+        else:
+            chunks.append([day])
+
+    written = 0
+    for chunk in chunks:
+        chunk_start = datetime.combine(chunk[0], datetime.min.time())
+        chunk_end = datetime.combine(chunk[-1], datetime.min.time()) + timedelta(days=1)
+        df = fetch_chunk(chunk_start, chunk_end)
+
+        # A failed fetch must not mark its days as stored
+        if df is None:
+            continue
+
+        # Some sources answer an outage with an empty frame, so an empty
+        # chunk only stores the days the exchange was closed (a chunk with
+        # bars confirms that its other days have none)
+        if df.empty:
+            closed = set(exchange_closed_days(chunk[0], chunk[-1]))
+            chunk = [day for day in chunk if day in closed]
+
+        written += store.write_bars(source, ticker, interval, df, chunk)
+
+    return written
+
+
+# Process-wide intraday store shared by every caller of the data fetchers
+_default_intraday_store: Optional[IntradayStore] = None
+_default_intraday_store_lock = threading.Lock()
+
+
+def get_default_intraday_store() -> IntradayStore:
+    """
+    Get the process-wide intraday store
+
+    Returns:
+        Shared IntradayStore instance rooted at DEFAULT_INTRADAY_DIR
+    """
+    global _default_intraday_store
+
+    with _default_intraday_store_lock:
+        if _default_intraday_store is None:
+            _default_intraday_store = IntradayStore()
+        return _default_intraday_store
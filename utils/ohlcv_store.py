@@ -0,0 +1,443 @@
+"""
+Persistent on-disk OHLCV store used as a read-through cache by the data fetchers
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple, Iterable
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+# Default location of the store, overridable through the environment
+DEFAULT_STORE_DIR = os.environ.get(
+    "QUANTUMTRADE_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "ohlcv")
+)
+
+# Define a custom type for the covered date ranges of a series
+CoveredRanges = List[Tuple[pd.Timestamp, pd.Timestamp]]
+
+
+def _naive_timestamp(value) -> pd.Timestamp:
+    """Convert a date/datetime/string to a naive Timestamp (aware values in UTC)"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts
+
+
+def _index_bound(value: pd.Timestamp, index: pd.DatetimeIndex) -> pd.Timestamp:
+    """Express a naive bound in the timezone of the index it is compared with"""
+    if index.tz is not None:
+        return value.tz_localize("UTC").tz_convert(index.tz)
+    return value
+
+
+class OHLCVStore:
+    """
+    Parquet-backed OHLCV store partitioned by source, ticker, and interval
+
+    Each series lives in ``<root>/<source>/<TICKER>/<interval>.parquet`` with
+    a JSON sidecar recording the date ranges that have already been fetched,
+    so a repeated request for a window the store holds never touches the
+    network (weekends and holidays inside a fetched window count as covered).
+    """
+
+    def __init__(
+            self,
+            root: Optional[str] = None,
+            max_staleness: timedelta = timedelta(minutes=15)
+    ) -> None:
+        """
+        Initialize the store
+
+        Args:
+            root: Root directory of the store (default DEFAULT_STORE_DIR)
+            max_staleness: How old the most recent bars may be before a
+                request that runs up to "now" is treated as a miss
+        """
+        self.root = root or DEFAULT_STORE_DIR
+        self.max_staleness = max_staleness
+        self._lock = threading.RLock()
+
+    @property
+    def available(self) -> bool:
+        """True if a Parquet engine is installed and the store can be used"""
+        return PARQUET_AVAILABLE
+
+    def _series_dir(self, source: str, ticker: str) -> str:
+        """Return the partition directory for a source/ticker pair"""
+        safe_ticker = ticker.upper().replace(os.sep, "_").replace("/", "_")
+        return os.path.join(self.root, source, safe_ticker)
+
+    def _data_path(self, source: str, ticker: str, interval: str) -> str:
+        """Return the Parquet file path for a series"""
+        return os.path.join(self._series_dir(source, ticker), f"{interval}.parquet")
+
+    def _meta_path(self, source: str, ticker: str, interval: str) -> str:
+        """Return the coverage metadata path for a series"""
+        return os.path.join(self._series_dir(source, ticker), f"{interval}.json")
+
+    def coverage(self, source: str, ticker: str, interval: str) -> CoveredRanges:
+        """
+        Get the date ranges already held for a series
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+
+        Returns:
+            Sorted list of non-overlapping (start, end) timestamps
+        """
+        meta_path = self._meta_path(source, ticker, interval)
+        if not os.path.exists(meta_path):
+            return []
+
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return []
+
+        return [(pd.Timestamp(start), pd.Timestamp(end)) for (start, end) in meta.get("ranges", [])]
+
+    def covers(
+            self,
+            source: str,
+            ticker: str,
+            interval: str,
+            start_date: datetime,
+            end_date: datetime
+    ) -> bool:
+        """
+        Check whether a requested window is fully held by the store
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+            start_date: Start of the requested window
+            end_date: End of the requested window
+
+        Returns:
+            True if the window can be served without a network request
+        """
+        start = _naive_timestamp(start_date)
+        end = _naive_timestamp(end_date)
+
+        # A window running up to "now" only needs to be covered up to the
+        # staleness horizon, otherwise every request ending now would miss
+        horizon = _naive_timestamp(datetime.now()) - self.max_staleness
+        end = min(end, horizon)
+
+        for (range_start, range_end) in self.coverage(source, ticker, interval):
+            if range_start <= start and range_end >= end:
+                return True
+
+        return False
+
+    def tail_start(
+            self,
+            source: str,
+            ticker: str,
+            interval: str,
+            start_date: datetime,
+            overlap_bars: int = 3
+    ) -> Optional[pd.Timestamp]:
+        """
+        Find where a tail-only refresh of a series should start fetching
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+            start_date: Start of the requested window
+            overlap_bars: Number of stored bars to fetch again so late
+                revisions to the most recent bars are picked up
+
+        Returns:
+            Timestamp to fetch from, or None if the store does not hold the
+            beginning of the requested window (a full fetch is needed)
+        """
+        start = _naive_timestamp(start_date)
+
+        # Only the covered range holding the start of the window can be
+        # extended by fetching its tail
+        held_range = None
+        for (range_start, range_end) in self.coverage(source, ticker, interval):
+            if range_start <= start <= range_end:
+                held_range = (range_start, range_end)
+        if held_range is None:
+            return None
+
+        stored = self.read(source, ticker, interval, held_range[0], held_range[1])
+        if stored.empty:
+            return None
+
+        # Step back over the overlap bars from the last stored timestamp
+        tail = stored.index[-min(overlap_bars + 1, len(stored))]
+        if stored.index.tz is not None:
+            tail = tail.tz_convert("UTC").tz_localize(None)
+
+        return max(tail, start)
+
+    def read(
+            self,
+            source: str,
+            ticker: str,
+            interval: str,
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Read a series from the store, optionally sliced to a date range
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+            start_date: Optional inclusive start of the window
+            end_date: Optional exclusive end of the window (as the fetchers
+                treat it, so a midnight end leaves out that day's bar)
+
+        Returns:
+            DataFrame with OHLCV columns and Date index (empty if not stored)
+        """
+        data_path = self._data_path(source, ticker, interval)
+        if not self.available or not os.path.exists(data_path):
+            return pd.DataFrame()
+
+        df = pd.read_parquet(data_path)
+
+        # Slice the stored series down to the requested window (daily and
+        # longer bars are stamped at midnight, so compare whole days)
+        if start_date is not None:
+            start = _naive_timestamp(start_date)
+            if interval[-1] not in ("m", "h"):
+                start = start.normalize()
+            df = df[df.index >= _index_bound(start, df.index)]
+        if end_date is not None:
+            df = df[df.index < _index_bound(_naive_timestamp(end_date), df.index)]
+
+        return df
+
+    def write(
+            self,
+            source: str,
+            ticker: str,
+            interval: str,
+            df: pd.DataFrame,
+            start_date: datetime,
+            end_date: datetime
+    ) -> None:
+        """
+        Merge freshly fetched bars into the store and record their coverage
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+            df: DataFrame with OHLCV columns and Date index
+            start_date: Start of the window that was fetched
+            end_date: End of the window that was fetched
+        """
+        if not self.available or df.empty:
+            return
+
+        with self._lock:
+            os.makedirs(self._series_dir(source, ticker), exist_ok=True)
+
+            # Merge the new bars over the stored ones, letting the new bars
+            # win wherever both hold the same timestamp
+            stored = self.read(source, ticker, interval)
+            merged = pd.concat([stored, df]) if not stored.empty else df
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            merged.index.name = "Date"
+
+            # Write to a temporary file first so concurrent readers never see
+            # a partially written series
+            data_path = self._data_path(source, ticker, interval)
+            tmp_path = f"{data_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            merged.to_parquet(tmp_path)
+            os.replace(tmp_path, data_path)
+
+            # The fetched window can only be trusted up to the time of fetch
+            fetched_until = min(
+                _naive_timestamp(end_date),
+                _naive_timestamp(datetime.now())
+            )
+            self._add_coverage(source, ticker, interval, _naive_timestamp(start_date), fetched_until)
+
+    def write_chunks(
+            self,
+            source: str,
+            ticker: str,
+            interval: str,
+            chunks: Iterable[pd.DataFrame],
+            start_date: datetime,
+            end_date: datetime
+    ) -> int:
+        """
+        Stream ascending chunks of bars into the store one row group at a time
+
+        Stored bars before the first and after the last streamed bar are kept,
+        bars in between are replaced. The stored series is read batch by
+        batch, so memory use is bounded by the chunk size, not the history.
+        Nothing is committed (data or coverage) if the chunks raise midway.
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+            chunks: Iterable of OHLCV DataFrames in ascending date order
+            start_date: Start of the window the chunks were fetched for
+            end_date: End of the window the chunks were fetched for
+
+        Returns:
+            Number of streamed bars written
+        """
+        if not self.available:
+            return 0
+
+        with self._lock:
+            os.makedirs(self._series_dir(source, ticker), exist_ok=True)
+            data_path = self._data_path(source, ticker, interval)
+            tmp_path = f"{data_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+            stored = pq.ParquetFile(data_path) if os.path.exists(data_path) else None
+            writer = None
+            first_ts = None
+            last_ts = None
+            rows = 0
+
+            def write_frame(frame: pd.DataFrame) -> None:
+                nonlocal writer
+                if frame.empty:
+                    return
+                frame.index.name = "Date"
+                table = pa.Table.from_pandas(frame, preserve_index=True)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+
+            try:
+                for chunk in chunks:
+                    if chunk.empty:
+                        continue
+
+                    # Copy over the stored bars that precede the stream
+                    if first_ts is None:
+                        first_ts = chunk.index[0]
+                        for frame in self._iter_stored(stored):
+                            write_frame(frame[frame.index < first_ts])
+
+                    write_frame(chunk)
+                    last_ts = chunk.index[-1]
+                    rows += len(chunk)
+
+                # Keep the stored bars that follow the stream (or all of them
+                # if nothing was streamed)
+                for frame in self._iter_stored(stored):
+                    if last_ts is None:
+                        write_frame(frame)
+                    else:
+                        write_frame(frame[frame.index > last_ts])
+
+                if stored is not None:
+                    stored.close()
+                if writer is not None:
+                    writer.close()
+                    writer = None
+                    os.replace(tmp_path, data_path)
+            finally:
+                if writer is not None:
+                    writer.close()
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+            if rows > 0:
+                fetched_until = min(
+                    _naive_timestamp(end_date),
+                    _naive_timestamp(datetime.now())
+                )
+                self._add_coverage(source, ticker, interval, _naive_timestamp(start_date), fetched_until)
+
+            return rows
+
+    @staticmethod
+    def _iter_stored(stored) -> Iterable[pd.DataFrame]:
+        """Iterate over a stored Parquet file one record batch at a time"""
+        if stored is None:
+            return
+        for batch in stored.iter_batches():
+            yield pa.Table.from_batches([batch], schema=stored.schema_arrow).to_pandas()
+
+    def _add_coverage(
+            self,
+            source: str,
+            ticker: str,
+            interval: str,
+            start: pd.Timestamp,
+            end: pd.Timestamp
+    ) -> None:
+        """Add a range to the coverage metadata, merging overlapping ranges"""
+        ranges = sorted(self.coverage(source, ticker, interval) + [(start, end)])
+
+        merged: CoveredRanges = []
+        for (range_start, range_end) in ranges:
+            # Extend the previous range if this one overlaps or touches it
+            if merged and range_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+
+        meta_path = self._meta_path(source, ticker, interval)
+        tmp_path = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"ranges": [[s.isoformat(), e.isoformat()] for (s, e) in merged]}, f)
+        os.replace(tmp_path, meta_path)
+
+    def clear(self, source: str, ticker: str, interval: str) -> None:
+        """
+        Remove a series and its coverage metadata from the store
+
+        Args:
+            source: Data source name
+            ticker: Stock ticker symbol
+            interval: Data interval
+        """
+        with self._lock:
+            for path in (self._data_path(source, ticker, interval), self._meta_path(source, ticker, interval)):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+# Process-wide store shared by every caller of the data fetchers
+_default_store: Optional[OHLCVStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store() -> OHLCVStore:
+    """
+    Get the process-wide OHLCV store
+
+    Returns:
+        Shared OHLCVStore instance rooted at DEFAULT_STORE_DIR
+    """
+    global _default_store
+
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = OHLCVStore()
+        return _default_store
@@ -0,0 +1,290 @@
+"""
+Quota-aware request scheduling for rate-limited data sources
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Iterator, Optional, Tuple
+
+
+class RequestPriority(IntEnum):
+    """Request priority levels (lower values are served first)"""
+    LIVE = 0
+    INTERACTIVE = 1
+    BACKFILL = 2
+
+
+# Default quotas per data source as (requests per minute, burst size); a
+# source without an entry is not rate limited
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "alphavantage": (5.0, 5),
+    "polygon": (5.0, 5),
+}
+
+
+class PriorityScope:
+    """
+    Priority of the requests a thread sends on behalf of several callers,
+    which a more urgent caller can raise while the requests wait for quota
+    """
+
+    def __init__(self, priority: RequestPriority) -> None:
+        """
+        Initialize the scope
+
+        Args:
+            priority: Initial priority of the scope's requests
+        """
+        self.priority = priority
+        self._lock = threading.Lock()
+        self._scheduler: Optional["RequestScheduler"] = None
+
+    def promote(self, priority: RequestPriority) -> None:
+        """
+        Raise the priority of the queued and later requests of the scope
+
+        Args:
+            priority: Priority to raise to (a lower priority is ignored)
+        """
+        with self._lock:
+            if priority >= self.priority:
+                return
+            self.priority = priority
+            scheduler = self._scheduler
+
+        # Wake the queue the scope's request waits in so it moves forward
+        if scheduler is not None:
+            with scheduler._cond:
+                scheduler._cond.notify_all()
+
+    def _set_scheduler(self, scheduler: Optional["RequestScheduler"]) -> None:
+        """Record the scheduler the scope's request is queued in"""
+        with self._lock:
+            self._scheduler = scheduler
+
+
+# Priority scope of the requests sent by the current thread, if any
+_scope_local = threading.local()
+
+
+@contextmanager
+def priority_scope(scope: PriorityScope) -> Iterator[PriorityScope]:
+    """
+    Queue the requests the current thread sends within the block at the
+    priority of a scope, following its promotions
+
+    Args:
+        scope: Priority scope of the requests
+    """
+    previous = getattr(_scope_local, "scope", None)
+    _scope_local.scope = scope
+    try:
+        yield scope
+    finally:
+        _scope_local.scope = previous
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a fixed rate
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int) -> None:
+        """
+        Initialize the bucket full
+
+        Args:
+            rate_per_second: Tokens added per second
+            capacity: Maximum number of stored tokens (burst size)
+        """
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last refill"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate_per_second)
+        self.last_refill = now
+
+    def available(self) -> float:
+        """Return the number of tokens currently available"""
+        self._refill()
+        return self.tokens
+
+    def try_take(self) -> float:
+        """
+        Take a token if one is available
+
+        Returns:
+            0.0 if a token was taken, otherwise the seconds until one is
+        """
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate_per_second
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the provider rejected a request"""
+        self._refill()
+        self.tokens = 0.0
+
+
+class RequestScheduler:
+    """
+    Priority queue of callers waiting for the quota of one source and API key
+    """
+
+    def __init__(self, requests_per_minute: Optional[float], burst: int = 1) -> None:
+        """
+        Initialize the scheduler
+
+        Args:
+            requests_per_minute: Sustained request rate (None disables limiting)
+            burst: Number of requests that may be sent back to back
+        """
+        self.requests_per_minute = requests_per_minute
+        self._bucket = None
+        if requests_per_minute is not None:
+            self._bucket = TokenBucket(requests_per_minute / 60.0, max(1, burst))
+
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._counter = itertools.count()
+
+    def acquire(self, priority: RequestPriority = RequestPriority.INTERACTIVE) -> None:
+        """
+        Block until the caller may send one request
+
+        Callers are released in priority order, and first come first served
+        within the same priority. Inside a priority_scope block the request
+        is queued at the scope's priority when that is higher, and moves
+        forward when the scope is promoted while it waits.
+
+        Args:
+            priority: Priority of the request
+        """
+        if self._bucket is None:
+            return
+
+        scope = getattr(_scope_local, "scope", None)
+        if scope is not None:
+            priority = min(priority, scope.priority)
+
+        with self._cond:
+            entry = (int(priority), next(self._counter))
+            heapq.heappush(self._waiting, entry)
+            if scope is not None:
+                scope._set_scheduler(self)
+
+            try:
+                while True:
+                    # Requeue a promoted request, keeping its arrival order
+                    if scope is not None and int(scope.priority) < entry[0]:
+                        self._waiting.remove(entry)
+                        entry = (int(scope.priority), entry[1])
+                        heapq.heapify(self._waiting)
+                        heapq.heappush(self._waiting, entry)
+
+                    # Only the caller at the head of the queue may take a token
+                    wait = None
+                    if self._waiting[0] == entry:
+                        wait = self._bucket.try_take()
+                        if wait == 0.0:
+                            return
+                    self._cond.wait(wait)
+            finally:
+                # Leave the queue (whether released or interrupted) and let
+                # the next caller re-check whether it is now at the head
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+                if scope is not None:
+                    scope._set_scheduler(None)
+
+    def report_rate_limited(self) -> None:
+        """Drain the bucket after the provider rejected a request for quota"""
+        if self._bucket is None:
+            return
+
+        with self._cond:
+            self._bucket.drain()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for a token"""
+        with self._cond:
+            return len(self._waiting)
+
+    def expected_wait(self, priority: RequestPriority = RequestPriority.INTERACTIVE) -> float:
+        """
+        Estimate how long a new request would wait for its token
+
+        Args:
+            priority: Priority the request would be queued with
+
+        Returns:
+            Expected wait in seconds
+        """
+        if self._bucket is None:
+            return 0.0
+
+        with self._cond:
+            # Callers with the same or a higher priority are served first
+            ahead = sum(1 for (entry_priority, _) in self._waiting if entry_priority <= int(priority))
+            missing = ahead + 1 - self._bucket.available()
+
+        return max(0.0, missing) / self._bucket.rate_per_second
+
+
+_schedulers: Dict[Tuple[str, Optional[str]], RequestScheduler] = {}
+_rate_limits: Dict[str, Tuple[float, int]] = dict(DEFAULT_RATE_LIMITS)
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(source: str, api_key: Optional[str] = None) -> RequestScheduler:
+    """
+    Get the shared scheduler for a data source and API key
+
+    Args:
+        source: Data source name
+        api_key: API key the quota belongs to
+
+    Returns:
+        RequestScheduler shared by every request using that key
+    """
+    with _schedulers_lock:
+        key = (source, api_key)
+        if key not in _schedulers:
+            (requests_per_minute, burst) = _rate_limits.get(source, (None, 1))
+            _schedulers[key] = RequestScheduler(requests_per_minute, burst)
+        return _schedulers[key]
+
+
+def configure_rate_limit(source: str, requests_per_minute: Optional[float], burst: int = 1) -> None:
+    """
+    Set the quota of a data source (e.g. for a paid Alpha Vantage tier)
+
+    Schedulers created before the call keep their old quota until they are
+    recreated, so configure quotas at startup.
+
+    Args:
+        source: Data source name
+        requests_per_minute: Sustained request rate (None disables limiting)
+        burst: Number of requests that may be sent back to back
+    """
+    with _schedulers_lock:
+        if requests_per_minute is None:
+            _rate_limits.pop(source, None)
+        else:
+            _rate_limits[source] = (requests_per_minute, burst)
+
+        # Drop the existing schedulers of the source so the quota applies
+        for key in [key for key in _schedulers if key[0] == source]:
+            del _schedulers[key]
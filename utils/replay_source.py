@@ -0,0 +1,254 @@
+"""
+Offline replay data source serving recorded or synthetic OHLCV bars
+"""
+
+import os
+import zlib
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .intraday_store import EXCHANGE_TZ, INTRADAY_INTERVALS
+
+
+# Directory holding recorded series, overridable through the environment
+DEFAULT_REPLAY_DIR = os.environ.get(
+    "QUANTUMTRADE_REPLAY_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "replay")
+)
+
+# Synthetic series all start here, so a ticker gets the same bars whatever
+# window is requested
+SYNTHETIC_EPOCH = pd.Timestamp("1990-01-01")
+
+# Regular trading session that synthetic intraday bars cover (exchange time)
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_MINUTES = 390
+
+
+def _recorded_path(ticker: str, interval: str, replay_dir: str, extension: str) -> str:
+    """Return the path of a recorded series"""
+    return os.path.join(replay_dir, f"{ticker.upper()}_{interval}.{extension}")
+
+
+def record_replay_data(
+        df: pd.DataFrame,
+        ticker: str,
+        interval: str = "1d",
+        replay_dir: Optional[str] = None
+) -> str:
+    """
+    Record an OHLCV frame so the replay source can serve it offline
+
+    Args:
+        df: DataFrame with OHLCV columns and Date index
+        ticker: Stock ticker symbol
+        interval: Data interval of the frame
+        replay_dir: Directory to record into (default DEFAULT_REPLAY_DIR)
+
+    Returns:
+        Path of the recorded CSV file
+    """
+    replay_dir = replay_dir or DEFAULT_REPLAY_DIR
+    os.makedirs(replay_dir, exist_ok=True)
+
+    path = _recorded_path(ticker, interval, replay_dir, "csv")
+    df.to_csv(path, index_label="Date")
+    return path
+
+
+def load_recorded_data(
+        ticker: str,
+        interval: str = "1d",
+        replay_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Load a recorded series (CSV or Parquet) if one exists
+
+    Args:
+        ticker: Stock ticker symbol
+        interval: Data interval
+        replay_dir: Directory holding the recordings (default DEFAULT_REPLAY_DIR)
+
+    Returns:
+        DataFrame with OHLCV columns and Date index (empty if not recorded)
+    """
+    replay_dir = replay_dir or DEFAULT_REPLAY_DIR
+
+    parquet_path = _recorded_path(ticker, interval, replay_dir, "parquet")
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path)
+
+    csv_path = _recorded_path(ticker, interval, replay_dir, "csv")
+    if os.path.exists(csv_path):
+        return pd.read_csv(csv_path, index_col="Date", parse_dates=True)
+
+    return pd.DataFrame()
+
+
+def generate_synthetic_ohlcv(
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = "1d",
+        seed: Optional[int] = None,
+        annual_drift: float = 0.07,
+        annual_volatility: float = 0.2
+) -> pd.DataFrame:
+    """
+    Generate deterministic synthetic OHLCV bars following a geometric random walk
+
+    Bars are generated on business days from SYNTHETIC_EPOCH and seeded by the
+    ticker, so repeated or overlapping requests return identical bars.
+    Intraday bars split each daily bar into a path through the regular
+    session, seeded by the ticker and the day.
+
+    Args:
+        ticker: Stock ticker symbol (seeds the generator)
+        start_date: Start date of the window
+        end_date: End date of the window
+        interval: Data interval (1m, 5m, 15m, 1d, 1wk, 1mo)
+        seed: Optional explicit seed instead of the ticker
+        annual_drift: Annualized drift of the log price
+        annual_volatility: Annualized volatility of the log returns
+
+    Returns:
+        DataFrame with OHLCV columns and Date index (UTC-aware for
+        intraday intervals)
+    """
+    if seed is None:
+        seed = zlib.crc32(ticker.upper().encode("utf-8"))
+    # One generator per field, so each field's draws for a day do not depend
+    # on how many days the other fields drew before it (a longer window only
+    # appends bars)
+    (returns_rng, open_rng, spread_rng, volume_rng) = [
+        np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(4)
+    ]
+
+    end = pd.Timestamp(end_date).normalize()
+    days = pd.bdate_range(SYNTHETIC_EPOCH, max(end, SYNTHETIC_EPOCH), name="Date")
+    n = len(days)
+
+    # Close prices follow a geometric random walk from a ticker-specific level
+    daily_drift = annual_drift / 252
+    daily_vol = annual_volatility / np.sqrt(252)
+    start_price = 20.0 + (seed % 180)
+    log_returns = returns_rng.normal(daily_drift - 0.5 * daily_vol ** 2, daily_vol, n)
+    close = start_price * np.exp(np.cumsum(log_returns))
+
+    # Open near the previous close, with the high and low enclosing both
+    open_ = np.empty(n)
+    open_[0] = start_price
+    open_[1:] = close[:-1] * np.exp(open_rng.normal(0.0, daily_vol * 0.25, n - 1))
+    spread = np.abs(spread_rng.normal(0.0, daily_vol * 0.5, n))
+    high = np.maximum(open_, close) * (1.0 + spread)
+    low = np.minimum(open_, close) * (1.0 - spread)
+    volume = np.round(volume_rng.lognormal(15.0, 0.4, n))
+
+    df = pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=days
+    )
+
+    if interval in INTRADAY_INTERVALS:
+        start = pd.Timestamp(start_date).normalize()
+        days = df[(df.index >= start) & (df.index <= pd.Timestamp(end_date))]
+        return _select_window(_split_daily_bars(days, seed, interval), start_date, end_date, interval)
+
+    if interval != "1d":
+        # Imported here as unified_data_fetcher imports this module
+        from .unified_data_fetcher import resample_ohlcv
+        df = resample_ohlcv(df, interval)
+
+    return _select_window(df, start_date, end_date, interval)
+
+
+def _split_daily_bars(daily: pd.DataFrame, seed: int, interval: str) -> pd.DataFrame:
+    """
+    Split daily bars into intraday bars following a random bridge from each
+    day's open to its close, kept within the day's high and low
+    """
+    step = int(interval[:-1])
+    n = SESSION_MINUTES // step
+    fraction = np.arange(n + 1) / n
+
+    # U-shaped intraday volume profile (busier at the open and close)
+    profile = 1.0 + 2.0 * (2.0 * (fraction[1:] - 0.5 / n) - 1.0) ** 2
+
+    frames = []
+    for (day, bar) in zip(daily.index, daily.itertuples()):
+        rng = np.random.default_rng([seed, (day - SYNTHETIC_EPOCH).days])
+
+        walk = np.concatenate([[0.0], np.cumsum(rng.normal(0.0, 1.0, n))])
+        bridge = walk - fraction * walk[-1]
+        scale = 0.5 * (bar.High - bar.Low) / max(np.abs(bridge).max(), 1e-12)
+        path = np.clip(bar.Open + (bar.Close - bar.Open) * fraction + scale * bridge, bar.Low, bar.High)
+
+        open_ = path[:-1]
+        close = path[1:]
+        wick = np.abs(rng.normal(0.0, (bar.High - bar.Low) / (4.0 * np.sqrt(n)), n))
+        weights = profile * rng.lognormal(0.0, 0.3, n)
+
+        stamps = day + SESSION_OPEN + pd.to_timedelta(np.arange(n) * step, unit="m")
+        frames.append(pd.DataFrame(
+            {
+                "Open": open_,
+                "High": np.minimum(np.maximum(open_, close) + wick, bar.High),
+                "Low": np.maximum(np.minimum(open_, close) - wick, bar.Low),
+                "Close": close,
+                "Volume": np.round(bar.Volume * weights / weights.sum()),
+            },
+            index=pd.DatetimeIndex(stamps, name="Date").tz_localize(EXCHANGE_TZ).tz_convert("UTC")
+        ))
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames)
+
+
+def _select_window(df: pd.DataFrame, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+    """
+    Select the bars of a window from the start up to (but not including) the
+    end, as the network fetchers do: daily and longer bars from the day of
+    the start date, intraday bars with naive bounds taken as exchange time
+    """
+    if df.empty:
+        return df
+
+    if interval not in INTRADAY_INTERVALS or df.index.tz is None:
+        start = pd.Timestamp(start_date).normalize()
+        return df[(df.index >= start) & (df.index < pd.Timestamp(end_date))]
+
+    (start, end) = [pd.Timestamp(value) for value in (start_date, end_date)]
+    start = start.tz_localize(EXCHANGE_TZ) if start.tzinfo is None else start
+    end = end.tz_localize(EXCHANGE_TZ) if end.tzinfo is None else end
+    return df[(df.index >= start) & (df.index < end)]
+
+
+def fetch_replay_data(
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = "1d",
+        replay_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Fetch bars from a recording if one exists, otherwise synthesize them
+
+    Args:
+        ticker: Stock ticker symbol
+        start_date: Start date for historical data
+        end_date: End date for historical data
+        interval: Data interval (1m, 5m, 15m, 1d, 1wk, 1mo)
+        replay_dir: Directory holding the recordings (default DEFAULT_REPLAY_DIR)
+
+    Returns:
+        DataFrame with OHLCV columns and Date index
+    """
+    df = load_recorded_data(ticker, interval, replay_dir)
+    if df.empty:
+        return generate_synthetic_ohlcv(ticker, start_date, end_date, interval)
+
+    return _select_window(df, start_date, end_date, interval)
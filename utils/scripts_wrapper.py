@@ -8,14 +8,30 @@ import os
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from .unified_data_fetcher import fetch_market_data
+from typing import Optional
+from .unified_data_fetcher import fetch_market_data, fetch_market_data_many
+from .universe_matrix import UniverseMatrix
 
 # Add scripts folder to path
 scripts_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'scripts')
 sys.path.insert(0, scripts_path)
 
 
-def run_markov_regime_analysis(ticker: str, lookback_days: int, data_source: str = "alphavantage", api_key: str = None):
+def _load_ticker_data(ticker: str, start_date: datetime, end_date: datetime, data_source: str, api_key: str,
+                      universe: Optional[UniverseMatrix]) -> pd.DataFrame:
+    """Load daily bars from the universe matrix when given, otherwise fetch them"""
+    if universe is None:
+        return fetch_market_data(ticker, start_date, end_date, "1d", data_source, api_key)
+    
+    if ticker not in universe.tickers:
+        return pd.DataFrame()
+    
+    df = universe.ticker_frame(ticker, start_date)
+    return df[df.index <= pd.Timestamp(end_date)]
+
+
+def run_markov_regime_analysis(ticker: str, lookback_days: int, data_source: str = "alphavantage", api_key: str = None,
+                               universe: Optional[UniverseMatrix] = None):
     """
     Run Markov Regime Switching analysis
     
@@ -24,6 +40,8 @@ def run_markov_regime_analysis(ticker: str, lookback_days: int, data_source: str
         lookback_days: Number of days of historical data
         data_source: Data source ("alphavantage", "polygon", or "yfinance")
         api_key: API key for data source (required for alphavantage/polygon)
+        universe: Optional memory-mapped universe matrix to read the prices
+            from instead of fetching them
     
     Returns:
         dict with regime probabilities and analysis
@@ -36,7 +54,7 @@ def run_markov_regime_analysis(ticker: str, lookback_days: int, data_source: str
         start_date = end_date - timedelta(days=lookback_days)
         
         # Use unified data fetcher with API support
-        df = fetch_market_data(ticker, start_date, end_date, "1d", data_source, api_key)
+        df = _load_ticker_data(ticker, start_date, end_date, data_source, api_key, universe)
         
         if df.empty:
             return {"error": f"No data available for {ticker}. Try different data source or check API key."}
@@ -97,7 +115,8 @@ def run_markov_regime_analysis(ticker: str, lookback_days: int, data_source: str
         return {"error": str(e)}
 
 
-def run_johansen_cointegration(tickers: list, lookback_days: int = 252, data_source: str = "alphavantage", api_key: str = None):
+def run_johansen_cointegration(tickers: list, lookback_days: int = 252, data_source: str = "alphavantage", api_key: str = None,
+                               universe: Optional[UniverseMatrix] = None):
     """
     Run Johansen Cointegration test on multiple tickers
     
@@ -106,6 +125,8 @@ def run_johansen_cointegration(tickers: list, lookback_days: int = 252, data_sou
         lookback_days: Number of days of historical data
         data_source: Data source ("alphavantage", "polygon", or "yfinance")
         api_key: API key for data source (required for alphavantage/polygon)
+        universe: Optional memory-mapped universe matrix to read the prices
+            from instead of fetching them
     
     Returns:
         dict with cointegration results
@@ -120,17 +141,23 @@ def run_johansen_cointegration(tickers: list, lookback_days: int = 252, data_sou
         end_date = datetime.now()
         start_date = end_date - timedelta(days=lookback_days)
         
-        prices_dict = {}
-        for ticker in tickers:
-            try:
-                df = fetch_market_data(ticker, start_date, end_date, "1d", data_source, api_key)
-                if df.empty:
+        if universe is not None:
+            # Read the aligned closes straight from the mapped matrix
+            for ticker in tickers:
+                if ticker not in universe.tickers:
+                    return {"error": f"No data available for {ticker} in the universe matrix."}
+            prices = universe.field_frame("Close", start_date)[tickers]
+        else:
+            fetched = fetch_market_data_many(tickers, start_date, end_date, "1d", data_source, api_key)
+            
+            # Report the first failed ticker in the requested order
+            for ticker in tickers:
+                if ticker in fetched.errors:
                     return {"error": f"No data available for {ticker}. Try different data source or check API key."}
-                prices_dict[ticker] = df['Close']
-            except Exception as e:
-                return {"error": f"Error fetching data for {ticker}: {str(e)}"}
+            
+            prices_dict = {ticker: df['Close'] for (ticker, df) in fetched.data.items()}
+            prices = pd.DataFrame(prices_dict)
         
-        prices = pd.DataFrame(prices_dict)
         prices = prices.dropna()
         
         if len(prices) < 50:
@@ -206,7 +233,8 @@ def get_alpaca_account_info(api_key: str, api_secret: str, paper: bool = True):
         return {"error": str(e)}
 
 
-def calculate_tail_reaper_signals(ticker: str, lookback_days: int = 90, z_threshold: float = 2.0, data_source: str = "alphavantage", api_key: str = None):
+def calculate_tail_reaper_signals(ticker: str, lookback_days: int = 90, z_threshold: float = 2.0, data_source: str = "alphavantage", api_key: str = None,
+                                  universe: Optional[UniverseMatrix] = None):
     """
     Calculate Tail Reaper mean reversion signals
     
@@ -216,6 +244,8 @@ def calculate_tail_reaper_signals(ticker: str, lookback_days: int = 90, z_thresh
         z_threshold: Z-score threshold for signals
         data_source: Data source ("alphavantage", "polygon", or "yfinance")
         api_key: API key for data source (required for alphavantage/polygon)
+        universe: Optional memory-mapped universe matrix to read the prices
+            from instead of fetching them
     
     Returns:
         dict with signals and analysis
@@ -225,7 +255,7 @@ def calculate_tail_reaper_signals(ticker: str, lookback_days: int = 90, z_thresh
         end_date = datetime.now()
         start_date = end_date - timedelta(days=lookback_days)
         
-        df = fetch_market_data(ticker, start_date, end_date, "1d", data_source, api_key)
+        df = _load_ticker_data(ticker, start_date, end_date, data_source, api_key, universe)
         
         if df.empty:
             return {"error": f"No data available for {ticker}. Try different data source or check API key."}
@@ -0,0 +1,101 @@
+"""
+Single-flight coalescing of identical concurrent calls
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """In-flight call shared by a leader and the callers waiting on it"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.state: Any = None
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time, sharing its outcome with every
+    caller that asks for the same key while it is in flight
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty table of in-flight calls"""
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(
+            self,
+            key: Hashable,
+            fn: Callable[..., Any],
+            *args,
+            state: Any = None,
+            on_join: Optional[Callable[[Any], None]] = None,
+            **kwargs
+    ) -> Any:
+        """
+        Call fn(*args, **kwargs), or wait for the identical in-flight call
+
+        Callers that join an in-flight call receive a copy of its result (for
+        objects with a ``copy`` method) so they can modify it independently,
+        and re-raise its exception if it failed.
+
+        Args:
+            key: Hashable identity of the call
+            fn: Function to call
+            *args: Positional arguments for fn
+            state: Optional object kept with the call while it is in flight
+            on_join: Optional function called with the state of the
+                in-flight call when this caller joins it instead of calling fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                call.state = state
+                self._calls[key] = call
+                is_leader = True
+            else:
+                call.waiters += 1
+                is_leader = False
+
+        # Wait for the leader and hand out its outcome
+        if not is_leader:
+            if on_join is not None:
+                on_join(call.state)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result.copy() if hasattr(call.result, "copy") else call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Remove the call before releasing the waiters so later callers
+            # start a fresh call instead of reusing a finished one
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+
+        # The waiters copy the shared result, so the leader must not hand out
+        # the same object for modification while they may still be copying it
+        if shared and hasattr(call.result, "copy"):
+            return call.result.copy()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Return the number of calls currently in flight"""
+        with self._lock:
+            return len(self._calls)
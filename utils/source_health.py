@@ -0,0 +1,121 @@
+"""
+Rolling latency and error tracking per data source, used to order fallbacks
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SourceStats:
+    """Data schema for the rolling health statistics of a data source"""
+    samples: int
+    error_rate: float
+    p50_latency: float
+    p95_latency: float
+
+
+class SourceHealthTracker:
+    """
+    Keep the outcome of the most recent requests to each data source
+    """
+
+    def __init__(
+            self,
+            window: int = 50,
+            max_error_rate: float = 0.5,
+            min_samples: int = 3
+    ) -> None:
+        """
+        Initialize the tracker
+
+        Args:
+            window: Number of most recent requests kept per source
+            max_error_rate: Error rate above which a source is unhealthy
+            min_samples: Requests needed before a source can be unhealthy
+        """
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self._outcomes: Dict[str, Deque[Tuple[float, bool]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, source: str, latency: float, ok: bool) -> None:
+        """
+        Record the outcome of a request
+
+        Args:
+            source: Data source name
+            latency: Wall time of the request in seconds
+            ok: True if the request returned data
+        """
+        with self._lock:
+            if source not in self._outcomes:
+                self._outcomes[source] = deque(maxlen=self.window)
+            self._outcomes[source].append((latency, ok))
+
+    def stats(self, source: str) -> SourceStats:
+        """
+        Get the rolling statistics of a source
+
+        Args:
+            source: Data source name
+
+        Returns:
+            SourceStats (latencies in seconds, NaN before the first success)
+        """
+        with self._lock:
+            outcomes = list(self._outcomes.get(source, ()))
+
+        if not outcomes:
+            return SourceStats(samples=0, error_rate=0.0, p50_latency=np.nan, p95_latency=np.nan)
+
+        # Latency percentiles only describe the requests that succeeded
+        latencies = np.array([latency for (latency, ok) in outcomes if ok])
+        errors = sum(1 for (_, ok) in outcomes if not ok)
+
+        return SourceStats(
+            samples=len(outcomes),
+            error_rate=errors / len(outcomes),
+            p50_latency=float(np.percentile(latencies, 50)) if len(latencies) else np.nan,
+            p95_latency=float(np.percentile(latencies, 95)) if len(latencies) else np.nan
+        )
+
+    def is_healthy(self, source: str) -> bool:
+        """Return True unless the source has failed too often recently"""
+        stats = self.stats(source)
+        return stats.samples < self.min_samples or stats.error_rate <= self.max_error_rate
+
+    def rank(self, sources: List[str]) -> List[str]:
+        """
+        Order sources for a request: healthy sources by tail latency, then
+        unhealthy ones (so they are still tried last and can recover)
+
+        Healthy sources without a latency sample yet are tried after the
+        measured ones, in their configured order.
+
+        Args:
+            sources: Sources in their configured fallback order
+
+        Returns:
+            Sources in the order they should be tried
+        """
+        def sort_key(item):
+            (position, source) = item
+            p95 = self.stats(source).p95_latency
+            return (not self.is_healthy(source), np.inf if np.isnan(p95) else p95, position)
+
+        return [source for (_, source) in sorted(enumerate(sources), key=sort_key)]
+
+    def reset(self) -> None:
+        """Forget every recorded outcome"""
+        with self._lock:
+            self._outcomes.clear()
+
+
+# Process-wide tracker fed by every network fetch
+source_health = SourceHealthTracker()
@@ -12,7 +12,7 @@ import matplotlib.pyplot as plt
 import mplfinance as mpf
 from matplotlib import patches
 
-from .indicators import calculate_slope
+from .indicators import rolling_slope
 from .consecutive_integers import find_consecutive_integers
 
 
@@ -124,13 +124,13 @@ class StageDetector:
         ).mean()
         self.df = self.df.dropna().copy()
 
-        # Calculate slope for both the fast and slow MAs
-        self.df[self.col_fast_ma_slope] = self.df[self.col_fast_ma].rolling(
-            window=self.slope_window
-        ).apply(calculate_slope)
-        self.df[self.col_slow_ma_slope] = self.df[self.col_slow_ma].rolling(
-            window=self.slope_window
-        ).apply(calculate_slope)
+        # Calculate slope for both the fast and slow MAs in a single pass
+        slopes = rolling_slope(
+            self.df[[self.col_fast_ma, self.col_slow_ma]].to_numpy(),
+            self.slope_window
+        )
+        self.df[self.col_fast_ma_slope] = slopes[:, 0]
+        self.df[self.col_slow_ma_slope] = slopes[:, 1]
         self.df = self.df.dropna().copy()
 
     def _detect_stage_i(self) -> None:
@@ -0,0 +1,510 @@
+"""
+Incremental indicator state objects that update in O(1) per bar for live use
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Tuple
+
+from .indicators import FLAT_RSI_RTOL
+
+
+class StreamingEMA:
+    """
+    Exponential moving average, equal to ``ewm(span=span, adjust=False)``
+    """
+
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None) -> None:
+        """
+        Initialize the EMA
+
+        Args:
+            span: EMA span (alpha = 2 / (span + 1))
+            alpha: Smoothing factor, used instead of span (e.g. 1 / period
+                for Wilder smoothing)
+        """
+        if alpha is None:
+            if span is None:
+                raise ValueError("Either span or alpha must be given")
+            alpha = 2.0 / (span + 1.0)
+
+        self.alpha = alpha
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        """
+        Add a value
+
+        Args:
+            x: New value
+
+        Returns:
+            Updated EMA (the first value seeds it)
+        """
+        # Missing values leave the average unchanged
+        if math.isnan(x):
+            return self.value
+
+        if math.isnan(self.value):
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class _RollingWindow:
+    """
+    Fixed-size window of the most recent values that tracks its NaN count
+
+    Running sums kept by subclasses are rebuilt from the window once per
+    window length, so rounding errors cannot accumulate while updates stay
+    O(1) amortized. Sums of powers are taken of the values less a reference
+    value from the window (see _centered), so that small moves on a large
+    price level do not cancel out.
+    """
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError(f"Window must be at least 1 (got window={window})")
+
+        self.window = window
+        self.values: Deque[float] = deque(maxlen=window)
+        self.nan_count = 0
+        self.reference = math.nan
+        self._updates_since_resync = 0
+
+    def _push(self, x: float) -> Optional[float]:
+        """Append a value, returning the value that fell out of the window"""
+        dropped = self.values[0] if len(self.values) == self.window else None
+        if dropped is not None and math.isnan(dropped):
+            self.nan_count -= 1
+        if math.isnan(x):
+            self.nan_count += 1
+        self.values.append(x)
+
+        self._updates_since_resync += 1
+        if self._updates_since_resync >= self.window:
+            self._updates_since_resync = 0
+            self._resync()
+            return None
+        return dropped
+
+    def _resync(self) -> None:
+        """Rebuild the running sums from the window"""
+
+    def _rebase(self) -> None:
+        """Move the reference value to the oldest finite value of the window"""
+        self.reference = next((x for x in self.values if not math.isnan(x)), math.nan)
+
+    def _centered(self, x: float) -> float:
+        """Value less the reference value (0 for a missing value)"""
+        if math.isnan(x):
+            return 0.0
+        if math.isnan(self.reference):
+            self.reference = x
+        return x - self.reference
+
+    @property
+    def ready(self) -> bool:
+        """True once the window is full and holds no NaN"""
+        return len(self.values) == self.window and self.nan_count == 0
+
+
+class StreamingSMA(_RollingWindow):
+    """
+    Simple moving average, equal to ``rolling(window).mean()``
+    """
+
+    def __init__(self, window: int) -> None:
+        """
+        Initialize the SMA
+
+        Args:
+            window: Number of values averaged
+        """
+        super().__init__(window)
+        self._sum = 0.0
+
+    def _resync(self) -> None:
+        self._sum = math.fsum(x for x in self.values if not math.isnan(x))
+
+    def update(self, x: float) -> float:
+        """
+        Add a value
+
+        Args:
+            x: New value
+
+        Returns:
+            Mean of the window (NaN until it is full, or while it holds a NaN)
+        """
+        dropped = self._push(x)
+        if dropped is not None:
+            self._sum += (0.0 if math.isnan(x) else x) - (0.0 if math.isnan(dropped) else dropped)
+        elif self._updates_since_resync != 0:
+            self._sum += 0.0 if math.isnan(x) else x
+
+        return self._sum / self.window if self.ready else math.nan
+
+
+class StreamingZScore(_RollingWindow):
+    """
+    Rolling z-score of the newest value, equal to
+    ``(x - rolling(window).mean()) / rolling(window).std()``
+    """
+
+    def __init__(self, window: int) -> None:
+        """
+        Initialize the z-score
+
+        Args:
+            window: Number of values in the mean and standard deviation
+        """
+        if window < 2:
+            raise ValueError(f"Window must be at least 2 (got window={window})")
+        super().__init__(window)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._extrema = RollingExtrema(window)
+        self.mean = math.nan
+        self.std = math.nan
+
+    def _resync(self) -> None:
+        self._rebase()
+        centered = [self._centered(x) for x in self.values]
+        self._sum = math.fsum(centered)
+        self._sum_sq = math.fsum(x * x for x in centered)
+
+    def update(self, x: float) -> float:
+        """
+        Add a value
+
+        Args:
+            x: New value
+
+        Returns:
+            Z-score of x against the window (NaN until the window is full,
+            while it holds a NaN, or when all its values are equal)
+        """
+        (low, high) = self._extrema.update(x)
+        x_value = self._centered(x)
+        dropped = self._push(x)
+        if dropped is not None:
+            dropped_value = self._centered(dropped)
+            self._sum += x_value - dropped_value
+            self._sum_sq += x_value * x_value - dropped_value * dropped_value
+        elif self._updates_since_resync != 0:
+            self._sum += x_value
+            self._sum_sq += x_value * x_value
+
+        if not self.ready:
+            (self.mean, self.std) = (math.nan, math.nan)
+            return math.nan
+
+        # Sample standard deviation (ddof=1), as pandas uses
+        centered_mean = self._sum / self.window
+        self.mean = self.reference + centered_mean
+        variance = max(0.0, (self._sum_sq - self._sum * centered_mean) / (self.window - 1))
+        self.std = math.sqrt(variance)
+
+        # A window of equal values has no spread, whatever the rounding of
+        # the running sums
+        if low == high or self.std == 0.0:
+            return math.nan
+        return (x - self.reference - centered_mean) / self.std
+
+
+class StreamingSlope(_RollingWindow):
+    """
+    Least-squares slope of the most recent values, equal to
+    ``rolling(window).apply(calculate_slope)``
+    """
+
+    def __init__(self, window: int) -> None:
+        """
+        Initialize the slope
+
+        Args:
+            window: Number of points in each regression
+        """
+        if window < 2:
+            raise ValueError(f"Window must be at least 2 (got window={window})")
+        super().__init__(window)
+        self._sum = 0.0
+        self._sum_xy = 0.0
+        self._extrema = RollingExtrema(window)
+
+        # Sums over the x positions 0 .. window - 1
+        self._x_mean = (window - 1) / 2.0
+        self._sxx = window * (window * window - 1) / 12.0
+
+    def _resync(self) -> None:
+        self._rebase()
+        centered = [self._centered(x) for x in self.values]
+        self._sum = math.fsum(centered)
+        self._sum_xy = math.fsum(i * x for (i, x) in enumerate(centered))
+
+    def update(self, x: float) -> float:
+        """
+        Add a value
+
+        Args:
+            x: New value
+
+        Returns:
+            Slope of the window (NaN until it is full, while it holds a NaN,
+            or when all its values are equal)
+        """
+        (low, high) = self._extrema.update(x)
+        filled = len(self.values)
+        x_value = self._centered(x)
+        dropped = self._push(x)
+
+        if dropped is not None:
+            # Every remaining point moves one x position to the left
+            dropped_value = self._centered(dropped)
+            self._sum_xy += -(self._sum - dropped_value) + (self.window - 1) * x_value
+            self._sum += x_value - dropped_value
+        elif self._updates_since_resync != 0:
+            self._sum_xy += filled * x_value
+            self._sum += x_value
+
+        if not self.ready or low == high:
+            return math.nan
+        return (self._sum_xy - self._x_mean * self._sum) / self._sxx
+
+
+class RollingExtrema:
+    """
+    Rolling minimum and maximum with O(1) amortized updates, using monotonic
+    deques of (position, value) pairs
+    """
+
+    def __init__(self, window: int) -> None:
+        """
+        Initialize the extrema
+
+        Args:
+            window: Number of values in the window
+        """
+        self.window = window
+        self._count = 0
+        self._last_nan = -window
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._max: Deque[Tuple[int, float]] = deque()
+
+    def update(self, x: float) -> Tuple[float, float]:
+        """
+        Add a value
+
+        Args:
+            x: New value
+
+        Returns:
+            (min, max) of the window (NaN until it is full, or while it
+            holds a NaN)
+        """
+        position = self._count
+        self._count += 1
+
+        if math.isnan(x):
+            self._last_nan = position
+        else:
+            # Values the new one dominates can never be the extreme again
+            while self._min and self._min[-1][1] >= x:
+                self._min.pop()
+            self._min.append((position, x))
+            while self._max and self._max[-1][1] <= x:
+                self._max.pop()
+            self._max.append((position, x))
+
+        # Evict values that left the window
+        oldest = position - self.window + 1
+        while self._min and self._min[0][0] < oldest:
+            self._min.popleft()
+        while self._max and self._max[0][0] < oldest:
+            self._max.popleft()
+
+        if self._count < self.window or self._last_nan >= oldest:
+            return (math.nan, math.nan)
+        return (self._min[0][1], self._max[0][1])
+
+
+class StreamingRSI:
+    """
+    Wilder RSI with the TradingView seeding used by stochastic_rsi: the first
+    average gain and loss are the means of the first period price changes
+    """
+
+    def __init__(self, period: int = 14) -> None:
+        """
+        Initialize the RSI
+
+        Args:
+            period: RSI period
+        """
+        if period <= 0:
+            raise ValueError(f"Period must be greater than 0 (got period={period})")
+
+        self.period = period
+        self._previous = math.nan
+        self._seed_ups = []
+        self._seed_downs = []
+        self._avg_up = math.nan
+        self._avg_down = math.nan
+        self.changes = 0
+        self.value = math.nan
+
+    @property
+    def seeded(self) -> bool:
+        """True once the first period price changes have been averaged"""
+        return not math.isnan(self._avg_up)
+
+    def update(self, close: float) -> float:
+        """
+        Add a closing price
+
+        Args:
+            close: New closing price
+
+        Returns:
+            Updated RSI (NaN until period price changes have been seen)
+        """
+        previous = self._previous
+        self._previous = close
+
+        # Price changes involving a missing price are skipped, as the batch
+        # computation drops them
+        if math.isnan(previous) or math.isnan(close):
+            return self.value
+
+        delta = close - previous
+        self.changes += 1
+        up = delta if delta > 0 else 0.0
+        down = -delta if delta < 0 else 0.0
+
+        if math.isnan(self._avg_up):
+            self._seed_ups.append(up)
+            self._seed_downs.append(down)
+            if len(self._seed_ups) < self.period:
+                return self.value
+
+            self._avg_up = math.fsum(self._seed_ups) / self.period
+            self._avg_down = math.fsum(self._seed_downs) / self.period
+            (self._seed_ups, self._seed_downs) = ([], [])
+        else:
+            alpha = 1.0 / self.period
+            self._avg_up += alpha * (up - self._avg_up)
+            self._avg_down += alpha * (down - self._avg_down)
+
+        self.value = _rsi_from_averages(self._avg_up, self._avg_down)
+        return self.value
+
+
+def _rsi_from_averages(avg_up: float, avg_down: float) -> float:
+    """Scale the average gain and loss to an RSI, as NumPy division would"""
+    if avg_down == 0.0:
+        return math.nan if avg_up == 0.0 else 100.0
+    return 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+
+
+@dataclass(frozen=True)
+class StochasticRSIValue:
+    """Data schema for one streaming stochastic RSI update"""
+    stoch_rsi: float
+    k_line: float
+    d_line: float
+
+
+class StreamingStochasticRSI:
+    """
+    TradingView-compatible Stochastic RSI, equal to the newest values of
+    stochastic_rsi
+    """
+
+    def __init__(self, period: int = 14, k_smooth: int = 3, d_smooth: int = 3) -> None:
+        """
+        Initialize the Stochastic RSI
+
+        Args:
+            period: RSI and min-max scaling period
+            k_smooth: K-line smoothing period
+            d_smooth: D-line smoothing period
+        """
+        self.rsi = StreamingRSI(period)
+        self._extrema = RollingExtrema(period)
+        self._k = StreamingSMA(k_smooth)
+        self._d = StreamingSMA(d_smooth)
+        self.value = StochasticRSIValue(math.nan, math.nan, math.nan)
+
+    def update(self, close: float) -> StochasticRSIValue:
+        """
+        Add a closing price
+
+        Args:
+            close: New closing price
+
+        Returns:
+            StochasticRSIValue with the newest stoch_rsi, k_line, and d_line
+        """
+        changes = self.rsi.changes
+        rsi = self.rsi.update(close)
+
+        # The scaling and smoothing windows only advance once the RSI is
+        # seeded, and only for a bar that added a price change
+        if not self.rsi.seeded or self.rsi.changes == changes:
+            return self.value
+
+        # A window whose range is rounding noise is flat, as in the batch
+        # computation
+        (low, high) = self._extrema.update(rsi)
+        if high - low > FLAT_RSI_RTOL * max(abs(high), abs(low)):
+            stoch_rsi = (rsi - low) / (high - low)
+        else:
+            stoch_rsi = math.nan
+
+        k_line = self._k.update(stoch_rsi)
+        d_line = self._d.update(k_line)
+        self.value = StochasticRSIValue(stoch_rsi, k_line, d_line)
+        return self.value
+
+
+class StreamingATR:
+    """
+    Average True Range, equal to QuantumTrendSwiftEdge.calculate_atr
+    """
+
+    def __init__(self, period: int, use_simple_atr: bool = False) -> None:
+        """
+        Initialize the ATR
+
+        Args:
+            period: ATR period
+            use_simple_atr: Average the true range with an SMA instead of
+                an EMA with span=period
+        """
+        self._average = StreamingSMA(period) if use_simple_atr else StreamingEMA(span=period)
+        self._previous_close = math.nan
+        self.value = math.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """
+        Add a bar
+
+        Args:
+            high: Bar high
+            low: Bar low
+            close: Bar close
+
+        Returns:
+            Updated ATR
+        """
+        # The first bar has no previous close, so its true range is its range
+        true_range = high - low
+        if not math.isnan(self._previous_close):
+            true_range = max(true_range, abs(high - self._previous_close), abs(low - self._previous_close))
+        self._previous_close = close
+
+        self.value = self._average.update(true_range)
+        return self.value
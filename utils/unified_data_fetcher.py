@@ -2,11 +2,71 @@
 Unified data fetcher that supports multiple data sources
 """
 
+import os
+import time
 import pandas as pd
-import yfinance as yf
-import requests
+import numpy as np
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, List, Iterator, Tuple
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+
+from .ohlcv_store import OHLCVStore, get_default_store
+from .data_fetcher import download_yfinance
+from .http_session import get_session
+from .rate_limiter import RequestPriority, PriorityScope, get_scheduler, priority_scope
+from .single_flight import SingleFlight
+from .replay_source import fetch_replay_data
+from .source_health import source_health
+from .fetch_metrics import fetch_metrics
+from .intraday_store import INTRADAY_INTERVALS, backfill_intraday, get_default_intraday_store
+
+
+# Maximum number of concurrent requests per data source, sized to each
+# provider's quota (Alpha Vantage and Polygon free tiers allow 5 calls/minute)
+SOURCE_CONCURRENCY = {
+    "yfinance": 8,
+    "alphavantage": 1,
+    "polygon": 2,
+    "local": 8,
+    "auto": 2,
+}
+
+# Network sources tried by data_source="auto", in their configured order
+# (the local store is always checked first)
+FALLBACK_ORDER = ["yfinance", "polygon", "alphavantage"]
+
+# API keys used by data_source="auto" for the sources that need one
+FALLBACK_API_KEYS = {
+    "alphavantage": os.environ.get("ALPHAVANTAGE_API_KEY"),
+    "polygon": os.environ.get("POLYGON_API_KEY"),
+}
+
+
+# Calendar days of intraday bars requested per backfill chunk (Yahoo serves
+# at most 8 days of 1m bars per request; Polygon pages large responses)
+INTRADAY_CHUNK_DAYS = {
+    "yfinance": 7,
+    "polygon": 30,
+}
+
+
+# Identical fetches running at the same time share a single network request
+_inflight_fetches = SingleFlight()
+
+
+@dataclass(frozen=True)
+class MultiTickerFetchResult:
+    """Data schema for multi-ticker fetch results"""
+    data: Dict[str, pd.DataFrame]
+    errors: Dict[str, str]
+
+    def panel(self) -> pd.DataFrame:
+        """Combine the fetched frames into a (ticker, field) MultiIndex panel"""
+        if not self.data:
+            return pd.DataFrame()
+        return pd.concat(self.data, axis=1)
 
 
 def fetch_market_data(
@@ -15,7 +75,11 @@ def fetch_market_data(
         end_date: datetime,
         interval: str = "1d",
         data_source: str = "yfinance",
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        use_cache: bool = True,
+        incremental: bool = True,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        price_dtype: type = np.float64
 ) -> pd.DataFrame:
     """
     Unified function to fetch market data from multiple sources
@@ -24,137 +88,886 @@ def fetch_market_data(
         ticker: Stock ticker symbol
         start_date: Start date for historical data
         end_date: End date for historical data
-        interval: Data interval (1d, 1wk, 1mo)
-        data_source: "yfinance", "alphavantage", or "polygon"
-        api_key: API key for Alpha Vantage or Polygon (optional for yfinance)
+        interval: Data interval (1m, 5m, 15m, 1d, 1wk, 1mo); intraday bars
+            are backfilled into the day-partitioned intraday store
+        data_source: "yfinance", "alphavantage", "polygon", "local"
+            (offline replay of recorded or synthetic bars), or "auto" (try
+            the FALLBACK_ORDER sources, fastest healthy source first)
+        api_key: API key for Alpha Vantage or Polygon (optional for yfinance;
+            "auto" uses FALLBACK_API_KEYS instead)
+        use_cache: If True, serve the window from the local OHLCV store when
+            it is already held there, and store freshly fetched bars
+        incremental: If True and the store holds the start of the window,
+            fetch only the bars after the last stored timestamp (plus a
+            small overlap) and return the merged history
+        priority: Queue priority of the network request on rate-limited
+            sources (LIVE refreshes are sent before BACKFILL fetches)
+        price_dtype: dtype of the price columns (np.float32 halves their
+            memory)
     
     Returns:
-        DataFrame with OHLCV columns and Date index
+        DataFrame in the canonical OHLCV layout (see normalize_ohlcv)
     """
-    
-    if data_source == "yfinance":
-        return _fetch_yfinance(ticker, start_date, end_date, interval)
-    elif data_source == "alphavantage":
-        return _fetch_alphavantage(ticker, start_date, end_date, interval, api_key)
-    elif data_source == "polygon":
-        return _fetch_polygon(ticker, start_date, end_date, interval, api_key)
-    else:
+    if data_source not in SOURCE_CONCURRENCY:
         raise ValueError(f"Unknown data source: {data_source}")
 
+    # The replay source is already local, so it bypasses the store
+    if data_source == "local":
+        df = fetch_replay_data(ticker, start_date, end_date, interval)
+    elif data_source == "auto":
+        df = _fetch_with_fallback(ticker, start_date, end_date, interval, use_cache, incremental, priority)
+    else:
+        df = _fetch_coalesced(
+            ticker, start_date, end_date, interval, data_source, api_key, use_cache, incremental, priority
+        )
+
+    # Every source and cache path hands out the same layout
+    return normalize_ohlcv(df, interval, price_dtype)
 
-def _fetch_yfinance(ticker: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
-    """Fetch data from Yahoo Finance"""
+
+def _fetch_coalesced(
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str,
+        data_source: str,
+        api_key: Optional[str],
+        use_cache: bool,
+        incremental: bool,
+        priority: RequestPriority
+) -> pd.DataFrame:
+    """Fetch through the store, sharing identical in-flight fetches"""
+    # Concurrent callers asking for the same series and window wait on the
+    # first caller's fetch instead of sending their own request (the key
+    # leaves out the priority, so callers of any priority share a fetch)
+    key = (
+        data_source,
+        ticker.upper(),
+        interval,
+        _window_key(start_date, interval),
+        _window_key(end_date, interval),
+        api_key,
+        use_cache,
+        incremental
+    )
+
+    # A caller joining a fetch queued at a lower priority (e.g. an
+    # INTERACTIVE request joining a BACKFILL) promotes it to its own
+    scope = PriorityScope(priority)
+    return _inflight_fetches.do(
+        key,
+        _fetch_in_scope,
+        scope,
+        ticker,
+        start_date,
+        end_date,
+        interval,
+        data_source,
+        api_key,
+        use_cache,
+        incremental,
+        priority,
+        state=scope,
+        on_join=lambda leader_scope: leader_scope.promote(priority)
+    )
+
+
+def _fetch_in_scope(
+        scope: PriorityScope,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str,
+        data_source: str,
+        api_key: Optional[str],
+        use_cache: bool,
+        incremental: bool,
+        priority: RequestPriority
+) -> pd.DataFrame:
+    """Run a coalesced fetch in the priority scope its joining callers promote"""
+    with priority_scope(scope):
+        return _fetch_market_data(
+            ticker, start_date, end_date, interval, data_source, api_key, use_cache, incremental, priority
+        )
+
+
+def _fetch_with_fallback(
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str,
+        use_cache: bool,
+        incremental: bool,
+        priority: RequestPriority
+) -> pd.DataFrame:
+    """Fetch from the first source of the fallback chain that returns data"""
+    # Any source in the chain that already holds the window answers locally
+    store = get_default_store() if use_cache else None
+    if store is not None and store.available:
+        for source in FALLBACK_ORDER:
+            if store.covers(source, ticker, interval, start_date, end_date):
+                fetch_metrics.record_cache(source, interval, hit=True)
+                return store.read(source, ticker, interval, start_date, end_date)
+
+    # Try the network sources, fastest healthy one first
+    for source in source_health.rank(FALLBACK_ORDER):
+        # Sources that need a key are skipped without one (Alpha Vantage
+        # would otherwise fall back to the IBM-only demo key)
+        api_key = FALLBACK_API_KEYS.get(source)
+        if source in FALLBACK_API_KEYS and not api_key:
+            continue
+
+        df = fetch_market_data(
+            ticker,
+            start_date,
+            end_date,
+            interval,
+            source,
+            api_key,
+            use_cache=use_cache,
+            incremental=incremental,
+            priority=priority
+        )
+        if not df.empty:
+            return df
+
+    return pd.DataFrame()
+
+
+def _window_key(value: datetime, interval: str) -> pd.Timestamp:
+    """Reduce a window bound to the resolution that matters for the interval"""
+    ts = pd.Timestamp(value)
+
+    # Daily and longer bars only depend on the date, so requests issued a few
+    # seconds apart with datetime.now() still coalesce
+    if interval[-1] not in ("m", "h"):
+        return ts.normalize()
+    return ts
+
+
+def _fetch_market_data(
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str,
+        data_source: str,
+        api_key: Optional[str],
+        use_cache: bool,
+        incremental: bool,
+        priority: RequestPriority
+) -> pd.DataFrame:
+    """Fetch market data through the local store (see fetch_market_data)"""
+    if interval in INTRADAY_INTERVALS:
+        return _fetch_intraday(ticker, start_date, end_date, interval, data_source, api_key, use_cache, priority)
+
+    store = get_default_store() if use_cache else None
+    if store is None or not store.available:
+        if use_cache:
+            fetch_metrics.record_cache(data_source, interval, hit=False)
+        return _fetch_from_source(ticker, start_date, end_date, interval, data_source, api_key, priority)
+
+    # Serve the request from the local store if it already holds the window
+    if store.covers(data_source, ticker, interval, start_date, end_date):
+        fetch_metrics.record_cache(data_source, interval, hit=True)
+        return store.read(data_source, ticker, interval, start_date, end_date)
+
+    # Derive weekly and monthly bars from the daily series when the store
+    # holds it (topping up its tail if needed) instead of a separate download
+    if interval in RESAMPLE_RULES:
+        period_start = _period_start(start_date, interval)
+        daily_held = store.covers(data_source, ticker, "1d", period_start, end_date) or (
+            incremental and store.tail_start(data_source, ticker, "1d", period_start) is not None
+        )
+        if daily_held:
+            daily = _fetch_market_data(
+                ticker, period_start, end_date, "1d", data_source, api_key, use_cache, incremental, priority
+            )
+            if not daily.empty:
+                return resample_ohlcv(daily, interval)
+
+    fetch_metrics.record_cache(data_source, interval, hit=False)
+
+    # Fetch only the missing tail of a series the store partially holds
+    if incremental:
+        tail_start = store.tail_start(data_source, ticker, interval, start_date)
+        if tail_start is not None:
+            delta = _fetch_from_source(ticker, tail_start, end_date, interval, data_source, api_key, priority)
+
+            # Without a tail (the source failed or has no newer bars) a full
+            # fetch would come back empty as well, so serve what is stored
+            if delta.empty:
+                return store.read(data_source, ticker, interval, start_date, end_date)
+
+            # Adjusted prices are rewritten after splits and dividends, so if
+            # the overlapping bars disagree with the stored ones the stored
+            # history is stale and the whole window has to be fetched again
+            if _overlap_matches(store.read(data_source, ticker, interval), delta):
+                _store_bars(store, data_source, ticker, interval, delta, tail_start, end_date)
+                return store.read(data_source, ticker, interval, start_date, end_date)
+
+            store.clear(data_source, ticker, interval)
+
+    df = _fetch_from_source(ticker, start_date, end_date, interval, data_source, api_key, priority)
+
+    # Keep the fetched bars so the next request for this window stays local
+    _store_bars(store, data_source, ticker, interval, df, start_date, end_date)
+
+    return df
+
+
+def _fetch_intraday(
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str,
+        data_source: str,
+        api_key: Optional[str],
+        use_cache: bool,
+        priority: RequestPriority
+) -> pd.DataFrame:
+    """Fetch intraday bars through the day-partitioned intraday store"""
+    if data_source not in INTRADAY_CHUNK_DAYS:
+        print(f"{data_source} error: intraday interval {interval} is not supported")
+        return pd.DataFrame()
+
+    if not use_cache:
+        return _fetch_from_source(ticker, start_date, end_date, interval, data_source, api_key, priority)
+
+    store = get_default_intraday_store()
+    fetched_chunks = []
+
+    def fetch_chunk(chunk_start: datetime, chunk_end: datetime) -> Optional[pd.DataFrame]:
+        fetched_chunks.append(chunk_start)
+        (df, ok) = _fetch_from_source_status(
+            ticker, chunk_start, chunk_end, interval, data_source, api_key, priority
+        )
+        return df if ok else None
+
+    # An end bound at midnight excludes that day, as for the fetchers
+    last_day = (pd.Timestamp(end_date) - pd.Timedelta(1, "ns")).normalize()
+
+    # Only the days the store does not hold yet are fetched, so a backfill
+    # that was interrupted resumes where it stopped
     try:
-        df = yf.download(
-            tickers=ticker,
-            start=start_date,
-            end=end_date,
-            interval=interval,
-            auto_adjust=True,
-            progress=False
+        backfill_intraday(
+            fetch_chunk,
+            store,
+            data_source,
+            ticker,
+            interval,
+            start_date,
+            last_day,
+            chunk_days=INTRADAY_CHUNK_DAYS[data_source]
         )
-        
-        if not df.empty and "Close" in df.columns:
-            expected_cols = ["Open", "High", "Low", "Close", "Volume"]
-            available_cols = [col for col in expected_cols if col in df.columns]
-            if len(available_cols) == len(expected_cols):
-                df = df[expected_cols]
-        
-        return df
     except Exception as e:
-        print(f"yfinance error: {str(e)}")
+        print(f"Intraday store error: {str(e)}")
+
+    fetch_metrics.record_cache(data_source, interval, hit=not fetched_chunks)
+
+    return store.read(data_source, ticker, interval, start_date, end_date)
+
+
+def fetch_market_data_many(
+        tickers: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = "1d",
+        data_source: str = "yfinance",
+        api_key: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        use_cache: bool = True,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        price_dtype: type = np.float64
+) -> MultiTickerFetchResult:
+    """
+    Fetch market data for several tickers concurrently
+    
+    Args:
+        tickers: List of stock ticker symbols
+        start_date: Start date for historical data
+        end_date: End date for historical data
+        interval: Data interval (1m, 5m, 15m, 1d, 1wk, 1mo)
+        data_source: "yfinance", "alphavantage", "polygon", or "local"
+        api_key: API key for Alpha Vantage or Polygon (optional for yfinance)
+        max_workers: Number of concurrent fetches (default is the
+            SOURCE_CONCURRENCY limit of the data source)
+        use_cache: If True, read through the local OHLCV store
+        priority: Queue priority of the requests on rate-limited sources
+        price_dtype: dtype of the price columns (np.float32 halves their
+            memory)
+    
+    Returns:
+        MultiTickerFetchResult with a DataFrame per fetched ticker and an
+        error message per failed ticker
+    """
+    if data_source not in SOURCE_CONCURRENCY:
+        raise ValueError(f"Unknown data source: {data_source}")
+
+    # Drop duplicate tickers while keeping the requested order
+    tickers = list(dict.fromkeys(tickers))
+    if max_workers is None:
+        max_workers = SOURCE_CONCURRENCY[data_source]
+
+    data: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, str] = {}
+
+    if not tickers:
+        return MultiTickerFetchResult(data=data, errors=errors)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as executor:
+        futures = {
+            executor.submit(
+                fetch_market_data,
+                ticker,
+                start_date,
+                end_date,
+                interval,
+                data_source,
+                api_key,
+                use_cache=use_cache,
+                priority=priority,
+                price_dtype=price_dtype
+            ): ticker
+            for ticker in tickers
+        }
+
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                df = future.result()
+            except Exception as e:
+                errors[ticker] = str(e)
+                continue
+
+            if df.empty:
+                errors[ticker] = f"No data available for {ticker}"
+            else:
+                data[ticker] = df
+
+    # Report the fetched tickers in the order they were requested
+    data = {ticker: data[ticker] for ticker in tickers if ticker in data}
+
+    return MultiTickerFetchResult(data=data, errors=errors)
+
+
+# Canonical OHLCV column order
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+def normalize_ohlcv(df: pd.DataFrame, interval: str = "1d", price_dtype: type = np.float64) -> pd.DataFrame:
+    """
+    Bring a fetched frame into the canonical OHLCV layout
+
+    The canonical frame has exactly the OHLCV columns, a sorted DatetimeIndex
+    without duplicates (the last bar wins), price columns of price_dtype held
+    in one contiguous block, and int64 Volume. Intraday indexes are UTC-aware,
+    daily and longer ones are naive dates (midnight stamps, whatever time of
+    day the source labels its bars with). Weekly and monthly bars are labeled
+    with the Monday of their week and the first day of their month, whichever
+    day the source labels them with. A frame that is already canonical is
+    returned as is, so callers can rely on the layout without copying.
+
+    Args:
+        df: DataFrame with OHLCV columns (MultiIndex columns are flattened)
+        interval: Data interval of the bars
+        price_dtype: dtype of the price columns (np.float64 or np.float32)
+
+    Returns:
+        DataFrame in the canonical layout (empty if df is empty)
+
+    Raises:
+        ValueError: If a price column is missing
+    """
+    if df.empty:
         return pd.DataFrame()
 
+    price_dtype = np.dtype(price_dtype)
+    intraday = interval[-1] in ("m", "h")
+
+    if _is_canonical(df, interval, intraday, price_dtype):
+        return df
+
+    # yfinance returns (Price, Ticker) columns even for a single ticker
+    columns = df.columns.get_level_values(0) if isinstance(df.columns, pd.MultiIndex) else df.columns
+    positions = {name: i for (i, name) in enumerate(columns)}
+    missing = [name for name in PRICE_COLUMNS if name not in positions]
+    if missing:
+        raise ValueError(f"Missing OHLCV columns: {', '.join(missing)}")
+
+    index = pd.DatetimeIndex(df.index, name="Date")
+    if intraday:
+        index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    else:
+        # Polygon labels daily bars with the UTC time of the exchange
+        # midnight (04:00 or 05:00), yfinance with midnight itself
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        index = _period_label(index.normalize(), interval)
+
+    # Sort by time and keep the last of any duplicated bars
+    order = np.argsort(index.asi8, kind="stable")
+    if (np.diff(index.asi8[order]) == 0).any():
+        sorted_stamps = index.asi8[order]
+        last = np.append(sorted_stamps[1:] != sorted_stamps[:-1], True)
+        order = order[last]
+    index = index[order]
+
+    # Lay the price columns out as one block with a contiguous row per column
+    prices = np.empty((len(PRICE_COLUMNS), len(order)), dtype=price_dtype)
+    for (row, name) in enumerate(PRICE_COLUMNS):
+        prices[row] = pd.to_numeric(df.iloc[:, positions[name]], errors="coerce").to_numpy(dtype=np.float64)[order]
+
+    if "Volume" in positions:
+        volume = pd.to_numeric(df.iloc[:, positions["Volume"]], errors="coerce").to_numpy(dtype=np.float64)[order]
+        volume = np.nan_to_num(volume).astype(np.int64)
+    else:
+        volume = np.zeros(len(order), dtype=np.int64)
+
+    canonical = pd.DataFrame(prices.T, index=index, columns=PRICE_COLUMNS, copy=False)
+    canonical["Volume"] = volume
+    return canonical
+
+
+def _period_label(index: pd.DatetimeIndex, interval: str) -> pd.DatetimeIndex:
+    """
+    Label weekly and monthly bars with the first day of their period
+
+    Yahoo Finance labels weeks by their Monday and months by their first day,
+    as resample_ohlcv does, while Alpha Vantage labels both by their last
+    trading day and Polygon labels weeks by the Sunday they start on.
+    """
+    if interval == "1wk":
+        # Move every day of a Sunday-to-Saturday week to its Monday
+        return index + pd.to_timedelta(1 - (index.dayofweek + 1) % 7, unit="D")
+    if interval == "1mo":
+        return pd.DatetimeIndex(index.to_period("M").to_timestamp(), name=index.name)
+    return index
+
+
+def _is_canonical(df: pd.DataFrame, interval: str, intraday: bool, price_dtype: np.dtype) -> bool:
+    """Check whether a frame already has the canonical OHLCV layout"""
+    if list(df.columns) != OHLCV_COLUMNS or not isinstance(df.index, pd.DatetimeIndex):
+        return False
+
+    if intraday != (df.index.tz is not None) or (intraday and str(df.index.tz) != "UTC"):
+        return False
+
+    if any(df[name].dtype != price_dtype for name in PRICE_COLUMNS) or df["Volume"].dtype != np.int64:
+        return False
+
+    if not intraday and not df.index.equals(_period_label(df.index.normalize(), interval)):
+        return False
+
+    return df.index.is_monotonic_increasing and df.index.is_unique
+
+
+# Pandas resampling rule for each interval that can be derived from daily
+# bars; bars are labeled with the first day of their week or month, as
+# normalize_ohlcv labels the bars of every source
+RESAMPLE_RULES = {
+    "1wk": "W-MON",
+    "1mo": "MS",
+}
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregate daily OHLCV bars into weekly or monthly bars
+    
+    Args:
+        df: DataFrame with daily OHLCV columns and Date index
+        interval: Target interval ("1wk" or "1mo")
+    
+    Returns:
+        DataFrame with OHLCV columns indexed by the start of each period
+    """
+    if interval not in RESAMPLE_RULES:
+        raise ValueError(f"Cannot resample daily bars to interval: {interval}")
+
+    # Weeks run Monday through Sunday and are labeled by their Monday
+    if interval == "1wk":
+        resampler = df.resample(RESAMPLE_RULES[interval], label="left", closed="left")
+    else:
+        resampler = df.resample(RESAMPLE_RULES[interval])
+
+    bars = resampler.agg({
+        "Open": "first",
+        "High": "max",
+        "Low": "min",
+        "Close": "last",
+        "Volume": "sum"
+    })
+
+    # Drop the periods without any trading day (e.g. market closures)
+    return bars[bars["Close"].notna()]
+
+
+def _period_start(value: datetime, interval: str) -> pd.Timestamp:
+    """Return the start of the week or month containing a date"""
+    day = pd.Timestamp(value).normalize()
+    if interval == "1wk":
+        return day - pd.Timedelta(days=day.dayofweek)
+    return day.replace(day=1)
+
+
+def _fetch_from_source(
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str,
+        data_source: str,
+        api_key: Optional[str],
+        priority: RequestPriority = RequestPriority.INTERACTIVE
+) -> pd.DataFrame:
+    """Dispatch a fetch to the fetcher for the given data source"""
+    (df, _) = _fetch_from_source_status(ticker, start_date, end_date, interval, data_source, api_key, priority)
+    return df
+
+
+def _fetch_from_source_status(
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str,
+        data_source: str,
+        api_key: Optional[str],
+        priority: RequestPriority = RequestPriority.INTERACTIVE
+) -> Tuple[pd.DataFrame, bool]:
+    """
+    Dispatch a fetch and report whether the source answered
+
+    Backends raise on request failures and error payloads (including
+    yfinance, whose download errors are raised rather than logged); an empty
+    result the source confirmed (a window without trading days) is not a
+    source failure.
+
+    Returns:
+        Tuple of the fetched frame (empty on failure) and False if the
+        request failed
+    """
+    started = time.perf_counter()
+    ok = True
 
-def _fetch_alphavantage(ticker: str, start_date: datetime, end_date: datetime, interval: str, api_key: str) -> pd.DataFrame:
-    """Fetch data from Alpha Vantage API"""
     try:
-        if not api_key:
-            api_key = "demo"
-        
-        # Map interval to Alpha Vantage function
-        if interval == "1d":
-            function = "TIME_SERIES_DAILY"
-            time_key = "Time Series (Daily)"
-        elif interval == "1wk":
-            function = "TIME_SERIES_WEEKLY"
-            time_key = "Weekly Time Series"
-        else:  # 1mo
-            function = "TIME_SERIES_MONTHLY"
-            time_key = "Monthly Time Series"
-        
-        url = f"https://www.alphavantage.co/query?function={function}&symbol={ticker}&apikey={api_key}&outputsize=full"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        
-        if time_key in data:
-            # Convert to DataFrame
-            df = pd.DataFrame.from_dict(data[time_key], orient='index')
-            df.index = pd.to_datetime(df.index)
-            df = df.sort_index()
-            
-            # Rename columns to match standard format
-            column_mapping = {
-                '1. open': 'Open',
-                '2. high': 'High',
-                '3. low': 'Low',
-                '4. close': 'Close',
-                '5. volume': 'Volume'
-            }
-            df = df.rename(columns=column_mapping)
-            df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
-            df = df.astype(float)
-            
-            # Filter by date range
-            df = df[(df.index >= pd.Timestamp(start_date)) & (df.index <= pd.Timestamp(end_date))]
-            
-            return df
+        if data_source == "yfinance":
+            df = _fetch_yfinance(ticker, start_date, end_date, interval)
+        elif data_source == "alphavantage":
+            df = _fetch_alphavantage(ticker, start_date, end_date, interval, api_key, priority)
         else:
-            print(f"Alpha Vantage error: {data.get('Note', data.get('Error Message', 'Unknown error'))}")
-            return pd.DataFrame()
+            df = _fetch_polygon(ticker, start_date, end_date, interval, api_key, priority)
+
+        # Bring every backend's frame into the same layout before it is stored
+        df = normalize_ohlcv(df, interval)
     except Exception as e:
-        print(f"Alpha Vantage exception: {str(e)}")
-        return pd.DataFrame()
+        print(f"{data_source} error: {str(e)}")
+        df = pd.DataFrame()
+        ok = False
 
+    # Feed the rolling health statistics used to order the fallback chain
+    latency = time.perf_counter() - started
+    source_health.record(data_source, latency, ok)
+    fetch_metrics.record_request(data_source, interval, latency, len(df), ok)
+
+    return (df, ok)
+
+
+def _store_bars(store, data_source: str, ticker: str, interval: str, df: pd.DataFrame,
+                start_date: datetime, end_date: datetime) -> None:
+    """Write fetched bars to the store without letting store errors fail the fetch"""
+    if df.empty:
+        return
 
-def _fetch_polygon(ticker: str, start_date: datetime, end_date: datetime, interval: str, api_key: str) -> pd.DataFrame:
-    """Fetch data from Polygon.io API"""
     try:
-        if not api_key:
-            return pd.DataFrame()
-        
-        # Map interval
-        multiplier = 1
-        timespan = "day" if interval == "1d" else ("week" if interval == "1wk" else "month")
-        
-        from_date = start_date.strftime("%Y-%m-%d")
-        to_date = end_date.strftime("%Y-%m-%d")
-        
-        url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{from_date}/{to_date}?apiKey={api_key}"
-        response = requests.get(url, timeout=10)
+        store.write(data_source, ticker, interval, df, start_date, end_date)
+    except Exception as e:
+        print(f"OHLCV store error: {str(e)}")
+
+
+def _overlap_matches(stored: pd.DataFrame, delta: pd.DataFrame, rtol: float = 1e-6) -> bool:
+    """Check that re-fetched bars agree with the stored bars they overlap"""
+    common = stored.index.intersection(delta.index)
+
+    # Without any overlapping bar there is nothing to contradict the store
+    if len(common) == 0:
+        return True
+
+    # Compare everything but the newest overlapping bar, which may still be
+    # forming when it was stored
+    common = common[:-1]
+    stored_close = stored.loc[common, "Close"].to_numpy(dtype=float)
+    delta_close = delta.loc[common, "Close"].to_numpy(dtype=float)
+
+    return bool(np.allclose(stored_close, delta_close, rtol=rtol, equal_nan=True))
+
+
+# Number of times an Alpha Vantage request is sent when it is rejected for quota
+_RATE_LIMIT_ATTEMPTS = 3
+
+
+def _is_alphavantage_rate_limited(data: dict) -> bool:
+    """Check whether an Alpha Vantage payload is a call frequency rejection"""
+    message = str(data.get("Note", data.get("Information", "")))
+    return "call frequency" in message or "rate limit" in message
+
+
+def _record_response(source: str, interval: str, response) -> None:
+    """Record the payload size, retries, and quota rejections of a response"""
+    retries = getattr(response.raw, "retries", None)
+    history = retries.history if retries is not None else ()
+    fetch_metrics.record_payload(source, interval, len(response.content), len(history))
+
+    # Requests retried after a 429 were rejected for quota before the
+    # final response arrived
+    for attempt in history:
+        if attempt.status == 429:
+            fetch_metrics.record_rate_limited(source, interval)
+    if response.status_code == 429:
+        fetch_metrics.record_rate_limited(source, interval)
+
+
+def _fetch_yfinance(ticker: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+    """Fetch data from Yahoo Finance (raises when the request fails)"""
+    return download_yfinance(ticker, start_date, end_date, interval)
+
+
+def _fetch_alphavantage(ticker: str, start_date: datetime, end_date: datetime, interval: str, api_key: str,
+                       priority: RequestPriority = RequestPriority.INTERACTIVE) -> pd.DataFrame:
+    """
+    Fetch data from Alpha Vantage API
+    
+    Raises:
+        RuntimeError: If Alpha Vantage answers with an error or quota note
+    """
+    if not api_key:
+        api_key = "demo"
+    
+    # Map interval to Alpha Vantage function
+    if interval == "1d":
+        function = "TIME_SERIES_DAILY"
+        time_key = "Time Series (Daily)"
+    elif interval == "1wk":
+        function = "TIME_SERIES_WEEKLY"
+        time_key = "Weekly Time Series"
+    else:  # 1mo
+        function = "TIME_SERIES_MONTHLY"
+        time_key = "Monthly Time Series"
+    
+    url = f"https://www.alphavantage.co/query?function={function}&symbol={ticker}&apikey={api_key}&outputsize=full"
+    scheduler = get_scheduler("alphavantage", api_key)
+    for attempt in range(_RATE_LIMIT_ATTEMPTS):
+        # Wait for a free slot in the quota of this API key
+        scheduler.acquire(priority)
+        response = get_session("alphavantage").get(url, timeout=10)
+        _record_response("alphavantage", interval, response)
         data = response.json()
         
-        if data.get("status") == "OK" and "results" in data:
-            # Convert to DataFrame
-            results = data["results"]
-            df = pd.DataFrame(results)
-            df['Date'] = pd.to_datetime(df['t'], unit='ms')
-            df = df.set_index('Date')
-            
-            # Rename columns to match standard format
-            df = df.rename(columns={
-                'o': 'Open',
-                'h': 'High',
-                'l': 'Low',
-                'c': 'Close',
-                'v': 'Volume'
-            })
-            df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
-            
-            return df
-        else:
-            print(f"Polygon error: {data.get('error', 'Unknown error')}")
-            return pd.DataFrame()
-    except Exception as e:
-        print(f"Polygon exception: {str(e)}")
+        # A frequency note means the quota was exceeded anyway (e.g. by
+        # another process sharing the key), so back off and try again
+        if time_key in data or not _is_alphavantage_rate_limited(data):
+            break
+        scheduler.report_rate_limited()
+        fetch_metrics.record_rate_limited("alphavantage", interval)
+    
+    if time_key not in data:
+        raise RuntimeError(data.get('Note', data.get('Error Message', 'Unknown error')))
+    
+    return decode_alphavantage_series(data[time_key], start_date, end_date)
+
+
+def _fetch_polygon(ticker: str, start_date: datetime, end_date: datetime, interval: str, api_key: str,
+                   priority: RequestPriority = RequestPriority.INTERACTIVE) -> pd.DataFrame:
+    """Fetch data from Polygon.io API"""
+    if not api_key:
+        return pd.DataFrame()
+    
+    # Assemble the pages of the aggregates response into one frame
+    chunks = list(iter_polygon_aggregates(ticker, start_date, end_date, interval, api_key, priority=priority))
+    if not chunks:
         return pd.DataFrame()
+    
+    return pd.concat(chunks)
+
+
+# Alpha Vantage bar fields in OHLCV order
+ALPHAVANTAGE_FIELDS = ("1. open", "2. high", "3. low", "4. close", "5. volume")
+
+
+def decode_alphavantage_series(
+        series: Dict[str, Dict[str, str]],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    Decode an Alpha Vantage time series payload into an OHLCV frame
+    
+    The date keys are parsed in one vectorized pass and the requested range
+    is selected before any price string is touched, so only the bars that
+    are kept get converted to floats.
+    
+    Args:
+        series: Time series object of the payload (date string -> bar fields)
+        start_date: Optional inclusive start of the window
+        end_date: Optional inclusive end of the window
+    
+    Returns:
+        DataFrame with float64 OHLCV columns and ascending Date index
+    """
+    keys = list(series.keys())
+    dates = np.array(keys, dtype="datetime64[s]")
+
+    # Select the requested window on the parsed dates
+    mask = np.ones(len(keys), dtype=bool)
+    if start_date is not None:
+        mask &= dates >= pd.Timestamp(start_date).to_datetime64()
+    if end_date is not None:
+        mask &= dates <= pd.Timestamp(end_date).to_datetime64()
+    selected = np.flatnonzero(mask)
+
+    # Convert only the selected bars, reading the five fields of each bar
+    # into one row of a float64 matrix
+    get_fields = itemgetter(*ALPHAVANTAGE_FIELDS)
+    values = np.empty((len(selected), len(ALPHAVANTAGE_FIELDS)), dtype=np.float64)
+    if len(selected) > 0:
+        values[:] = [get_fields(series[keys[i]]) for i in selected]
+
+    # Alpha Vantage lists the newest bar first
+    selected_dates = dates[selected]
+    order = np.argsort(selected_dates, kind="stable")
+
+    return pd.DataFrame(
+        values[order],
+        index=pd.DatetimeIndex(selected_dates[order].astype("datetime64[ns]")),
+        columns=["Open", "High", "Low", "Close", "Volume"]
+    )
+
+
+# Polygon (multiplier, timespan) for each supported interval
+POLYGON_TIMESPANS = {
+    "1m": (1, "minute"),
+    "5m": (5, "minute"),
+    "15m": (15, "minute"),
+    "1h": (1, "hour"),
+    "1d": (1, "day"),
+    "1wk": (1, "week"),
+    "1mo": (1, "month"),
+}
+
+# Maximum number of base aggregates Polygon returns per page
+POLYGON_PAGE_LIMIT = 50000
+
+
+def iter_polygon_aggregates(
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str,
+        api_key: str,
+        limit: int = POLYGON_PAGE_LIMIT,
+        priority: RequestPriority = RequestPriority.INTERACTIVE
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream Polygon.io aggregate bars page by page, following next_url
+    
+    Args:
+        ticker: Stock ticker symbol
+        start_date: Start date for historical data
+        end_date: End date for historical data
+        interval: Data interval (1m, 5m, 15m, 1h, 1d, 1wk, 1mo)
+        api_key: Polygon API key
+        limit: Maximum number of bars requested per page
+        priority: Queue priority of the requests on the Polygon quota
+    
+    Yields:
+        DataFrame with OHLCV columns and Date index for each page, in
+        ascending date order
+    
+    Raises:
+        RuntimeError: If Polygon rejects a request
+    """
+    if interval not in POLYGON_TIMESPANS:
+        raise ValueError(f"Unsupported Polygon interval: {interval}")
+
+    (multiplier, timespan) = POLYGON_TIMESPANS[interval]
+    from_date = start_date.strftime("%Y-%m-%d")
+    to_date = end_date.strftime("%Y-%m-%d")
+
+    url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{from_date}/{to_date}"
+    params = {"adjusted": "true", "sort": "asc", "limit": limit, "apiKey": api_key}
+
+    scheduler = get_scheduler("polygon", api_key)
+    session = get_session("polygon")
+
+    while url:
+        scheduler.acquire(priority)
+        response = session.get(url, params=params, timeout=10)
+        _record_response("polygon", interval, response)
+        if response.status_code == 429:
+            scheduler.report_rate_limited()
+        data = response.json()
+
+        # Free plans answer with DELAYED instead of OK
+        if data.get("status") not in ("OK", "DELAYED"):
+            raise RuntimeError(f"Polygon error: {data.get('error', data.get('message', 'Unknown error'))}")
+
+        results = data.get("results") or []
+        if results:
+            yield _polygon_results_to_frame(results)
+
+        # The next page URL carries the query and cursor but not the API key
+        url = data.get("next_url")
+        params = {"apiKey": api_key}
+
+
+def _polygon_results_to_frame(results: List[dict]) -> pd.DataFrame:
+    """Convert a page of Polygon aggregate results to an OHLCV frame"""
+    df = pd.DataFrame(
+        {
+            "Open": [bar["o"] for bar in results],
+            "High": [bar["h"] for bar in results],
+            "Low": [bar["l"] for bar in results],
+            "Close": [bar["c"] for bar in results],
+            "Volume": [bar.get("v", 0.0) for bar in results],
+        },
+        index=pd.DatetimeIndex(pd.to_datetime([bar["t"] for bar in results], unit="ms"), name="Date"),
+        dtype=float
+    )
+    return df
+
+
+def store_polygon_aggregates(
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str,
+        api_key: str,
+        store: Optional[OHLCVStore] = None,
+        priority: RequestPriority = RequestPriority.BACKFILL
+) -> int:
+    """
+    Stream Polygon.io aggregate bars straight into the local OHLCV store
+    
+    Pages are written as they arrive, so memory use does not grow with the
+    length of the history being backfilled. Each page is brought into the
+    canonical OHLCV layout first, like every other path into the store.
+    
+    Args:
+        ticker: Stock ticker symbol
+        start_date: Start date for historical data
+        end_date: End date for historical data
+        interval: Data interval (1m, 5m, 15m, 1h, 1d, 1wk, 1mo)
+        api_key: Polygon API key
+        store: Store to write to (default is the process-wide store)
+        priority: Queue priority of the requests on the Polygon quota
+    
+    Returns:
+        Number of bars written
+    """
+    if store is None:
+        store = get_default_store()
+
+    chunks = (
+        normalize_ohlcv(chunk, interval)
+        for chunk in iter_polygon_aggregates(ticker, start_date, end_date, interval, api_key, priority=priority)
+    )
+    return store.write_chunks("polygon", ticker, interval, chunks, start_date, end_date)
@@ -0,0 +1,182 @@
+"""
+Memory-mapped (time x ticker x field) price matrix for cross-sectional analytics
+"""
+
+import os
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .unified_data_fetcher import fetch_market_data_many
+
+
+# Fields stored along the last axis of the matrix
+DEFAULT_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+@dataclass(frozen=True)
+class UniverseMatrix:
+    """Data schema for an aligned universe price matrix"""
+    values: np.ndarray
+    dates: pd.DatetimeIndex
+    tickers: List[str]
+    fields: List[str]
+
+    def field_frame(self, field: str = "Close", start_date: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Get one field for every ticker as a (date x ticker) DataFrame
+
+        The frame is a view on the matrix, so no price data is copied.
+
+        Args:
+            field: Field name (e.g. "Close")
+            start_date: Optional inclusive start of the rows
+
+        Returns:
+            DataFrame indexed by date with one column per ticker
+        """
+        rows = self._rows_from(start_date)
+        view = self.values[rows, :, self.fields.index(field)]
+        return pd.DataFrame(view, index=self.dates[rows], columns=self.tickers, copy=False)
+
+    def ticker_frame(self, ticker: str, start_date: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Get the OHLCV bars of one ticker as a (date x field) DataFrame
+
+        Dates on which the ticker has no bars are left out; when there are
+        none the frame is a view on the matrix.
+
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Optional inclusive start of the rows
+
+        Returns:
+            DataFrame with OHLCV columns and Date index
+        """
+        rows = self._rows_from(start_date)
+        view = self.values[rows, self.tickers.index(ticker), :]
+        df = pd.DataFrame(view, index=self.dates[rows], columns=self.fields, copy=False)
+        return _drop_incomplete_rows(df)
+
+    def _rows_from(self, start_date: Optional[datetime]) -> slice:
+        """Return the row slice starting at a date"""
+        if start_date is None:
+            return slice(0, len(self.dates))
+
+        # Rows are daily or longer bars stamped at midnight, so a start with
+        # a time of day still includes its own date (as store reads do)
+        start = pd.Timestamp(start_date).normalize()
+        return slice(int(self.dates.searchsorted(start)), len(self.dates))
+
+
+def _drop_incomplete_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop rows holding a NaN, keeping the view when there are none"""
+    incomplete = np.isnan(df.to_numpy()).any(axis=1)
+    if not incomplete.any():
+        return df
+    return df[~incomplete]
+
+
+def _matrix_paths(directory: str):
+    """Return the values, dates, and metadata paths of a stored matrix"""
+    return (
+        os.path.join(directory, "values.npy"),
+        os.path.join(directory, "dates.npy"),
+        os.path.join(directory, "meta.json")
+    )
+
+
+def build_universe_matrix(
+        tickers: Sequence[str],
+        start_date: datetime,
+        end_date: datetime,
+        directory: str,
+        interval: str = "1d",
+        data_source: str = "yfinance",
+        api_key: Optional[str] = None,
+        fields: Sequence[str] = DEFAULT_FIELDS
+) -> UniverseMatrix:
+    """
+    Fetch a universe and materialize it as an aligned memory-mapped matrix
+
+    Every ticker is aligned on the union of all trading dates; dates on which
+    a ticker has no bar hold NaN.
+
+    Args:
+        tickers: List of stock ticker symbols
+        start_date: Start date for historical data
+        end_date: End date for historical data
+        directory: Directory to write the matrix files to
+        interval: Data interval (1d, 1wk, 1mo)
+        data_source: Data source passed to fetch_market_data_many
+        api_key: API key for Alpha Vantage or Polygon
+        fields: Fields to store along the last axis
+
+    Returns:
+        UniverseMatrix backed by the written files (tickers that could not be
+        fetched are left out)
+    """
+    fetched = fetch_market_data_many(list(tickers), start_date, end_date, interval, data_source, api_key)
+    for (ticker, error) in fetched.errors.items():
+        print(f"Universe matrix: skipping {ticker} ({error})")
+
+    kept = list(fetched.data.keys())
+    fields = list(fields)
+
+    # Align every ticker on the union of the trading dates
+    dates = pd.DatetimeIndex([])
+    for df in fetched.data.values():
+        dates = dates.union(df.index)
+
+    (values_path, dates_path, meta_path) = _matrix_paths(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    values = np.lib.format.open_memmap(
+        values_path,
+        mode="w+",
+        dtype=np.float64,
+        shape=(len(dates), len(kept), len(fields))
+    )
+    values[:] = np.nan
+
+    # Scatter each ticker's bars into its column of the matrix
+    for (j, ticker) in enumerate(kept):
+        df = fetched.data[ticker]
+        rows = dates.get_indexer(df.index)
+        values[rows, j, :] = df[fields].to_numpy(dtype=np.float64)
+
+    values.flush()
+    del values
+
+    np.save(dates_path, dates.to_numpy(dtype="datetime64[ns]"))
+    with open(meta_path, "w") as f:
+        json.dump({"tickers": kept, "fields": fields, "interval": interval, "data_source": data_source}, f)
+
+    return load_universe_matrix(directory)
+
+
+def load_universe_matrix(directory: str) -> UniverseMatrix:
+    """
+    Map a stored universe matrix read-only into memory without copying it
+
+    Args:
+        directory: Directory the matrix was built into
+
+    Returns:
+        UniverseMatrix whose values are a read-only memory map
+    """
+    (values_path, dates_path, meta_path) = _matrix_paths(directory)
+
+    with open(meta_path, "r") as f:
+        meta = json.load(f)
+
+    return UniverseMatrix(
+        values=np.load(values_path, mmap_mode="r"),
+        dates=pd.DatetimeIndex(np.load(dates_path), name="Date"),
+        tickers=meta["tickers"],
+        fields=meta["fields"]
+    )